@@ -0,0 +1,65 @@
+"""
+Mesure le temps de chargement des séances depuis SQLite.
+
+Usage :
+    python -m benchmarks.bench_chargement [nb_seances]
+"""
+
+import sys
+import time as chrono
+from datetime import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from database.base import Base
+from database.models import (
+    SalleModel, MatiereModel, GroupeEtudiantModel,
+    CreneauModel, EnseignantModel, SeanceModel
+)
+from database.repository import SeanceRepository
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi"]
+
+
+def remplir(session, nb_seances):
+    salles = [SalleModel(id=i, nom=f"S{i}", capacite=60, type_salle="td", equipements=[])
+              for i in range(1, 101)]
+    groupes = [GroupeEtudiantModel(id=i, nom=f"G{i}", filiere="Info", effectif=30)
+               for i in range(1, 201)]
+    matieres = [MatiereModel(id=i, code=f"M{i}", nom=f"Matiere {i}", type_cours="td",
+                             equipements_requis=[])
+                for i in range(1, 51)]
+    creneaux = [CreneauModel(id=j * 5 + h + 1, jour=jour,
+                             heure_debut=time(8 + 2 * h, 0), heure_fin=time(10 + 2 * h, 0))
+                for j, jour in enumerate(JOURS) for h in range(5)]
+    enseignants = [EnseignantModel(id=i, nom=f"Prof {i}", matieres=matieres[i % 50:i % 50 + 2],
+                                   disponibilites=creneaux[:10])
+                   for i in range(1, 151)]
+    session.add_all(salles + groupes + matieres + creneaux + enseignants)
+    session.flush()
+    session.add_all(
+        SeanceModel(matiere_id=i % 50 + 1, enseignant_id=i % 150 + 1, groupe_id=i % 200 + 1,
+                    salle_id=i % 100 + 1, creneau_id=i % 25 + 1)
+        for i in range(nb_seances)
+    )
+    session.commit()
+    session.expunge_all()
+
+
+def main():
+    nb_seances = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    remplir(session, nb_seances)
+
+    requetes = []
+    event.listen(engine, "before_cursor_execute", lambda *args: requetes.append(args[2]))
+    debut = chrono.perf_counter()
+    seances = SeanceRepository.get_all_domain(session)
+    duree = chrono.perf_counter() - debut
+
+    print(f"{len(seances)} séances chargées en {duree:.3f} s ({len(requetes)} requêtes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Mesure la mémoire occupée par séance dans un grand emploi du temps.
+
+Chaque séance a son propre créneau, sa salle, son groupe et sa matière,
+ce qui correspond au pire cas d'un export sans partage d'objets.
+
+La mesure est faite deux fois : avec les classes de core, puis avec une
+copie des classes d'avant __slots__ (un __dict__ par objet, ensembles et
+listes modifiables, chaînes non internées) qui sert de référence.
+
+Usage :
+    python -m benchmarks.bench_memoire [nb_seances]
+"""
+
+import sys
+import tracemalloc
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.matiere import Matiere
+from core.groupe_etudiant import GroupeEtudiant
+from core.enseignant import Enseignant
+from core.seance import Seance
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi"]
+
+
+# --------------------
+# Référence : disposition mémoire des classes avant __slots__
+# --------------------
+class AncienCreneau:
+    def __init__(self, jour, heure_debut, heure_fin):
+        self._jour = jour.lower()
+        self._heure_debut = heure_debut
+        self._heure_fin = heure_fin
+
+
+class AncienneSalle:
+    def __init__(self, identifiant, nom, capacite, type_salle, equipements=None,
+                 disponibilites=None):
+        self._id = identifiant
+        self._nom = nom
+        self._capacite = capacite
+        self._type = type_salle.lower()
+        self._equipements = set(equipements) if equipements else set()
+        self._disponibilites = list(disponibilites) if disponibilites else []
+
+
+class AncienGroupe:
+    def __init__(self, identifiant, nom, filiere, effectif, niveau=None):
+        self._id = identifiant
+        self._nom = nom
+        self._filiere = filiere
+        self._effectif = effectif
+        self._niveau = niveau
+
+
+class AncienneMatiere:
+    def __init__(self, code, nom, type_seance, volume_horaire, equipements_requis=None):
+        self._code = code.upper()
+        self._nom = nom
+        self._type_seance = type_seance.lower()
+        self._volume_horaire = volume_horaire
+        self._equipements_requis = set(equipements_requis) if equipements_requis else set()
+
+
+class AncienneSeance:
+    def __init__(self, matiere, enseignant, groupe, salle, creneau):
+        self._matiere = matiere
+        self._enseignant = enseignant
+        self._groupe = groupe
+        self._salle = salle
+        self._creneau = creneau
+
+
+ACTUELLES = (Creneau, Salle, GroupeEtudiant, Matiere, Seance)
+ANCIENNES = (AncienCreneau, AncienneSalle, AncienGroupe, AncienneMatiere, AncienneSeance)
+
+
+def construire(nb_seances, classes=ACTUELLES):
+    creneau_cls, salle_cls, groupe_cls, matiere_cls, seance_cls = classes
+    enseignant = Enseignant(1, "Prof")
+    heures = [time(h, m) for h in range(24) for m in range(60)]
+    seances = []
+    for i in range(nb_seances):
+        debut = i % 600
+        creneau = creneau_cls(JOURS[i % 6], heures[debut], heures[debut + 90])
+        salle = salle_cls(i + 1, f"S{i}", 40, "td")
+        groupe = groupe_cls(i + 1, f"G{i}", "Info", 30)
+        matiere = matiere_cls(f"M{i}", "Matiere", "td", 2)
+        seances.append(seance_cls(matiere, enseignant, groupe, salle, creneau))
+    return seances
+
+
+def mesurer(nb_seances, classes) -> float:
+    """Octets alloués par séance (séance, créneau, salle, groupe, matière)."""
+    tracemalloc.start()
+    seances = construire(nb_seances, classes)
+    courant, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return courant / len(seances)
+
+
+def main():
+    nb_seances = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    avant = mesurer(nb_seances, ANCIENNES)
+    apres = mesurer(nb_seances, ACTUELLES)
+    print(f"{nb_seances} séances (séance, créneau, salle, groupe, matière) :")
+    print(f"  avant __slots__ : {avant:.0f} octets par séance")
+    print(f"  classes de core : {apres:.0f} octets par séance")
+
+
+if __name__ == "__main__":
+    main()
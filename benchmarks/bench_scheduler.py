@@ -0,0 +1,58 @@
+"""
+Compare les moteurs de génération sur un problème de la taille d'une faculté.
+
+Usage :
+    python -m benchmarks.bench_scheduler [nb_demandes]
+
+La décomposition est mesurée sur une variante où les enseignants
+restent surtout dans leur filière (10 % de cours hors filière).
+"""
+
+import sys
+import time as chrono
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.scheduler import Scheduler
+from services.multi_depart import SchedulerMultiDepart
+from services.solveur_csp import SolveurCSP
+from services.optimiseur import OptimiseurRecuit
+from services.decomposition import SchedulerDecompose
+from benchmarks.faculte import generer_faculte
+
+
+def mesurer(nom, moteur, demandes):
+    edt = EmploiDuTemps()
+    debut = chrono.perf_counter()
+    try:
+        moteur.generer(edt, demandes)
+        resultat = "complet"
+    except AucuneSolutionException as e:
+        resultat = f"échec ({e})"
+    duree = chrono.perf_counter() - debut
+    print(f"{nom:<10} {duree:7.2f} s  {len(edt.seances)} séances  {resultat}")
+    return edt
+
+
+def main():
+    nb_demandes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    salles, creneaux, demandes = generer_faculte(nb_demandes)
+    print(f"{len(demandes)} demandes, {len(salles)} salles, {len(creneaux)} créneaux")
+    mesurer("glouton", Scheduler(salles, creneaux), demandes)
+    mesurer("multi", SchedulerMultiDepart(salles, creneaux, tentatives=32), demandes)
+    edt = mesurer("csp", SolveurCSP(salles, creneaux, budget_secondes=60), demandes)
+
+    if len(edt.seances) == len(demandes):
+        initial = OptimiseurRecuit(salles, creneaux, iterations_max=0).optimiser(edt)
+        debut = chrono.perf_counter()
+        final = OptimiseurRecuit(salles, creneaux, budget_secondes=20).optimiser(edt)
+        duree = chrono.perf_counter() - debut
+        print(f"{'recuit':<10} {duree:7.2f} s  coût {initial:.0f} -> {final:.0f}")
+
+    salles, creneaux, demandes = generer_faculte(nb_demandes, hors_filiere=0.1)
+    print(f"Filières peu couplées : {len(demandes)} demandes")
+    mesurer("glouton", Scheduler(salles, creneaux), demandes)
+    mesurer("decompose", SchedulerDecompose(salles, creneaux), demandes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Génération d'un problème d'emploi du temps de la taille d'une faculté."""
+
+import random
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.matiere import Matiere
+from core.groupe_etudiant import GroupeEtudiant
+from core.enseignant import Enseignant
+
+JOURS = ["lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi"]
+EQUIPEMENTS = ["projecteur", "pc", "tableau_blanc"]
+FILIERES = ["Info", "Maths", "Bio"]
+
+
+def generer_faculte(nb_demandes=2000, nb_salles=150, nb_groupes=120,
+                    nb_enseignants=250, graine=0, hors_filiere=None):
+    """
+    Retourne (salles, creneaux, demandes) : 6 jours de 5 créneaux
+    de 2h, doublés de créneaux d'1h décalés qui les chevauchent (60 créneaux),
+    salles et groupes de tailles variées, enseignants disponibles sur une
+    partie de la semaine.
+    hors_filiere : si donné, chaque enseignant est rattaché à une filière
+    et n'enseigne à un groupe d'une autre filière qu'avec cette
+    probabilité ; sinon les groupes sont tirés au hasard.
+    """
+    alea = random.Random(graine)
+    creneaux = [
+        Creneau(jour, time(h, 0), time(h + 2, 0))
+        for jour in JOURS for h in (8, 10, 12, 14, 16)
+    ]
+    creneaux += [
+        Creneau(jour, time(h, 30), time(h + 1, 30))
+        for jour in JOURS for h in (8, 10, 12, 14, 16)
+    ]
+
+    salles = []
+    for k in range(nb_salles):
+        type_salle = alea.choice(["amphi", "td", "td", "tp"])
+        capacite = {"amphi": 200, "td": 40, "tp": 30}[type_salle] + alea.randint(-5, 5)
+        equipements = alea.sample(EQUIPEMENTS, alea.randint(1, 3))
+        salles.append(Salle(k + 1, f"Salle {k + 1}", capacite, type_salle, equipements))
+
+    groupes = [
+        GroupeEtudiant(g + 1, f"G{g + 1}", alea.choice(FILIERES),
+                       alea.randint(15, 35), alea.choice(["L1", "L2", "L3", "M1", "M2"]))
+        for g in range(nb_groupes)
+    ]
+    matieres = [
+        Matiere(f"M{m + 1}", f"Matiere {m + 1}", alea.choice(["cours", "td", "tp"]),
+                alea.randint(1, 4), alea.sample(EQUIPEMENTS, alea.randint(0, 1)))
+        for m in range(200)
+    ]
+    enseignants = [
+        Enseignant(e + 1, f"Enseignant {e + 1}", alea.sample(matieres, 3), [
+            Creneau(jour, time(8, 0), time(18, 0))
+            for jour in alea.sample(JOURS, alea.randint(3, 6))
+        ])
+        for e in range(nb_enseignants)
+    ]
+
+    par_filiere = {}
+    for groupe in groupes:
+        par_filiere.setdefault(groupe.filiere, []).append(groupe)
+
+    # Un enseignant ne reçoit pas plus de demandes que de créneaux
+    # de 2h disponibles, pour que le problème reste faisable
+    charges = dict.fromkeys(enseignants, 0)
+    demandes = []
+    for _ in range(nb_demandes):
+        enseignant = alea.choice(enseignants)
+        while charges[enseignant] >= 5 * len(enseignant.disponibilites):
+            enseignant = alea.choice(enseignants)
+        charges[enseignant] += 1
+        if hors_filiere is None or alea.random() < hors_filiere:
+            groupe = alea.choice(groupes)
+        else:
+            groupe = alea.choice(par_filiere[FILIERES[enseignant.id % len(FILIERES)]])
+        demandes.append((alea.choice(enseignant.matieres), enseignant, groupe))
+    return salles, creneaux, demandes
@@ -6,5 +6,10 @@ from .matiere import Matiere
 from .creneau import Creneau
 from .seance import Seance
 from .emploi_du_temps import EmploiDuTemps
-from .exceptions import ConflitException, DisponibiliteException, CompatibiliteSalleException
+from .occupation_salles import OccupationSalles
+from .plages_horaires import PlagesHoraires
+from .exceptions import (
+    ConflitException, DisponibiliteException, CompatibiliteSalleException,
+    AucuneSolutionException, ProblemeInfaisableException
+)
 from .contraintes import Contrainte
@@ -1,4 +1,5 @@
 from datetime import time
+from sys import intern
 
 
 class Creneau:
@@ -7,18 +8,40 @@ class Creneau:
     Un créneau est défini par un jour, une heure de début et une heure de fin.
     """
 
-    JOURS_VALIDES = {
-        "lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi"
-    }
+    __slots__ = ("_jour", "_heure_debut", "_heure_fin", "_jour_index", "_debut", "_fin")
+
+    JOURS = ("lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi")
+    JOURS_VALIDES = set(JOURS)
+
+    # Cache d'internement : un seul objet par (jour, début, fin)
+    _instances = {}
 
     def __init__(self, jour: str, heure_debut: time, heure_fin: time):
         self._valider_jour(jour)
         self._valider_heures(heure_debut, heure_fin)
 
-        self._jour = jour.lower()
+        self._jour = intern(jour.lower())
         self._heure_debut = heure_debut
         self._heure_fin = heure_fin
 
+        # Encodage entier précalculé : jour de la semaine et minutes depuis minuit
+        self._jour_index = self.JOURS.index(self._jour)
+        self._debut = heure_debut.hour * 60 + heure_debut.minute
+        self._fin = heure_fin.hour * 60 + heure_fin.minute
+
+    @classmethod
+    def interner(cls, jour: str, heure_debut: time, heure_fin: time) -> "Creneau":
+        """
+        Retourne l'instance partagée pour ce créneau, en la créant au besoin.
+        Le créneau étant immuable, le partage est sans risque et évite de
+        revalider et de dupliquer des milliers de créneaux identiques.
+        """
+        cle = (jour.lower() if isinstance(jour, str) else jour, heure_debut, heure_fin)
+        creneau = cls._instances.get(cle)
+        if creneau is None:
+            creneau = cls._instances[cle] = cls(jour, heure_debut, heure_fin)
+        return creneau
+
     # --------------------
     # Propriétés (lecture seule)
     # --------------------
@@ -34,14 +57,34 @@ class Creneau:
     def heure_fin(self):
         return self._heure_fin
 
+    @property
+    def jour_index(self):
+        """Index du jour dans la semaine (0 = lundi)."""
+        return self._jour_index
+
+    @property
+    def debut_minutes(self):
+        """Heure de début en minutes depuis minuit."""
+        return self._debut
+
+    @property
+    def fin_minutes(self):
+        """Heure de fin en minutes depuis minuit."""
+        return self._fin
+
+    @property
+    def cle_tri(self):
+        """Clé de tri chronologique : (jour, début, fin) en entiers."""
+        return (self._jour_index, self._debut, self._fin)
+
+    @property
+    def duree_minutes(self):
+        return self._fin - self._debut
+
     @property
     def duree_heures(self):
         """Retourne la durée du créneau en heures (format décimal)."""
-        import datetime
-        t1 = datetime.datetime.combine(datetime.date.today(), self._heure_debut)
-        t2 = datetime.datetime.combine(datetime.date.today(), self._heure_fin)
-        diff = t2 - t1
-        return diff.total_seconds() / 3600
+        return (self._fin - self._debut) / 60
 
     # --------------------
     # Logique métier
@@ -50,24 +93,20 @@ class Creneau:
         """
         Retourne True si deux créneaux se chevauchent.
         """
-        if self.jour != autre.jour:
-            return False
-
-        return not (
-            self.heure_fin <= autre.heure_debut
-            or autre.heure_fin <= self.heure_debut
+        return (
+            self._jour_index == autre._jour_index
+            and self._debut < autre._fin
+            and autre._debut < self._fin
         )
 
     def contient(self, autre: "Creneau") -> bool:
       """
       Retourne True si le créneau 'autre' est entièrement inclus dans self.
       """
-      if self.jour != autre.jour:
-          return False
-
       return (
-          self.heure_debut <= autre.heure_debut
-          and self.heure_fin >= autre.heure_fin
+          self._jour_index == autre._jour_index
+          and self._debut <= autre._debut
+          and self._fin >= autre._fin
       )
 
     # --------------------
@@ -106,4 +145,4 @@ class Creneau:
         )
 
     def __hash__(self):
-        return hash((self.jour, self.heure_debut, self.heure_fin))
+        return hash((self._jour_index, self._debut, self._fin))
@@ -1,19 +1,88 @@
+from bisect import bisect_left, insort
+
+from core.enseignant import Enseignant
+from core.salle import Salle
 from core.seance import Seance
 
 
+class IndexCreneaux:
+    """
+    Index des occupations d'une ressource (salle, enseignant, groupe).
+    Pour chaque jour, les occupations sont triées par heure de début,
+    ce qui permet de ne parcourir que les entrées proches du créneau cherché.
+    """
+
+    def __init__(self):
+        self._par_jour = {}
+        self._duree_max = {}
+
+    def ajouter(self, creneau, element) -> None:
+        debut, fin = creneau.debut_minutes, creneau.fin_minutes
+        entrees = self._par_jour.setdefault(creneau.jour, [])
+        insort(entrees, (debut, fin, element), key=lambda e: e[0])
+        self._duree_max[creneau.jour] = max(
+            self._duree_max.get(creneau.jour, 0), fin - debut
+        )
+
+    def retirer(self, creneau, element) -> None:
+        entrees = self._par_jour.get(creneau.jour, [])
+        debut = creneau.debut_minutes
+        i = bisect_left(entrees, debut, key=lambda e: e[0])
+        while i < len(entrees) and entrees[i][0] == debut:
+            if entrees[i][2] is element:
+                del entrees[i]
+                return
+            i += 1
+        raise ValueError("Occupation introuvable dans l'index.")
+
+    def chevauchements(self, creneau):
+        """
+        Retourne les éléments dont l'occupation chevauche le créneau.
+        Seules les entrées commençant avant la fin du créneau sont examinées,
+        en remontant tant qu'elles peuvent encore le recouvrir.
+        """
+        entrees = self._par_jour.get(creneau.jour)
+        if not entrees:
+            return []
+        debut, fin = creneau.debut_minutes, creneau.fin_minutes
+        limite = debut - self._duree_max[creneau.jour]
+        resultat = []
+        i = bisect_left(entrees, fin, key=lambda e: e[0]) - 1
+        while i >= 0 and entrees[i][0] > limite:
+            if entrees[i][1] > debut:
+                resultat.append(entrees[i][2])
+            i -= 1
+        resultat.reverse()
+        return resultat
+
+    def occupations(self, jour: str) -> list:
+        """Retourne les éléments occupés ce jour-là, triés par heure de début."""
+        return [e[2] for e in self._par_jour.get(jour.lower(), [])]
+
+
 class EmploiDuTemps:
     """
     Contient la liste des séances et gère l'ajout avec vérification des conflits.
+    Chaque salle, enseignant et groupe dispose d'un index par jour
+    pour que la détection de conflits ne parcoure que ses propres séances.
     """
 
     def __init__(self):
-        self._seances = []
+        # id(séance) -> séance : conserve l'ordre d'ajout et permet
+        # une suppression en temps constant
+        self._seances = {}
+        self._index_salles = {}
+        self._index_enseignants = {}
+        self._index_groupes = {}
+        self._par_groupe = {}
+        self._par_enseignant = {}
+        self._par_salle = {}
 
     # Propriétés (lecture seule)
 
     @property
     def seances(self):
-        return list(self._seances)
+        return list(self._seances.values())
 
     # Gestion des séances
 
@@ -24,55 +93,148 @@ class EmploiDuTemps:
         conflit = self.verifier_conflit(nouvelle_seance)
         if conflit:
             raise ValueError(f"Conflit détecté : {conflit}")
-        self._seances.append(nouvelle_seance)
+        self._indexer(nouvelle_seance)
+
+    def charger_seances(self, seances) -> None:
+        """
+        Ajoute des séances déjà validées (ex: chargées depuis la base)
+        sans vérification de conflit, en maintenant les index.
+        """
+        for seance in seances:
+            self._indexer(seance)
 
     def verifier_conflit(self, s: Seance) -> str:
         """
         Vérifie si une séance entre en conflit avec les séances existantes.
+        Deux séances sont en conflit si leurs créneaux se chevauchent
+        et qu'elles partagent une salle, un enseignant ou un groupe.
         Retourne une chaîne décrivant le conflit, ou None si pas de conflit.
         """
-        for existante in self._seances:
-            if existante.creneau == s.creneau:
-                if existante.salle == s.salle:
-                    return f"La salle '{s.salle.nom}' est déjà occupée."
-                if existante.enseignant == s.enseignant:
-                    return f"L'enseignant '{s.enseignant.nom}' a déjà un cours sur ce créneau."
-                if existante.groupe == s.groupe:
-                    return f"Le groupe '{s.groupe.nom}' a déjà un cours sur ce créneau."
+        if self._occupe(self._index_salles, s.salle, s.creneau):
+            return f"La salle '{s.salle.nom}' est déjà occupée."
+        if self._occupe(self._index_enseignants, s.enseignant, s.creneau):
+            return f"L'enseignant '{s.enseignant.nom}' a déjà un cours sur ce créneau."
+        if self._occupe(self._index_groupes, s.groupe, s.creneau):
+            return f"Le groupe '{s.groupe.nom}' a déjà un cours sur ce créneau."
         return None
-    
+
     def supprimer_seance(self, seance: Seance) -> None:
         """
         Supprime une séance de l'emploi du temps.
         """
-        if seance in self._seances:
-            self._seances.remove(seance)
+        existante = next(
+            (s for s in self._par_salle.get(seance.salle.nom, ()) if s == seance), None
+        )
+        if existante is not None:
+            del self._seances[id(existante)]
+            for index, ressource in self._ressources(existante):
+                index[ressource].retirer(existante.creneau, existante)
+            for par_nom, nom in self._noms(existante):
+                liste = par_nom[nom]
+                del liste[next(i for i, s in enumerate(liste) if s is existante)]
+                if not liste:
+                    del par_nom[nom]
         else:
             raise ValueError("La séance spécifiée n'existe pas dans l'emploi du temps.")
 
-  
+    # Index internes
+
+    def _ressources(self, seance: Seance):
+        return (
+            (self._index_salles, seance.salle),
+            (self._index_enseignants, seance.enseignant),
+            (self._index_groupes, seance.groupe),
+        )
+
+    def _noms(self, seance: Seance):
+        return (
+            (self._par_groupe, seance.groupe.nom),
+            (self._par_enseignant, seance.enseignant.nom),
+            (self._par_salle, seance.salle.nom),
+        )
+
+    def _indexer(self, seance: Seance) -> None:
+        self._seances[id(seance)] = seance
+        for index, ressource in self._ressources(seance):
+            index.setdefault(ressource, IndexCreneaux()).ajouter(seance.creneau, seance)
+        for par_nom, nom in self._noms(seance):
+            par_nom.setdefault(nom, []).append(seance)
+
+    @staticmethod
+    def _occupe(index, ressource, creneau) -> bool:
+        index_ressource = index.get(ressource)
+        return bool(index_ressource and index_ressource.chevauchements(creneau))
 
     # Recherche / Consultation
+    def creneaux_occupes(self, ressource, jour: str) -> list:
+        """
+        Créneaux des séances d'une salle, d'un enseignant ou d'un groupe
+        ce jour-là, triés par heure de début.
+        """
+        if isinstance(ressource, Salle):
+            index = self._index_salles
+        elif isinstance(ressource, Enseignant):
+            index = self._index_enseignants
+        else:
+            index = self._index_groupes
+        index_ressource = index.get(ressource)
+        if index_ressource is None:
+            return []
+        return [seance.creneau for seance in index_ressource.occupations(jour)]
+
     def seances_par_groupe(self, groupe_nom: str) -> list:
-        return [s for s in self._seances if s.groupe.nom == groupe_nom]
+        return list(self._par_groupe.get(groupe_nom, []))
 
     def seances_par_enseignant(self, enseignant_nom: str) -> list:
-        return [s for s in self._seances if s.enseignant.nom == enseignant_nom]
+        return list(self._par_enseignant.get(enseignant_nom, []))
 
     def seances_par_salle(self, salle_nom: str) -> list:
-        return [s for s in self._seances if s.salle.nom == salle_nom]
+        return list(self._par_salle.get(salle_nom, []))
+
+    def rechercher(self, groupe_nom: str = None, enseignant_nom: str = None,
+                   salle_nom: str = None) -> list:
+        """
+        Retourne les séances correspondant à tous les critères fournis.
+        Part de la plus petite liste indexée puis filtre sur les autres noms.
+        Sans critère, retourne toutes les séances.
+        """
+        criteres = [
+            (par_nom, nom, attribut)
+            for par_nom, nom, attribut in (
+                (self._par_groupe, groupe_nom, "groupe"),
+                (self._par_enseignant, enseignant_nom, "enseignant"),
+                (self._par_salle, salle_nom, "salle"),
+            )
+            if nom is not None
+        ]
+        if not criteres:
+            return self.seances
+
+        criteres.sort(key=lambda c: len(c[0].get(c[1], [])))
+        par_nom, nom, _ = criteres[0]
+        return [
+            s for s in par_nom.get(nom, [])
+            if all(getattr(s, attribut).nom == n for _, n, attribut in criteres[1:])
+        ]
 
     # Statistiques
-    def calculer_taux_occupation(self, salle) -> float:
+    def calculer_taux_occupation(self, salle, calendrier=None) -> float:
         """
         Calcule le taux d'occupation d'une salle en %.
         Taux = (heures occupées / heures totales) * 100
+        Les heures totales viennent du calendrier d'ouverture
+        (services.statistiques.CalendrierOuverture), par défaut du lundi
+        au vendredi de 8h à 18h comme dans StatistiquesEmploiDuTemps.
+        Pour toutes les salles à la fois, utiliser StatistiquesEmploiDuTemps.
         """
+        if calendrier is None:
+            from services.statistiques import CalendrierOuverture
+            calendrier = CalendrierOuverture()
         heures_occupees = sum(
-            (s.creneau.heure_fin.hour - s.creneau.heure_debut.hour)
-            for s in self._seances if s.salle == salle
+            s.creneau.duree_heures
+            for s in self._par_salle.get(salle.nom, []) if s.salle == salle
         )
-        heures_totales = 40  # Exemple : 8h/jour * 5 jours
+        heures_totales = calendrier.minutes_ouvertes / 60
         return (heures_occupees / heures_totales) * 100 if heures_totales else 0
 
     # Représentation
@@ -80,4 +242,4 @@ class EmploiDuTemps:
     def __str__(self) -> str:
         if not self._seances:
             return "Aucune séance programmée."
-        return "\n".join(str(s) for s in self._seances)
+        return "\n".join(str(s) for s in self._seances.values())
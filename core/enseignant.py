@@ -1,4 +1,7 @@
+from datetime import time
+
 from core.creneau import Creneau
+from core.plages_horaires import AUCUNE_PLAGE, PlagesHoraires, minutes, vers_creneaux
 
 
 class Enseignant:
@@ -6,14 +9,18 @@ class Enseignant:
     Représente un enseignant avec ses matières et ses disponibilités.
     """
 
+    __slots__ = ("_id", "_nom", "_matieres", "_disponibilites", "_plages")
+
     def __init__(self, identifiant: int, nom: str, matieres=None, disponibilites=None):
         self._valider_identifiant(identifiant)
         self._valider_nom(nom)
 
         self._id = identifiant
         self._nom = nom
-        self._matieres = list(matieres) if matieres else []
-        self._disponibilites = list(disponibilites) if disponibilites else []
+        self._matieres = tuple(matieres) if matieres else ()
+        self._disponibilites = tuple(disponibilites) if disponibilites else ()
+        # Disponibilités fusionnées et triées par jour
+        self._plages = PlagesHoraires(self._disponibilites) if self._disponibilites else AUCUNE_PLAGE
 
     # Propriétés (lecture seule)
 
@@ -31,23 +38,53 @@ class Enseignant:
 
     @property
     def disponibilites(self):
-        return list(self._disponibilites)
+        return self._disponibilites
 
     # Logique métier
 
     def est_disponible(self, creneau: Creneau) -> bool:
         """
-        Vérifie si le créneau demandé est inclus
-        dans au moins une disponibilité de l'enseignant.
+        Vérifie si le créneau demandé est inclus dans les disponibilités
+        de l'enseignant (des disponibilités contiguës comptent pour une seule).
         """
         if not isinstance(creneau, Creneau):
             raise TypeError("creneau doit être une instance de Creneau")
 
-        return any(
-            dispo.contient(creneau) for dispo in self._disponibilites
-        )
+        return self._plages.contient(creneau)
+
+    def minutes_disponibles(self, creneau: Creneau) -> int:
+        """Minutes du créneau couvertes par les disponibilités de l'enseignant."""
+        return sum(fin - debut for debut, fin in self._plages.couvertes(
+            creneau.jour_index, creneau.debut_minutes, creneau.fin_minutes
+        ))
+
+    def creneaux_libres(self, jour: str, debut: time = time(0, 0), fin: time = time(23, 59)) -> list:
+        """Plages de disponibilité du jour, fusionnées et limitées à [debut, fin]."""
+        jour_index = Creneau.JOURS.index(jour.lower())
+        return vers_creneaux(jour, self._plages.couvertes(jour_index, minutes(debut), minutes(fin)))
+
     def ajouter_disponibilite(self, creneau):
-      self._disponibilites.append(creneau)
+      self._disponibilites += (creneau,)
+      if self._plages is AUCUNE_PLAGE:
+          self._plages = PlagesHoraires()
+      self._plages.ajouter(creneau)
+
+    def retirer_disponibilite(self, creneau: Creneau) -> None:
+        """
+        Rend l'enseignant indisponible sur le créneau : chaque disponibilité
+        qui le chevauche est amputée de la partie commune.
+        """
+        restantes = []
+        for dispo in self._disponibilites:
+            if not dispo.chevauche(creneau):
+                restantes.append(dispo)
+                continue
+            if dispo.heure_debut < creneau.heure_debut:
+                restantes.append(Creneau.interner(dispo.jour, dispo.heure_debut, creneau.heure_debut))
+            if creneau.heure_fin < dispo.heure_fin:
+                restantes.append(Creneau.interner(dispo.jour, creneau.heure_fin, dispo.heure_fin))
+        self._disponibilites = tuple(restantes)
+        self._plages.retirer(creneau)
 
     # Validation interne
 
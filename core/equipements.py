@@ -0,0 +1,79 @@
+from bisect import bisect_left
+
+
+class RegistreEquipements:
+    """
+    Registre global des équipements : chaque nom d'équipement reçoit un bit
+    à sa première apparition, et un ensemble d'équipements est codé par
+    l'entier qui réunit leurs bits. « La salle possède tout l'équipement
+    requis » devient alors requis & ~possede == 0.
+    Les numéros dépendent de l'ordre d'apparition dans le processus : les
+    masques ne doivent pas être enregistrés ni transmis à un autre processus.
+    """
+
+    _bits = {}
+    _noms = []
+
+    @classmethod
+    def bit(cls, nom: str) -> int:
+        bit = cls._bits.get(nom)
+        if bit is None:
+            bit = cls._bits.setdefault(nom, 1 << len(cls._noms))
+            cls._noms.append(nom)
+        return bit
+
+    @classmethod
+    def masque(cls, equipements) -> int:
+        masque = 0
+        for nom in equipements:
+            masque |= cls.bit(nom)
+        return masque
+
+    @classmethod
+    def noms(cls, masque: int) -> frozenset:
+        return frozenset(nom for i, nom in enumerate(cls._noms) if masque >> i & 1)
+
+
+class TableCompatibilite:
+    """
+    Matrice matière × salle précalculée pour une liste de salles.
+    Chaque ligne est un masque de salles (bit k = salle k) :
+    - salles équipées pour une matière, calculée une fois par ensemble
+      d'équipements requis (les matières qui ont les mêmes besoins partagent
+      leur ligne) ;
+    - salles assez grandes pour un effectif, obtenue par recherche
+      dichotomique dans les capacités triées.
+    La compatibilité d'une demande est le ET des deux lignes.
+    """
+
+    def __init__(self, salles):
+        self.salles = list(salles)
+        ordre = sorted(range(len(self.salles)), key=lambda k: self.salles[k].capacite)
+        self._capacites = [self.salles[k].capacite for k in ordre]
+        # _suffixes[j] : salles de capacité >= self._capacites[j]
+        self._suffixes = [0] * (len(ordre) + 1)
+        for j in range(len(ordre) - 1, -1, -1):
+            self._suffixes[j] = self._suffixes[j + 1] | 1 << ordre[j]
+        self._par_equipements = {}
+        self._par_effectif = {}
+
+    def salles_equipees(self, matiere) -> int:
+        requis = matiere.masque_equipements
+        masque = self._par_equipements.get(requis)
+        if masque is None:
+            masque = self._par_equipements[requis] = sum(
+                1 << k for k, salle in enumerate(self.salles)
+                if not requis & ~salle.masque_equipements
+            )
+        return masque
+
+    def salles_assez_grandes(self, effectif: int) -> int:
+        masque = self._par_effectif.get(effectif)
+        if masque is None:
+            masque = self._par_effectif[effectif] = self._suffixes[
+                bisect_left(self._capacites, effectif)
+            ]
+        return masque
+
+    def compatibles(self, matiere, effectif: int) -> int:
+        return self.salles_equipees(matiere) & self.salles_assez_grandes(effectif)
@@ -18,3 +18,20 @@ class CompatibiliteSalleException(Exception):
     avec le groupe ou la matière (effectif / équipements).
     """
     pass
+
+class AucuneSolutionException(Exception):
+    """
+    Exception levée lorsqu'un algorithme de génération
+    ne parvient pas à placer toutes les demandes.
+    """
+    pass
+
+class ProblemeInfaisableException(AucuneSolutionException):
+    """
+    Exception levée avant toute recherche lorsque l'analyse de faisabilité
+    prouve que les demandes ne peuvent pas toutes être placées.
+    Le rapport détaillé est disponible dans l'attribut rapport.
+    """
+    def __init__(self, rapport):
+        super().__init__(str(rapport))
+        self.rapport = rapport
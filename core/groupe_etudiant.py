@@ -3,6 +3,8 @@ class GroupeEtudiant:
     Représente un groupe d'étudiants appartenant à une filière donnée.
     """
 
+    __slots__ = ("_id", "_nom", "_filiere", "_effectif", "_niveau")
+
     def __init__(
         self,
         identifiant: int,
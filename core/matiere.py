@@ -1,9 +1,18 @@
+from sys import intern
+
+from core.equipements import RegistreEquipements
+
+
 class Matiere:
     """
     Représente une matière enseignée dans l'établissement.
     """
 
+    __slots__ = ("_code", "_nom", "_type_seance", "_volume_horaire", "_equipements_requis",
+                 "_masque_equipements")
+
     TYPES_SEANCE_VALIDES = {"cours", "td", "tp"}
+    AUCUN_EQUIPEMENT = frozenset()
 
     def __init__(
         self,
@@ -20,9 +29,12 @@ class Matiere:
 
         self._code = code.upper()
         self._nom = nom
-        self._type_seance = type_seance.lower()
+        self._type_seance = intern(type_seance.lower())
         self._volume_horaire = volume_horaire
-        self._equipements_requis = set(equipements_requis) if equipements_requis else set()
+        self._equipements_requis = (
+            frozenset(equipements_requis) if equipements_requis else self.AUCUN_EQUIPEMENT
+        )
+        self._masque_equipements = RegistreEquipements.masque(self._equipements_requis)
 
     # --------------------
     # Propriétés (lecture seule)
@@ -45,7 +57,12 @@ class Matiere:
 
     @property
     def equipements_requis(self):
-        return set(self._equipements_requis)
+        return self._equipements_requis
+
+    @property
+    def masque_equipements(self) -> int:
+        """Équipements requis codés par le registre global (voir RegistreEquipements)."""
+        return self._masque_equipements
 
     # --------------------
     # Validation interne
@@ -82,3 +99,8 @@ class Matiere:
 
     def __hash__(self):
         return hash(self.code)
+
+    def __reduce__(self):
+        # Le masque est recalculé par le registre du processus qui reçoit la matière
+        return (Matiere, (self._code, self._nom, self._type_seance, self._volume_horaire,
+                          self._equipements_requis))
@@ -0,0 +1,43 @@
+from core.emploi_du_temps import IndexCreneaux
+from core.reservation import Reservation
+
+
+class OccupationSalles:
+    """
+    Index des occupations de salles partagé entre les séances et les
+    réservations : salle -> jour -> occupations triées par heure de début
+    (voir IndexCreneaux). Vérifier qu'une salle est libre sur un créneau
+    ne demande qu'une recherche dichotomique dans la journée de cette salle.
+    Les salles sont des clés quelconques (objet Salle ou identifiant en base).
+    """
+
+    def __init__(self):
+        self._par_salle = {}
+
+    def ajouter(self, salle, creneau, occupant) -> None:
+        self._par_salle.setdefault(salle, IndexCreneaux()).ajouter(creneau, occupant)
+
+    def retirer(self, salle, creneau, occupant) -> None:
+        index = self._par_salle.get(salle)
+        if index is None:
+            raise ValueError("Occupation introuvable dans l'index.")
+        index.retirer(creneau, occupant)
+
+    def ajouter_seance(self, seance) -> None:
+        self.ajouter(seance.salle, seance.creneau, seance)
+
+    def ajouter_reservation(self, reservation) -> None:
+        """Seules les réservations en attente ou acceptées occupent la salle."""
+        if reservation.statut != Reservation.REJECTED:
+            self.ajouter(reservation.salle, reservation.creneau, reservation)
+
+    def occupants(self, salle, creneau) -> list:
+        """Séances et réservations de la salle qui chevauchent le créneau."""
+        index = self._par_salle.get(salle)
+        if index is None:
+            return []
+        return index.chevauchements(creneau)
+
+    def est_libre(self, salle, creneau, sauf=None) -> bool:
+        """sauf : occupant à ignorer (ex: la réservation que l'on examine)."""
+        return all(occupant is sauf for occupant in self.occupants(salle, creneau))
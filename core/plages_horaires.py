@@ -0,0 +1,147 @@
+from bisect import bisect_left, bisect_right
+from datetime import time
+
+from core.creneau import Creneau
+
+
+class PlagesHoraires:
+    """
+    Réunion d'intervalles horaires, rangée par jour : pour chaque jour, les
+    débuts et les fins (en minutes) d'intervalles disjoints et triés. Les
+    intervalles qui se chevauchent ou se touchent sont fusionnés à l'ajout,
+    si bien que l'intervalle qui peut contenir ou chevaucher un créneau se
+    trouve par recherche dichotomique (O(log n)).
+    """
+
+    __slots__ = ("_debuts", "_fins")
+
+    def __init__(self, creneaux=()):
+        self._debuts = {}
+        self._fins = {}
+        # Dans l'ordre chronologique, chaque ajout se fait en fin de liste
+        for creneau in sorted(creneaux, key=lambda c: c.cle_tri):
+            self.ajouter(creneau)
+
+    def ajouter(self, creneau: Creneau) -> None:
+        debuts = self._debuts.setdefault(creneau.jour_index, [])
+        fins = self._fins.setdefault(creneau.jour_index, [])
+        debut, fin = creneau.debut_minutes, creneau.fin_minutes
+        # Intervalles i..j-1 qui touchent ou chevauchent [debut, fin]
+        i = bisect_left(fins, debut)
+        j = bisect_right(debuts, fin)
+        if i < j:
+            debut = min(debut, debuts[i])
+            fin = max(fin, fins[j - 1])
+        debuts[i:j] = [debut]
+        fins[i:j] = [fin]
+
+    def retirer(self, creneau: Creneau) -> None:
+        """Retire le créneau : les intervalles qui le chevauchent sont amputés."""
+        debuts = self._debuts.get(creneau.jour_index)
+        if not debuts:
+            return
+        fins = self._fins[creneau.jour_index]
+        debut, fin = creneau.debut_minutes, creneau.fin_minutes
+        # Intervalles i..j-1 qui chevauchent ]debut, fin[
+        i = bisect_right(fins, debut)
+        j = bisect_left(debuts, fin)
+        if i >= j:
+            return
+        morceaux = []
+        if debuts[i] < debut:
+            morceaux.append((debuts[i], debut))
+        if fins[j - 1] > fin:
+            morceaux.append((fin, fins[j - 1]))
+        debuts[i:j] = [d for d, _ in morceaux]
+        fins[i:j] = [f for _, f in morceaux]
+
+    def contient(self, creneau: Creneau) -> bool:
+        """Le créneau est-il entièrement couvert par un intervalle ?"""
+        debuts = self._debuts.get(creneau.jour_index)
+        if not debuts:
+            return False
+        i = bisect_right(debuts, creneau.debut_minutes) - 1
+        return i >= 0 and self._fins[creneau.jour_index][i] >= creneau.fin_minutes
+
+    def chevauche(self, creneau: Creneau) -> bool:
+        """Un intervalle recouvre-t-il au moins une partie du créneau ?"""
+        fins = self._fins.get(creneau.jour_index)
+        if not fins:
+            return False
+        i = bisect_right(fins, creneau.debut_minutes)
+        return i < len(fins) and self._debuts[creneau.jour_index][i] < creneau.fin_minutes
+
+    def couvertes(self, jour_index: int, debut: int = 0, fin: int = 24 * 60) -> list:
+        """Parties couvertes de [debut, fin] ce jour-là : liste de (début, fin) en minutes."""
+        debuts = self._debuts.get(jour_index, [])
+        fins = self._fins.get(jour_index, [])
+        resultat = []
+        i = bisect_right(fins, debut)
+        while i < len(debuts) and debuts[i] < fin:
+            resultat.append((max(debuts[i], debut), min(fins[i], fin)))
+            i += 1
+        return resultat
+
+    def non_couvertes(self, jour_index: int, debut: int = 0, fin: int = 24 * 60) -> list:
+        """Parties libres de [debut, fin] ce jour-là : liste de (début, fin) en minutes."""
+        resultat = []
+        curseur = debut
+        for d, f in self.couvertes(jour_index, debut, fin):
+            if d > curseur:
+                resultat.append((curseur, d))
+            curseur = f
+        if curseur < fin:
+            resultat.append((curseur, fin))
+        return resultat
+
+    def __bool__(self):
+        return any(self._debuts.values())
+
+
+class _PlagesVides(PlagesHoraires):
+    """Réunion vide partagée : elle refuse tout ajout, qui toucherait tous ses utilisateurs."""
+
+    __slots__ = ()
+
+    def ajouter(self, creneau: Creneau) -> None:
+        raise TypeError("AUCUNE_PLAGE est partagée et ne peut pas être modifiée")
+
+    def __reduce__(self):
+        # Copies et pickles renvoient l'instance partagée, que les
+        # ressources reconnaissent par identité
+        return "AUCUNE_PLAGE"
+
+
+# Partagée par les ressources sans disponibilités, jusqu'à leur premier ajout
+AUCUNE_PLAGE = _PlagesVides()
+
+
+def intersection(intervalles, autres) -> list:
+    """
+    Intersection de deux listes triées d'intervalles disjoints
+    (début, fin), par un balayage simultané des deux listes.
+    """
+    resultat = []
+    i = j = 0
+    while i < len(intervalles) and j < len(autres):
+        debut = max(intervalles[i][0], autres[j][0])
+        fin = min(intervalles[i][1], autres[j][1])
+        if debut < fin:
+            resultat.append((debut, fin))
+        if intervalles[i][1] < autres[j][1]:
+            i += 1
+        else:
+            j += 1
+    return resultat
+
+
+def minutes(heure: time) -> int:
+    return heure.hour * 60 + heure.minute
+
+
+def vers_creneaux(jour: str, intervalles) -> list:
+    """Créneaux (internés) correspondant à des (début, fin) en minutes."""
+    return [
+        Creneau.interner(jour, time(*divmod(debut, 60)), time(*divmod(fin, 60)))
+        for debut, fin in intervalles
+    ]
@@ -1,4 +1,8 @@
+from datetime import time
+from sys import intern
 from core import creneau
+from core.equipements import RegistreEquipements
+from core.plages_horaires import AUCUNE_PLAGE, PlagesHoraires, minutes, vers_creneaux
 
 
 class Salle:
@@ -6,7 +10,11 @@ class Salle:
     Représente une salle physique (TD, TP ou Amphithéâtre).
     """
 
+    __slots__ = ("_id", "_nom", "_capacite", "_type", "_equipements", "_masque_equipements",
+                 "_disponibilites", "_indisponibilites")
+
     TYPES_VALIDES = {"amphi", "td", "tp"}
+    AUCUN_EQUIPEMENT = frozenset()
 
     def __init__(self, identifiant: int, nom: str, capacite: int,
                  type_salle: str, equipements=None, disponibilites=None):
@@ -19,9 +27,13 @@ class Salle:
         self._id = identifiant
         self._nom = nom
         self._capacite = capacite
-        self._type = type_salle.lower()
-        self._equipements = set(equipements) if equipements else set()
-        self._disponibilites = list(disponibilites) if disponibilites else []
+        self._type = intern(type_salle.lower())
+        self._equipements = frozenset(equipements) if equipements else self.AUCUN_EQUIPEMENT
+        self._masque_equipements = RegistreEquipements.masque(self._equipements)
+        self._disponibilites = tuple(disponibilites) if disponibilites else ()
+        # Créneaux bloqués, fusionnés et triés par jour
+        self._indisponibilites = (PlagesHoraires(self._disponibilites) if self._disponibilites
+                                  else AUCUNE_PLAGE)
   
     # Propriétés (lecture seule)
     
@@ -43,18 +55,33 @@ class Salle:
 
     @property
     def equipements(self):
-        return set(self._equipements)
+        return self._equipements
+
+    @property
+    def masque_equipements(self) -> int:
+        """Équipements codés par le registre global (voir RegistreEquipements)."""
+        return self._masque_equipements
     
     @property
     def disponibilites(self):
-        return list(self._disponibilites)
+        return self._disponibilites
 
     # Gestion des disponibilités
     def ajouter_disponibilite(self, creneau: creneau.Creneau) -> None:
-        self._disponibilites.append(creneau)
+        self._disponibilites += (creneau,)
+        if self._indisponibilites is AUCUNE_PLAGE:
+            self._indisponibilites = PlagesHoraires()
+        self._indisponibilites.ajouter(creneau)
 
     def est_disponible(self, creneau: creneau.Creneau) -> bool:
-        return all(not dispo.chevauche(creneau) for dispo in self._disponibilites)
+        return not self._indisponibilites.chevauche(creneau)
+
+    def creneaux_libres(self, jour: str, debut: time = time(0, 0), fin: time = time(23, 59)) -> list:
+        """Plages du jour, entre debut et fin, où la salle n'est pas bloquée."""
+        jour_index = creneau.Creneau.JOURS.index(jour.lower())
+        return vers_creneaux(jour, self._indisponibilites.non_couvertes(
+            jour_index, minutes(debut), minutes(fin)
+        ))
 
 
     # Logique métier
@@ -62,14 +89,17 @@ class Salle:
     def est_compatible(self, effectif: int, equipements_requis=None) -> bool:
         """
         Vérifie si la salle peut accueillir un groupe et répondre aux besoins matériels.
+        equipements_requis : noms d'équipements, ou masque déjà codé
+        (ex: matiere.masque_equipements), ce qui évite tout ensemble intermédiaire.
         """
-        if effectif > self.capacite:
+        if effectif > self._capacite:
             return False
 
-        if equipements_requis:
-            return set(equipements_requis).issubset(self._equipements)
-
-        return True
+        if not equipements_requis:
+            return True
+        if not isinstance(equipements_requis, int):
+            equipements_requis = RegistreEquipements.masque(equipements_requis)
+        return not equipements_requis & ~self._masque_equipements
 
 
 
@@ -107,3 +137,8 @@ class Salle:
 
     def __hash__(self):
         return hash(self.id)
+
+    def __reduce__(self):
+        # Le masque est recalculé par le registre du processus qui reçoit la salle
+        return (Salle, (self._id, self._nom, self._capacite, self._type,
+                        self._equipements, self._disponibilites))
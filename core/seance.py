@@ -11,6 +11,8 @@ class Seance:
     Lie : matière, enseignant, groupe, salle et créneau.
     """
 
+    __slots__ = ("_matiere", "_enseignant", "_groupe", "_salle", "_creneau")
+
     def __init__(
         self,
         matiere: Matiere,
@@ -57,7 +59,7 @@ class Seance:
         """
         Vérifie que la séance est possible selon l'effectif et les équipements.
         """
-        if not self.salle.est_compatible(self.groupe.effectif, self.matiere.equipements_requis):
+        if not self.salle.est_compatible(self.groupe.effectif, self.matiere.masque_equipements):
             raise ValueError(
                 f"La salle {self.salle.nom} n'est pas compatible avec le groupe "
                 f"{self.groupe.nom} ou la matière {self.matiere.nom}."
@@ -161,7 +161,7 @@ def charger_enseignants():
             cursor.execute("SELECT jour, heure_debut, heure_fin FROM Enseignant_Disponibilite WHERE enseignant_id = ?", (e.id,))
             for d in cursor.fetchall():
                 c = Creneau(d[0], str_to_time(d[1]), str_to_time(d[2]))
-                e._disponibilites.append(c)  # accès direct car propriété lecture seule
+                e.ajouter_disponibilite(c)
             enseignants.append(e)
     return enseignants
 
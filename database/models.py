@@ -81,7 +81,7 @@ class CreneauModel(Base):
     __tablename__ = 'creneaux'
     
     id = Column(Integer, primary_key=True, index=True)
-    jour = Column(String(20), nullable=False)  # Lundi, Mardi, etc.
+    jour = Column(String(20), nullable=False, index=True)  # Lundi, Mardi, etc.
     heure_debut = Column(Time, nullable=False)
     heure_fin = Column(Time, nullable=False)
     
@@ -119,7 +119,7 @@ class SeanceModel(Base):
     matiere_id = Column(Integer, ForeignKey('matieres.id'), nullable=False)
     enseignant_id = Column(Integer, ForeignKey('enseignants.id'), nullable=False)
     groupe_id = Column(Integer, ForeignKey('groupes_etudiants.id'), nullable=False)
-    salle_id = Column(Integer, ForeignKey('salles.id'), nullable=False)
+    salle_id = Column(Integer, ForeignKey('salles.id'), nullable=False, index=True)
     creneau_id = Column(Integer, ForeignKey('creneaux.id'), nullable=False)
     
     # Relationships
@@ -159,7 +159,7 @@ class ReservationModel(Base):
     
     # Foreign keys
     utilisateur_id = Column(Integer, ForeignKey('utilisateurs.id'), nullable=False)
-    salle_id = Column(Integer, ForeignKey('salles.id'), nullable=False)
+    salle_id = Column(Integer, ForeignKey('salles.id'), nullable=False, index=True)
     creneau_id = Column(Integer, ForeignKey('creneaux.id'), nullable=False)
     
     # Reservation details
@@ -1,7 +1,8 @@
 """Repository pattern for database operations."""
 
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from database.models import (
     SalleModel, MatiereModel, GroupeEtudiantModel,
     CreneauModel, EnseignantModel, SeanceModel,
@@ -14,9 +15,145 @@ from core.creneau import Creneau
 from core.enseignant import Enseignant
 from core.seance import Seance
 from core.reservation import Reservation
+from core.occupation_salles import OccupationSalles
+from core.exceptions import ConflitException
 import bcrypt
 
 
+class IdentityMap:
+    """
+    Session-scoped identity map: one domain instance per (class, primary key).
+
+    The map is stored in ``session.info`` so every repository call made with
+    the same session shares it, and it goes away with the session.
+    """
+
+    INFO_KEY = "identity_map"
+
+    def __init__(self):
+        self._instances = {}
+
+    @classmethod
+    def of(cls, session: Session) -> "IdentityMap":
+        """Return the identity map attached to a session, creating it if needed."""
+        identity_map = session.info.get(cls.INFO_KEY)
+        if identity_map is None:
+            identity_map = session.info[cls.INFO_KEY] = cls()
+        return identity_map
+
+    def get(self, domain_class, pk, factory):
+        """Return the cached instance for this key, building it with factory() on a miss."""
+        key = (domain_class, pk)
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = self._instances[key] = factory()
+        return instance
+
+    def clear(self) -> None:
+        self._instances.clear()
+
+
+class OccupationIndex:
+    """
+    Session-scoped room occupancy index shared by seances and active
+    reservations (pending or accepted), see core.OccupationSalles.
+
+    A (salle, jour) pair is loaded the first time it is checked, with one
+    query for its seances and one for its reservations, so the tables are
+    never loaded whole; later checks on that pair are in-memory O(log n)
+    lookups. Repository writes keep loaded pairs up to date. Like
+    IdentityMap, the index lives in ``session.info``.
+    """
+
+    INFO_KEY = "occupation_salles"
+    ACTIVE_STATUSES = ('en_attente', 'acceptee')
+
+    def __init__(self):
+        self._occupation = OccupationSalles()
+        self._loaded = set()
+
+    @classmethod
+    def of(cls, session: Session) -> "OccupationIndex":
+        """Return the occupancy index attached to a session, creating it if needed."""
+        index = session.info.get(cls.INFO_KEY)
+        if index is None:
+            index = session.info[cls.INFO_KEY] = cls()
+        return index
+
+    def occupants(self, session: Session, salle_id: int, creneau: Creneau) -> list:
+        """SeanceModel and active ReservationModel rows of the salle overlapping the creneau."""
+        self._load(session, salle_id, creneau.jour)
+        return self._occupation.occupants(salle_id, creneau)
+
+    def add(self, salle_id: int, creneau: Creneau, occupant) -> None:
+        # Pairs not loaded yet will read the flushed row from the database
+        if (salle_id, creneau.jour) in self._loaded:
+            self._occupation.ajouter(salle_id, creneau, occupant)
+
+    def remove(self, salle_id: int, creneau: Creneau, occupant) -> None:
+        if (salle_id, creneau.jour) in self._loaded:
+            self._occupation.retirer(salle_id, creneau, occupant)
+
+    def _load(self, session: Session, salle_id: int, jour: str) -> None:
+        if (salle_id, jour) in self._loaded:
+            return
+        self._loaded.add((salle_id, jour))
+        seances = session.query(SeanceModel, CreneauModel).join(SeanceModel.creneau).filter(
+            SeanceModel.salle_id == salle_id, CreneauModel.jour == jour
+        )
+        reservations = session.query(ReservationModel, CreneauModel).join(
+            ReservationModel.creneau
+        ).filter(
+            ReservationModel.salle_id == salle_id, CreneauModel.jour == jour,
+            ReservationModel.statut.in_(self.ACTIVE_STATUSES)
+        )
+        for occupant, db_creneau in [*seances, *reservations]:
+            self._occupation.ajouter(salle_id, _creneau_to_domain(db_creneau), occupant)
+
+
+def _conflict_message(salle_nom: str, creneau: Creneau, occupants: list) -> str:
+    nb_seances = sum(isinstance(o, SeanceModel) for o in occupants)
+    nb_reservations = len(occupants) - nb_seances
+    return (
+        f"La salle {salle_nom} n'est pas libre le {creneau} : "
+        f"{nb_seances} séance(s) et {nb_reservations} réservation(s) en conflit."
+    )
+
+
+def _salle_to_domain(session: Session, s: SalleModel) -> Salle:
+    return IdentityMap.of(session).get(
+        Salle, s.id, lambda: Salle(s.id, s.nom, s.capacite, s.type_salle, s.equipements)
+    )
+
+
+def _matiere_to_domain(session: Session, m: MatiereModel) -> Matiere:
+    return IdentityMap.of(session).get(
+        Matiere, m.id,
+        lambda: Matiere(m.code, m.nom, m.type_cours, m.heures_par_semaine, m.equipements_requis)
+    )
+
+
+def _groupe_to_domain(session: Session, g: GroupeEtudiantModel) -> GroupeEtudiant:
+    return IdentityMap.of(session).get(
+        GroupeEtudiant, g.id, lambda: GroupeEtudiant(g.id, g.nom, g.filiere, g.effectif, g.niveau)
+    )
+
+
+def _creneau_to_domain(c: CreneauModel) -> Creneau:
+    return Creneau.interner(c.jour, c.heure_debut, c.heure_fin)
+
+
+def _enseignant_to_domain(session: Session, e: EnseignantModel) -> Enseignant:
+    return IdentityMap.of(session).get(
+        Enseignant, e.id,
+        lambda: Enseignant(
+            e.id, e.nom,
+            [_matiere_to_domain(session, m) for m in e.matieres],
+            [_creneau_to_domain(c) for c in e.disponibilites]
+        )
+    )
+
+
 class SalleRepository:
     """Repository for Salle operations."""
     
@@ -38,18 +175,14 @@ class SalleRepository:
     def get_all(session: Session) -> List[Salle]:
         """Get all salles from database."""
         db_salles = session.query(SalleModel).all()
-        return [
-            Salle(s.id, s.nom, s.capacite, s.type_salle, s.equipements)
-            for s in db_salles
-        ]
+        return [_salle_to_domain(session, s) for s in db_salles]
     
     @staticmethod
     def get_by_id(session: Session, salle_id: int) -> Optional[Salle]:
         """Get a salle by ID."""
         db_salle = session.query(SalleModel).filter(SalleModel.id == salle_id).first()
         if db_salle:
-            return Salle(db_salle.id, db_salle.nom, db_salle.capacite, 
-                        db_salle.type_salle, db_salle.equipements)
+            return _salle_to_domain(session, db_salle)
         return None
 
 
@@ -74,10 +207,7 @@ class MatiereRepository:
     def get_all(session: Session) -> List[Matiere]:
         """Get all matieres from database."""
         db_matieres = session.query(MatiereModel).all()
-        return [
-            Matiere(m.code, m.nom, m.type_cours, m.heures_par_semaine, m.equipements_requis)
-            for m in db_matieres
-        ]
+        return [_matiere_to_domain(session, m) for m in db_matieres]
 
 
     @staticmethod
@@ -85,8 +215,7 @@ class MatiereRepository:
         """Get a matiere by its code."""
         db_matiere = session.query(MatiereModel).filter(MatiereModel.code == code).first()
         if db_matiere:
-            return Matiere(db_matiere.code, db_matiere.nom, db_matiere.type_cours, 
-                          db_matiere.heures_par_semaine, db_matiere.equipements_requis)
+            return _matiere_to_domain(session, db_matiere)
         return None
 
 
@@ -111,10 +240,7 @@ class GroupeEtudiantRepository:
     def get_all(session: Session) -> List[GroupeEtudiant]:
         """Get all groupes from database."""
         db_groupes = session.query(GroupeEtudiantModel).all()
-        return [
-            GroupeEtudiant(g.id, g.nom, g.filiere, g.effectif, g.niveau)
-            for g in db_groupes
-        ]
+        return [_groupe_to_domain(session, g) for g in db_groupes]
 
 
 class CreneauRepository:
@@ -136,10 +262,7 @@ class CreneauRepository:
     def get_all(session: Session) -> List[Creneau]:
         """Get all creneaux from database."""
         db_creneaux = session.query(CreneauModel).all()
-        return [
-            Creneau(c.jour, c.heure_debut, c.heure_fin)
-            for c in db_creneaux
-        ]
+        return [_creneau_to_domain(c) for c in db_creneaux]
     
     @staticmethod
     def get_or_create(session: Session, creneau: Creneau) -> CreneauModel:
@@ -190,19 +313,11 @@ class EnseignantRepository:
     @staticmethod
     def get_all(session: Session) -> List[Enseignant]:
         """Get all enseignants from database."""
-        db_enseignants = session.query(EnseignantModel).all()
-        result = []
-        for e in db_enseignants:
-            matieres = [
-                Matiere(m.code, m.nom, m.type_cours, m.heures_par_semaine, m.equipements_requis)
-                for m in e.matieres
-            ]
-            dispos = [
-                Creneau(c.jour, c.heure_debut, c.heure_fin)
-                for c in e.disponibilites
-            ]
-            result.append(Enseignant(e.id, e.nom, matieres, dispos))
-        return result
+        db_enseignants = session.query(EnseignantModel).options(
+            selectinload(EnseignantModel.matieres),
+            selectinload(EnseignantModel.disponibilites)
+        ).all()
+        return [_enseignant_to_domain(session, e) for e in db_enseignants]
 
     @staticmethod
     def get_by_id_domain(session: Session, enseignant_id: int) -> Optional[Enseignant]:
@@ -210,15 +325,7 @@ class EnseignantRepository:
         e = session.query(EnseignantModel).filter(EnseignantModel.id == enseignant_id).first()
         if not e:
             return None
-        matieres = [
-            Matiere(m.code, m.nom, m.type_cours, m.heures_par_semaine, m.equipements_requis)
-            for m in e.matieres
-        ]
-        dispos = [
-            Creneau(c.jour, c.heure_debut, c.heure_fin)
-            for c in e.disponibilites
-        ]
-        return Enseignant(e.id, e.nom, matieres, dispos)
+        return _enseignant_to_domain(session, e)
 
 
 class UtilisateurRepository:
@@ -278,6 +385,7 @@ class SeanceRepository:
         )
         session.add(db_seance)
         session.flush()
+        OccupationIndex.of(session).add(salle_id, seance.creneau, db_seance)
         return db_seance
     
     @staticmethod
@@ -287,31 +395,71 @@ class SeanceRepository:
 
     @staticmethod
     def get_all_domain(session: Session) -> List[Seance]:
-        """Get all seances as domain objects."""
-        db_seances = session.query(SeanceModel).all()
-        domain_seances = []
-        for s in db_seances:
-            matiere = Matiere(s.matiere.code, s.matiere.nom, s.matiere.type_cours, 
-                             s.matiere.heures_par_semaine, s.matiere.equipements_requis)
-            enseignant = Enseignant(s.enseignant.id, s.enseignant.nom, [], []) # Detail loading if needed
-            # For simplicity, we just need names for the dashboard in some cases,
-            # but for full domain objects we'd need to reconstruct them properly.
-            # Let's do it properly:
-            enseignant = EnseignantRepository.get_by_id_domain(session, s.enseignant_id)
-            groupe = GroupeEtudiant(s.groupe.id, s.groupe.nom, s.groupe.filiere, 
-                                   s.groupe.effectif, s.groupe.niveau)
-            salle = Salle(s.salle.id, s.salle.nom, s.salle.capacite, 
-                         s.salle.type_salle, s.salle.equipements)
-            creneau = Creneau(s.creneau.jour, s.creneau.heure_debut, s.creneau.heure_fin)
-            
-            domain_seances.append(Seance(matiere, enseignant, groupe, salle, creneau))
-        return domain_seances
+        """
+        Get all seances as domain objects.
+
+        Only the foreign keys of the seances are fetched, then each related
+        table is loaded in one query (enseignant collections are eager-loaded),
+        so the number of queries does not depend on the number of seances.
+        Related rows are selected with ``IN (SELECT ... FROM seances)`` rather
+        than a list of ids, which would need one bound parameter per id and
+        can exceed SQLite's bound-variable limit on a large catalogue.
+        Related domain objects come from the session identity map and are
+        shared between seances.
+        """
+        lignes = session.query(
+            SeanceModel.matiere_id, SeanceModel.enseignant_id, SeanceModel.groupe_id,
+            SeanceModel.salle_id, SeanceModel.creneau_id
+        ).all()
+        if not lignes:
+            return []
+
+        creneaux = {
+            c.id: _creneau_to_domain(c)
+            for c in session.query(CreneauModel).filter(
+                CreneauModel.id.in_(select(SeanceModel.creneau_id))
+            )
+        }
+        matieres = {
+            m.id: _matiere_to_domain(session, m)
+            for m in session.query(MatiereModel).filter(
+                MatiereModel.id.in_(select(SeanceModel.matiere_id))
+            )
+        }
+        groupes = {
+            g.id: _groupe_to_domain(session, g)
+            for g in session.query(GroupeEtudiantModel).filter(
+                GroupeEtudiantModel.id.in_(select(SeanceModel.groupe_id))
+            )
+        }
+        salles = {
+            s.id: _salle_to_domain(session, s)
+            for s in session.query(SalleModel).filter(
+                SalleModel.id.in_(select(SeanceModel.salle_id))
+            )
+        }
+        enseignants = {
+            e.id: _enseignant_to_domain(session, e)
+            for e in session.query(EnseignantModel).options(
+                selectinload(EnseignantModel.matieres),
+                selectinload(EnseignantModel.disponibilites)
+            ).filter(EnseignantModel.id.in_(select(SeanceModel.enseignant_id)))
+        }
+
+        return [
+            Seance(matieres[l.matiere_id], enseignants[l.enseignant_id], groupes[l.groupe_id],
+                   salles[l.salle_id], creneaux[l.creneau_id])
+            for l in lignes
+        ]
 
     @staticmethod
     def delete(session: Session, seance_id: int) -> bool:
         """Delete a seance by ID."""
         db_seance = session.query(SeanceModel).filter(SeanceModel.id == seance_id).first()
         if db_seance:
+            OccupationIndex.of(session).remove(
+                db_seance.salle_id, _creneau_to_domain(db_seance.creneau), db_seance
+            )
             session.delete(db_seance)
             return True
         return False
@@ -332,6 +480,7 @@ class SeanceRepository:
         ).first()
         
         if db_seance:
+            OccupationIndex.of(session).remove(db_seance.salle_id, seance.creneau, db_seance)
             session.delete(db_seance)
             session.commit()
             return True
@@ -343,15 +492,25 @@ class ReservationRepository:
     
     @staticmethod
     def create(session: Session, reservation: Reservation, utilisateur_id: int) -> ReservationModel:
-        """Create a new reservation in database."""
-        # Get or create creneau
-        db_creneau = CreneauRepository.get_or_create(session, reservation.creneau)
-        
+        """
+        Create a new pending reservation in database.
+
+        Raises ConflitException if the salle is already taken on that creneau
+        by a seance or by another pending or accepted reservation.
+        """
         # Get salle
         db_salle = session.query(SalleModel).filter(SalleModel.nom == reservation.salle.nom).first()
         if not db_salle:
             raise ValueError(f"Salle {reservation.salle.nom} non trouvée.")
 
+        index = OccupationIndex.of(session)
+        occupants = index.occupants(session, db_salle.id, reservation.creneau)
+        if occupants:
+            raise ConflitException(_conflict_message(db_salle.nom, reservation.creneau, occupants))
+
+        # Get or create creneau
+        db_creneau = CreneauRepository.get_or_create(session, reservation.creneau)
+
         db_reservation = ReservationModel(
             utilisateur_id=utilisateur_id,
             salle_id=db_salle.id,
@@ -360,6 +519,8 @@ class ReservationRepository:
             statut='en_attente'
         )
         session.add(db_reservation)
+        session.flush()
+        index.add(db_salle.id, reservation.creneau, db_reservation)
         session.commit()
         return db_reservation
 
@@ -377,9 +538,30 @@ class ReservationRepository:
 
     @staticmethod
     def update_status(session: Session, reservation_id: int, status: str) -> bool:
-        """Update reservation status."""
+        """
+        Update reservation status.
+
+        Accepting raises ConflitException if the salle is taken on that
+        creneau by a seance or by another accepted reservation; pending
+        requests do not block it.
+        """
         db_res = session.query(ReservationModel).filter(ReservationModel.id == reservation_id).first()
         if db_res:
+            index = OccupationIndex.of(session)
+            creneau = _creneau_to_domain(db_res.creneau)
+            if status == 'acceptee':
+                bloquants = [
+                    o for o in index.occupants(session, db_res.salle_id, creneau)
+                    if o is not db_res and (isinstance(o, SeanceModel) or o.statut == 'acceptee')
+                ]
+                if bloquants:
+                    raise ConflitException(_conflict_message(db_res.salle.nom, creneau, bloquants))
+
+            actif = OccupationIndex.ACTIVE_STATUSES
+            if db_res.statut in actif and status not in actif:
+                index.remove(db_res.salle_id, creneau, db_res)
+            elif db_res.statut not in actif and status in actif:
+                index.add(db_res.salle_id, creneau, db_res)
             db_res.statut = status
             session.commit()
             return True
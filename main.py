@@ -31,8 +31,7 @@ def init_data():
         edt = EmploiDuTemps()
         # Charger les séances depuis la DB
         seances = SeanceRepository.get_all_domain(session)
-        for s in seances:
-            edt._seances.append(s) # Direct append to bypass conflict check on load if needed
+        edt.charger_seances(seances)  # Pas de vérification de conflit au chargement
         return edt
     finally:
         session.close()
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+def affectation_min_cout(couts):
+    """
+    Affectation de coût minimal des lignes (séances) aux colonnes (salles).
+    couts : tableau (n, m) avec n <= m ; np.inf pour une affectation interdite.
+    Retourne, pour chaque ligne, l'index de sa colonne, ou None si aucune
+    affectation complète n'existe.
+
+    Algorithme hongrois par plus courts chemins augmentants (potentiels u, v) :
+    chaque ligne est ajoutée par un chemin augmentant de coût réduit minimal.
+    Les opérations sur les colonnes sont vectorisées avec NumPy, soit n²
+    opérations de taille m.
+    """
+    couts = np.asarray(couts, dtype=float)
+    n, m = couts.shape
+    if n == 0:
+        return []
+    if n > m:
+        return None
+
+    autorise = np.isfinite(couts)
+    if not autorise.any(axis=1).all():
+        return None
+    # Un coût interdit plus cher que n'importe quelle affectation autorisée
+    interdit = (np.abs(couts[autorise]).max() + 1) * (n + 1)
+    c = np.where(autorise, couts, interdit)
+
+    # Index 0 réservé : colonne fictive d'où part chaque chemin augmentant
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    ligne_de = np.zeros(m + 1, dtype=np.int64)    # colonne -> ligne (0 = libre)
+    precedent = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        ligne_de[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        utilise = np.zeros(m + 1, dtype=bool)
+        while True:
+            utilise[j0] = True
+            i0 = ligne_de[j0]
+            libres = ~utilise[1:]
+            reduit = c[i0 - 1] - u[i0] - v[1:]
+            ameliore = libres & (reduit < minv[1:])
+            minv[1:][ameliore] = reduit[ameliore]
+            precedent[1:][ameliore] = j0
+
+            candidats = np.where(libres, minv[1:], np.inf)
+            j1 = int(candidats.argmin()) + 1
+            delta = candidats[j1 - 1]
+
+            u[ligne_de[utilise]] += delta
+            v[utilise] -= delta
+            minv[1:][libres] -= delta
+            j0 = j1
+            if ligne_de[j0] == 0:
+                break
+
+        while j0:
+            j1 = precedent[j0]
+            ligne_de[j0] = ligne_de[j1]
+            j0 = j1
+
+    colonnes = [0] * n
+    for j in range(1, m + 1):
+        if ligne_de[j]:
+            colonnes[ligne_de[j] - 1] = j - 1
+    if any(not autorise[i, colonnes[i]] for i in range(n)):
+        return None
+    return colonnes
+
+
+def masque_en_tableau(masque: int, taille: int):
+    """Tableau booléen des bits d'un masque (bit k -> case k)."""
+    octets = masque.to_bytes((taille + 7) // 8 or 1, "little")
+    return np.unpackbits(np.frombuffer(octets, dtype=np.uint8), bitorder="little")[:taille] == 1
+
+
+def couts_gaspillage(effectifs, masques, capacites):
+    """
+    Matrice (séances × salles) des places perdues : capacité - effectif
+    quand la salle est permise pour la séance, np.inf sinon.
+    effectifs : effectif du groupe de chaque séance
+    masques : pour chaque séance, masque de bits des salles permises
+    (compatibles et libres)
+    capacites : capacité de chaque salle
+    """
+    capacites = np.asarray(capacites, dtype=float)
+    if not masques:
+        return np.zeros((0, len(capacites)))
+    permises = np.stack([masque_en_tableau(masque, len(capacites)) for masque in masques])
+    pertes = capacites[None, :] - np.asarray(effectifs, dtype=float)[:, None]
+    return np.where(permises, pertes, np.inf)
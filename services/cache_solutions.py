@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+
+from services.demandes import lire_demande
+
+
+def _creneau(creneau):
+    return creneau.cle_tri
+
+
+def _salle(salle):
+    return (salle.id, salle.capacite, sorted(salle.equipements),
+            sorted(map(_creneau, salle.disponibilites)))
+
+
+def _enseignant(enseignant):
+    if enseignant is None:
+        return None
+    return (enseignant.id, sorted(m.code for m in enseignant.matieres),
+            sorted(map(_creneau, enseignant.disponibilites)))
+
+
+def _demande(demande):
+    matiere, enseignant, groupe = lire_demande(demande)
+    return (matiere.code, sorted(matiere.equipements_requis), _enseignant(enseignant),
+            groupe.id, groupe.effectif, *demande[3:])
+
+
+def empreinte(algorithme, salles, creneaux, demandes, enseignants=(), charges_max=None,
+              seances=()) -> str:
+    """
+    Empreinte SHA-256 du contenu d'un problème : demandes, salles,
+    créneaux, disponibilités, enseignants à choisir, charges et séances
+    déjà placées. Deux problèmes de même contenu ont la même empreinte,
+    même si leurs objets sont différents (ex: rechargés depuis la base).
+    """
+    contenu = (
+        algorithme,
+        [_salle(salle) for salle in salles],
+        [_creneau(creneau) for creneau in creneaux],
+        [_demande(demande) for demande in demandes],
+        [_enseignant(enseignant) for enseignant in enseignants],
+        sorted((e.id, minutes) for e, minutes in (charges_max or {}).items()),
+        [(s.matiere.code, s.enseignant.id, s.groupe.id, s.salle.id, _creneau(s.creneau))
+         for s in seances],
+    )
+    return hashlib.sha256(repr(contenu).encode()).hexdigest()
+
+
+def empreinte_partie(cle: str, partie) -> str:
+    """
+    Empreinte d'une partie (tentative, cluster...) du problème d'empreinte
+    cle, pour enregistrer séparément les résultats déjà obtenus.
+    """
+    return hashlib.sha256(repr((cle, partie)).encode()).hexdigest()
+
+
+class CacheSolutions:
+    """
+    Solutions et points de reprise enregistrés sur disque, un fichier JSON
+    par empreinte de problème (voir empreinte) :
+    - <empreinte>.json : placement complet d'un problème déjà résolu ;
+    - <empreinte>.reprise.json : placement partiel d'une génération
+      interrompue, repris au lancement suivant sur le même problème.
+    Un placement est une liste de (index demande, index créneau,
+    index salle, id enseignant).
+    """
+
+    def __init__(self, dossier: str):
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+
+    def solution(self, cle: str):
+        """Placement enregistré pour ce problème, ou None."""
+        return self._lire(f"{cle}.json")
+
+    def enregistrer_solution(self, cle: str, placements) -> None:
+        self._ecrire(f"{cle}.json", placements)
+        self.effacer_reprise(cle)
+
+    def reprise(self, cle: str):
+        """Placement partiel enregistré pour ce problème, ou None."""
+        return self._lire(f"{cle}.reprise.json")
+
+    def enregistrer_reprise(self, cle: str, placements) -> None:
+        self._ecrire(f"{cle}.reprise.json", placements)
+
+    def effacer_reprise(self, cle: str) -> None:
+        try:
+            os.remove(os.path.join(self.dossier, f"{cle}.reprise.json"))
+        except FileNotFoundError:
+            pass
+
+    def _lire(self, nom: str):
+        try:
+            with open(os.path.join(self.dossier, nom), encoding="utf-8") as fichier:
+                return [tuple(placement) for placement in json.load(fichier)]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _ecrire(self, nom: str, placements) -> None:
+        # Écriture dans un fichier temporaire puis renommage : un arrêt
+        # brutal ne laisse jamais un fichier à moitié écrit
+        chemin = os.path.join(self.dossier, nom)
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "w", encoding="utf-8") as fichier:
+            json.dump([list(placement) for placement in placements], fichier)
+        os.replace(temporaire, chemin)
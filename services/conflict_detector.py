@@ -1,20 +1,48 @@
+from operator import attrgetter
+from typing import NamedTuple
+
+import numpy as np
+
+from core.creneau import Creneau
+from core.seance import Seance
 from services.constraints import ConflictType
 
+
+# Plus grand que toute heure en minutes : sert à séparer les journées
+MINUTES_PAR_JOUR = 24 * 60 + 1
+
+
+class Conflit(NamedTuple):
+    """
+    Conflit trouvé par l'audit d'un emploi du temps.
+    type : ConflictType.SALLE, ENSEIGNANT ou GROUPE
+    ressource : la salle, l'enseignant ou le groupe disputé
+    seance, autre : les deux séances, dans l'ordre chronologique
+    chevauchement : ConflictType.CRENEAU si les créneaux ne se recouvrent
+    que partiellement, None s'ils sont identiques
+    """
+    type: ConflictType
+    ressource: object
+    seance: Seance
+    autre: Seance
+    chevauchement: ConflictType = None
+
+
 class ConflictDetector:
     """
     Responsable de la détection des conflits
     entre deux séances.
     """
 
+    RESSOURCES = (
+        (ConflictType.SALLE, attrgetter("salle")),
+        (ConflictType.ENSEIGNANT, attrgetter("enseignant")),
+        (ConflictType.GROUPE, attrgetter("groupe")),
+    )
+
     @staticmethod
     def creneaux_se_chevauchent(c1, c2) -> bool:
-        if c1.jour != c2.jour:
-            return False
-
-        return not (
-            c1.heure_fin <= c2.heure_debut
-            or c2.heure_fin <= c1.heure_debut
-        )
+        return c1.chevauche(c2)
 
     @staticmethod
     def detect(seance1, seance2):
@@ -32,4 +60,95 @@ class ConflictDetector:
             if seance1.groupe == seance2.groupe:
                 conflits.append(ConflictType.GROUPE)
 
+            if conflits and seance1.creneau != seance2.creneau:
+                conflits.append(ConflictType.CRENEAU)
+
         return conflits
+
+    @staticmethod
+    def auditer(seances, paires: bool = False):
+        """
+        Audit complet d'un emploi du temps (ex: importé ou ancien).
+
+        Au lieu de comparer toutes les paires, les occupations sont triées
+        par (ressource, jour, début) puis balayées : une séance est en
+        conflit si une occupation précédente de la même ressource, le même
+        jour, finit après son début. Le tri et le balayage sont vectorisés
+        avec NumPy (O(n log n)). Les conflits sont produits au fur et à
+        mesure, type par type.
+
+        Par défaut, chaque séance en conflit est signalée une seule fois
+        par type de ressource, face à l'occupation précédente qui finit le
+        plus tard. Avec paires, un Conflit est produit pour chaque paire de
+        séances qui se disputent une ressource ; sur un groupe de séances
+        qui se chevauchent toutes, leur nombre est quadratique.
+        """
+        seances = list(seances)
+        if not seances:
+            return
+        distincts, numeros = ConflictDetector._numeroter(map(attrgetter("creneau"), seances))
+        creneaux = np.array([creneau.cle_tri for creneau in distincts], dtype=np.int64)
+        jours, debuts, fins = creneaux[numeros].T
+        positions = np.arange(len(seances))
+        for type_conflit, ressource_de in ConflictDetector.RESSOURCES:
+            ressources, numeros = ConflictDetector._numeroter(map(ressource_de, seances))
+            # Une clé par (ressource, jour), et un décalage par clé pour que
+            # le maximum cumulé des fins ne déborde pas d'une clé à l'autre
+            cles = numeros * len(Creneau.JOURS) + jours
+            ordre = np.lexsort((fins, debuts, cles))
+            decalages = cles[ordre] * MINUTES_PAR_JOUR
+            fins_triees = decalages + fins[ordre]
+            debuts_tries = decalages + debuts[ordre]
+            fin_max = np.maximum.accumulate(fins_triees)
+            fin_precedente = np.empty_like(fins_triees)
+            fin_precedente[0] = -1
+            fin_precedente[1:] = fin_max[:-1]
+            # Position de l'occupation qui porte le maximum cumulé des fins
+            porteur = np.maximum.accumulate(np.where(fins_triees == fin_max, positions, 0))
+
+            en_conflit = np.flatnonzero(fin_precedente > debuts_tries)
+            if not len(en_conflit):
+                continue
+            if not paires:
+                autres = porteur[en_conflit - 1]
+                partiels = ((debuts_tries[autres] != debuts_tries[en_conflit])
+                            | (fins_triees[autres] != fins_triees[en_conflit]))
+                for indice, autre, partiel in zip(ordre[en_conflit].tolist(),
+                                                  ordre[autres].tolist(), partiels.tolist()):
+                    yield Conflit(type_conflit, ressources[numeros[indice]], seances[autre],
+                                  seances[indice], ConflictType.CRENEAU if partiel else None)
+                continue
+
+            ordre, debuts_tries, fins_triees = (
+                ordre.tolist(), debuts_tries.tolist(), fins_triees.tolist()
+            )
+            for p in en_conflit.tolist():
+                seance = seances[ordre[p]]
+                debut, fin = debuts_tries[p], fins_triees[p]
+                ressource = ressources[numeros[ordre[p]]]
+                # Les occupations précédentes de la même clé commencent au
+                # plus tôt au début de la journée de la clé
+                q = p - 1
+                while q >= 0 and fins_triees[q] > debut - debut % MINUTES_PAR_JOUR:
+                    if fins_triees[q] > debut:
+                        partiel = debuts_tries[q] != debut or fins_triees[q] != fin
+                        yield Conflit(type_conflit, ressource, seances[ordre[q]], seance,
+                                      ConflictType.CRENEAU if partiel else None)
+                    q -= 1
+
+    @staticmethod
+    def _numeroter(ressources):
+        """
+        Numérote les ressources (égalité métier, ex: même id de salle).
+        Retourne (ressource de chaque numéro, tableau des numéros). Les
+        objets sont d'abord dédoublonnés par identité avec NumPy, de sorte
+        que le hachage n'est calculé qu'une fois par objet distinct.
+        """
+        ressources = list(ressources)
+        identites = np.fromiter(map(id, ressources), dtype=np.int64, count=len(ressources))
+        _, premiers, inverse = np.unique(identites, return_index=True, return_inverse=True)
+        numeros = {}
+        par_objet = np.array([
+            numeros.setdefault(ressources[i], len(numeros)) for i in premiers.tolist()
+        ], dtype=np.int64)
+        return list(numeros), par_objet[inverse]
@@ -0,0 +1,382 @@
+import os
+from collections import Counter
+from concurrent.futures import as_completed
+from itertools import combinations
+
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.cache_solutions import empreinte_partie
+from services.demandes import lire_demande
+from services.faisabilite import AnalyseurFaisabilite
+from services.masques import indexer_placements, seances_placements
+from services.processus import contexte, pool_partage
+from services.scheduler import Scheduler
+from services.solveur_csp import SolveurCSP
+
+
+class RegistreReservations:
+    """
+    Partage des ressources communes entre les clusters. L'unité de partage
+    est le bloc : créneaux d'un même jour qui se chevauchent de proche en
+    proche. Chaque couple (salle, bloc) et chaque couple (enseignant
+    partagé, bloc) est réservé à un seul cluster, en proportion de ses
+    besoins ; deux clusters ne peuvent donc pas se disputer une ressource.
+    """
+
+    def __init__(self, nb_clusters: int, nb_creneaux: int):
+        # Par cluster : créneau -> masque des salles réservées (bit k = salle k)
+        self.salles_par_creneau = [[0] * nb_creneaux for _ in range(nb_clusters)]
+        # Par cluster : enseignant partagé -> masque des créneaux réservés
+        self.creneaux_enseignants = [{} for _ in range(nb_clusters)]
+        # Par cluster : enseignant partagé -> part de sa charge maximale
+        self.charges = [{} for _ in range(nb_clusters)]
+
+    def part(self, cluster: int):
+        """Réservations d'un cluster, telles qu'envoyées à son processus."""
+        return (self.salles_par_creneau[cluster], self.creneaux_enseignants[cluster],
+                self.charges[cluster])
+
+    def reserver_salle(self, k: int, blocs, besoins, credits) -> None:
+        """blocs : listes d'index de créneaux ; besoins : cluster -> poids."""
+        for bloc, cluster in zip(blocs, self._repartir(len(blocs), besoins, credits)):
+            for i in bloc:
+                self.salles_par_creneau[cluster][i] |= 1 << k
+
+    def reserver_enseignant(self, enseignant, blocs, besoins, charge_max=None,
+                            charge_prise: int = 0) -> None:
+        """
+        Chaque cluster qui a besoin de l'enseignant reçoit au moins un bloc.
+        charge_max : minutes de cours maximales de l'enseignant, dont
+        charge_prise déjà occupées par les séances existantes ; chaque
+        cluster reçoit sa part du reste.
+        """
+        for cluster in besoins:
+            self.creneaux_enseignants[cluster][enseignant] = 0
+        for bloc, cluster in zip(blocs, self._repartir(len(blocs), besoins, {}, True)):
+            self.creneaux_enseignants[cluster][enseignant] |= sum(1 << i for i in bloc)
+        if charge_max is not None:
+            total = sum(besoins.values())
+            for cluster, poids in besoins.items():
+                self.charges[cluster][enseignant] = (
+                    charge_prise + int((charge_max - charge_prise) * poids / total)
+                )
+
+    @staticmethod
+    def _repartir(nb_unites: int, besoins, credits, au_moins_un: bool = False) -> list:
+        """
+        Attribue nb_unites unités aux clusters proportionnellement à besoins
+        (cluster -> poids) : chaque cluster reçoit un crédit égal à sa part
+        et chaque unité va au cluster de plus fort crédit, qui perd 1.
+        credits est conservé d'un appel à l'autre pour que les arrondis
+        se compensent d'une ressource à l'autre.
+        Avec au_moins_un, les premières unités vont d'abord une à une aux
+        clusters, du plus gros besoin au plus petit.
+        """
+        total = sum(besoins.values())
+        for cluster, poids in besoins.items():
+            credits[cluster] = credits.get(cluster, 0) + poids / total * nb_unites
+        attribution = []
+        if au_moins_un:
+            attribution = sorted(besoins, key=lambda c: (-besoins[c], c))[:nb_unites]
+            for cluster in attribution:
+                credits[cluster] -= 1
+        while len(attribution) < nb_unites:
+            cluster = max(besoins, key=lambda c: (credits[c], -c))
+            credits[cluster] -= 1
+            attribution.append(cluster)
+        return attribution
+
+
+class _Reservations:
+    """
+    Limite un moteur (Scheduler, SolveurCSP ou AnalyseurFaisabilite) aux
+    réservations d'un cluster : salles par créneau, créneaux des
+    enseignants partagés et part de leur charge.
+    """
+
+    def __init__(self, *args, part, **kwargs):
+        salles_par_creneau, creneaux_enseignants, charges = part
+        super().__init__(*args, charges_max=charges, **kwargs)
+        self.salles_par_creneau = salles_par_creneau
+        self.creneaux_enseignants = creneaux_enseignants
+
+    def _preparer(self, emploi_du_temps, demandes=()):
+        super()._preparer(emploi_du_temps, demandes)
+        for i, salles in enumerate(self.salles_par_creneau):
+            self._salles_libres[i] &= salles
+
+    def _masque_enseignant(self, enseignant) -> int:
+        masque = self._masques_enseignants.get(enseignant)
+        if masque is None:
+            masque = super()._masque_enseignant(enseignant)
+            reserves = self.creneaux_enseignants.get(enseignant)
+            if reserves is not None:
+                masque &= reserves
+                self._masques_enseignants[enseignant] = masque
+        return masque
+
+
+class _SchedulerPart(_Reservations, Scheduler):
+    pass
+
+
+class _AnalyseurPart(_Reservations, AnalyseurFaisabilite):
+    pass
+
+
+class _SolveurPart(_Reservations, SolveurCSP):
+    def __init__(self, *args, part, **kwargs):
+        super().__init__(*args, part=part, **kwargs)
+        self.analyseur = _AnalyseurPart(self.salles, self.creneaux, self.enseignants, part=part)
+
+
+def _resoudre_cluster(indices, part):
+    """
+    Place les demandes d'un cluster (index dans la liste d'origine) sur ses
+    réservations, par le solveur CSP puis, s'il échoue, par l'algorithme
+    glouton qui place ce qu'il peut.
+    Retourne (placements, non_placees) : placements comme dans
+    services.multi_depart, non_placees les index des demandes laissées
+    à la réparation.
+    """
+    salles, creneaux, enseignants, demandes, seances, budget_secondes = contexte()
+    edt = EmploiDuTemps()
+    edt.charger_seances(seances)
+
+    placees, non_placees = list(indices), []
+    try:
+        _SolveurPart(salles, creneaux, budget_secondes=budget_secondes,
+                     enseignants=enseignants, part=part).generer(edt, [demandes[d] for d in indices])
+    except AucuneSolutionException:
+        scheduler = _SchedulerPart(salles, creneaux, enseignants=enseignants, part=part)
+        scheduler._preparer(edt)
+        placees = []
+        for d in indices:
+            if scheduler._placer_demande(edt, demandes[d]):
+                placees.append(d)
+            else:
+                non_placees.append(d)
+    nouvelles = edt.seances[len(seances):]
+    return indexer_placements(nouvelles, placees, demandes, creneaux, salles), non_placees
+
+
+class SchedulerDecompose(Scheduler):
+    """
+    Génération par décomposition pour les gros établissements.
+
+    Les demandes sont regroupées par filière et niveau de leur groupe,
+    puis les regroupements qui partagent beaucoup d'enseignants sont
+    fusionnés : on obtient des clusters faiblement couplés. Les salles et
+    les enseignants communs sont partagés entre clusters par un registre
+    de réservations (voir RegistreReservations), et chaque cluster est
+    résolu dans son propre processus par le solveur CSP, ou à défaut par
+    l'algorithme glouton.
+
+    Les séances sont ensuite fusionnées ; les demandes qui n'ont pas tenu
+    dans les réservations de leur cluster sont replacées à la fin sur
+    l'ensemble des ressources, de la même façon.
+
+    budget_secondes : budget du solveur CSP pour chaque cluster et pour
+    le replacement final.
+    seuil_couplage : deux regroupements sont fusionnés quand leurs
+    enseignants communs portent plus de cette fraction des demandes du
+    plus petit des deux.
+
+    Avec un cache (services.cache_solutions.CacheSolutions), un problème
+    déjà résolu est rechargé sans recherche, et chaque cluster résolu est
+    enregistré : une génération interrompue ne résout que les clusters
+    restants.
+    """
+
+    def __init__(self, salles, creneaux, enseignants=None, charges_max=None,
+                 processus: int = None, budget_secondes: float = 30.0,
+                 seuil_couplage: float = 0.25, cache=None):
+        super().__init__(salles, creneaux, enseignants, charges_max, cache)
+        self.processus = processus or os.cpu_count()
+        self.budget_secondes = budget_secondes
+        self.seuil_couplage = seuil_couplage
+
+    def generer(self, emploi_du_temps, demandes):
+        """
+        demandes : itérable de tuples (matiere, enseignant, groupe),
+        (matiere, groupe) ou de services.demandes.Demande.
+        Lève AucuneSolutionException si une demande reste impossible à
+        placer ; les séances déjà placées sont conservées.
+        """
+        demandes = list(demandes)
+        self._preparer(emploi_du_temps)
+        nb_existantes = len(emploi_du_temps.seances)
+        cle = None
+        if self.cache is not None:
+            cle = self._cle_cache(emploi_du_temps, demandes, self.seuil_couplage)
+            if self._recharger(emploi_du_temps, demandes, cle):
+                return
+        clusters = self._clusters(demandes)
+        registre = self._registre(demandes, clusters)
+
+        # Par cluster : (placements, non_placees), repris du cache s'il a
+        # déjà été résolu par une génération interrompue
+        resultats = [None] * len(clusters)
+        if cle is not None:
+            for c, indices in enumerate(clusters):
+                places = self.cache.reprise(empreinte_partie(cle, c))
+                if places is not None:
+                    placees = {d for d, *_ in places}
+                    resultats[c] = (places, [d for d in indices if d not in placees])
+        a_resoudre = [c for c, resultat in enumerate(resultats) if resultat is None]
+        if a_resoudre:
+            with pool_partage(min(self.processus, len(a_resoudre)), self.salles, self.creneaux,
+                              self.enseignants, demandes, emploi_du_temps.seances,
+                              self.budget_secondes) as executeur:
+                futures = {executeur.submit(_resoudre_cluster, clusters[c], registre.part(c)): c
+                           for c in a_resoudre}
+                for future in as_completed(futures):
+                    c = futures[future]
+                    resultats[c] = future.result()
+                    if cle is not None:
+                        self.cache.enregistrer_reprise(empreinte_partie(cle, c), resultats[c][0])
+
+        placements, restantes = [], []
+        for places, non_placees in resultats:
+            placements += places
+            restantes += non_placees
+
+        # Fusion : une séance en conflit avec un autre cluster est replacée
+        # avec les demandes restantes
+        seances = seances_placements(placements, demandes, self.creneaux, self.salles,
+                                     self.enseignants)
+        for (d, *_), seance in zip(placements, seances):
+            if emploi_du_temps.verifier_conflit(seance):
+                restantes.append(d)
+            else:
+                emploi_du_temps.ajouter_seance(seance)
+
+        if restantes:
+            restantes = [demandes[d] for d in sorted(restantes)]
+            try:
+                SolveurCSP(self.salles, self.creneaux, self.budget_secondes,
+                           self.enseignants, self.charges_max).generer(emploi_du_temps, restantes)
+            except AucuneSolutionException:
+                super().generer(emploi_du_temps, restantes)
+
+        if cle is not None:
+            self.cache.enregistrer_solution(cle, self._placements(
+                emploi_du_temps, nb_existantes, len(demandes), demandes))
+            for c in range(len(clusters)):
+                self.cache.effacer_reprise(empreinte_partie(cle, c))
+
+    # --------------------
+    # Décomposition
+    # --------------------
+    def _clusters(self, demandes) -> list:
+        """
+        Listes d'index de demandes, une par cluster. Les regroupements
+        (filière, niveau) sont fusionnés quand leur couplage par
+        enseignants communs dépasse seuil_couplage.
+        Les salles n'entrent pas dans le couplage : les salles banalisées
+        sont communes à presque tous les regroupements, qui seraient alors
+        tous fusionnés. Leur partage est laissé au registre de réservations.
+        """
+        cles = {}
+        regroupements = []
+        for demande in demandes:
+            groupe = lire_demande(demande)[2]
+            regroupements.append(cles.setdefault((groupe.filiere, groupe.niveau), len(cles)))
+        tailles = Counter(regroupements)
+
+        couplages = Counter()
+        for par_regroupement in self._usages_enseignants(demandes, regroupements).values():
+            for a, b in combinations(sorted(par_regroupement), 2):
+                couplages[a, b] += min(par_regroupement[a], par_regroupement[b])
+
+        parent = list(range(len(cles)))
+
+        def racine(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        for (a, b), poids in couplages.items():
+            if poids > self.seuil_couplage * min(tailles[a], tailles[b]):
+                parent[racine(a)] = racine(b)
+
+        clusters = {}
+        for d, regroupement in enumerate(regroupements):
+            clusters.setdefault(racine(regroupement), []).append(d)
+        return list(clusters.values())
+
+    def _usages_enseignants(self, demandes, cluster_de) -> dict:
+        """
+        enseignant -> {cluster: nombre de demandes}. Une demande sans
+        enseignant compte pour une fraction de chaque enseignant qualifié.
+        """
+        usages = {}
+        for demande, cluster in zip(demandes, cluster_de):
+            matiere, enseignant, _ = lire_demande(demande)
+            candidats = [enseignant] if enseignant is not None else \
+                self._enseignants_par_matiere.get(matiere, [])
+            for candidat in candidats:
+                par_cluster = usages.setdefault(candidat, {})
+                par_cluster[cluster] = par_cluster.get(cluster, 0) + 1 / len(candidats)
+        return usages
+
+    def _registre(self, demandes, clusters) -> RegistreReservations:
+        """
+        Réserve les blocs de chaque salle au prorata des demandes compatibles
+        de chaque cluster (une demande compte pour une fraction de chacune
+        de ses salles), et les blocs de chaque enseignant partagé au prorata
+        de ses demandes dans chaque cluster.
+        """
+        registre = RegistreReservations(len(clusters), len(self.creneaux))
+        cluster_de = [0] * len(demandes)
+        for c, indices in enumerate(clusters):
+            for d in indices:
+                cluster_de[d] = c
+
+        blocs = self._blocs()
+        besoins_salles = [{} for _ in self.salles]
+        par_masque = Counter()
+        for demande, cluster in zip(demandes, cluster_de):
+            matiere, _, groupe = lire_demande(demande)
+            par_masque[self._masque_salles_compatibles(matiere, groupe), cluster] += 1
+        for (masque, cluster), nombre in par_masque.items():
+            salles = list(self._bits(masque))
+            for k in salles:
+                besoins = besoins_salles[k]
+                besoins[cluster] = besoins.get(cluster, 0) + nombre / len(salles)
+        credits = {}
+        for k, besoins in enumerate(besoins_salles):
+            if besoins:
+                registre.reserver_salle(k, blocs, besoins, credits)
+
+        for enseignant, besoins in self._usages_enseignants(demandes, cluster_de).items():
+            if len(besoins) < 2:
+                continue
+            masque = self._masque_enseignant(enseignant)
+            blocs_enseignant = [bloc for bloc in blocs if any(masque >> i & 1 for i in bloc)]
+            if enseignant in self._charges_restantes:
+                charge_max = self.charges_max.get(
+                    enseignant, sum(c.duree_minutes for c in enseignant.disponibilites))
+                registre.reserver_enseignant(enseignant, blocs_enseignant, besoins, charge_max,
+                                             charge_max - self._charges_restantes[enseignant])
+            else:
+                registre.reserver_enseignant(enseignant, blocs_enseignant, besoins)
+        return registre
+
+    def _blocs(self) -> list:
+        """
+        Créneaux regroupés en blocs : même jour et chevauchement de proche
+        en proche. Deux créneaux de blocs différents ne se chevauchent pas.
+        """
+        blocs = []
+        jour = fin = None
+        for i in sorted(range(len(self.creneaux)), key=lambda i: self.creneaux[i].cle_tri):
+            creneau = self.creneaux[i]
+            if creneau.jour_index == jour and creneau.debut_minutes < fin:
+                blocs[-1].append(i)
+                fin = max(fin, creneau.fin_minutes)
+            else:
+                blocs.append([i])
+                jour, fin = creneau.jour_index, creneau.fin_minutes
+        return blocs
@@ -0,0 +1,54 @@
+from typing import NamedTuple
+
+from core.enseignant import Enseignant
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+
+
+class Demande(NamedTuple):
+    """
+    Une séance à placer.
+    Ses trois premiers champs sont ceux des tuples (matiere, enseignant, groupe)
+    acceptés par les algorithmes de génération ; enseignant peut être None
+    pour le laisser choisir parmi les enseignants qualifiés.
+    duree_minutes : durée exigée du créneau (None = quelconque)
+    un_par_jour : au plus une séance de ce cours (matière, groupe) par jour
+    """
+    matiere: Matiere
+    enseignant: Enseignant
+    groupe: GroupeEtudiant
+    duree_minutes: int = None
+    un_par_jour: bool = False
+
+
+def lire_demande(demande):
+    """
+    Retourne (matiere, enseignant, groupe) pour une demande (matiere, groupe),
+    (matiere, enseignant, groupe) ou Demande ; enseignant vaut None s'il
+    reste à choisir.
+    """
+    if len(demande) == 2:
+        matiere, groupe = demande
+        return matiere, None, groupe
+    return demande[0], demande[1], demande[2]
+
+
+def generer_demandes(affectations, duree_max_minutes: int = 120, un_par_jour: bool = True):
+    """
+    Découpe chaque affectation (matiere, enseignant, groupe) ou
+    (matiere, groupe) en demandes hebdomadaires selon matiere.volume_horaire
+    (heures par semaine) : des séances de duree_max_minutes, plus une séance
+    plus courte pour le reste éventuel. Par exemple, 3h avec des séances de 2h donnent
+    une séance de 2h et une d'1h.
+
+    Générateur paresseux : les demandes sont produites au fur et à mesure
+    que l'algorithme les consomme, et affectations peut lui-même être un
+    itérateur (ex: une requête en base parcourue ligne à ligne).
+    """
+    for affectation in affectations:
+        matiere, enseignant, groupe = lire_demande(affectation)
+        reste = matiere.volume_horaire * 60
+        while reste > 0:
+            duree = min(duree_max_minutes, reste)
+            yield Demande(matiere, enseignant, groupe, duree, un_par_jour)
+            reste -= duree
@@ -0,0 +1,168 @@
+import heapq
+from bisect import bisect_left
+
+from core.exceptions import AucuneSolutionException
+
+
+class Examen:
+    """
+    Épreuve d'une matière, passée en même temps par tous ses groupes.
+    repartition : liste de (salle, nombre d'étudiants placés dans la salle)
+    """
+
+    def __init__(self, matiere, groupes, creneau, repartition):
+        self.matiere = matiere
+        self.groupes = groupes
+        self.creneau = creneau
+        self.repartition = repartition
+
+    @property
+    def effectif(self) -> int:
+        return sum(groupe.effectif for groupe in self.groupes)
+
+    def __str__(self):
+        salles = ", ".join(f"{salle.nom} ({nombre})" for salle, nombre in self.repartition)
+        return f"{self.matiere.nom} - {self.creneau} - {salles}"
+
+
+class PlanificateurExamens:
+    """
+    Planification d'une session d'examens à partir des séances de
+    l'emploi du temps.
+
+    Chaque matière enseignée donne une épreuve commune à tous ses groupes.
+    Deux épreuves qui ont un groupe en commun ne peuvent pas avoir lieu
+    en même temps : le graphe de conflits est colorié par l'heuristique
+    DSatur (d'abord l'épreuve dont les voisins utilisent le plus de
+    couleurs différentes), chaque couleur étant un créneau d'examen.
+    Une épreuve prend le plus petit créneau sans conflit dont les salles
+    libres peuvent encore accueillir son effectif, ce qui limite le nombre
+    de créneaux utilisés.
+
+    Les salles sont mises en commun par capacité : une épreuve occupe la
+    plus petite salle suffisante, ou à défaut plusieurs salles en
+    commençant par les plus grandes.
+    """
+
+    def __init__(self, salles, creneaux):
+        """
+        creneaux : créneaux d'examen proposés ; parmi ceux qui se
+        chevauchent, seul le premier dans l'ordre chronologique est utilisé.
+        """
+        self.salles = salles
+        self.creneaux = self._creneaux_disjoints(creneaux)
+
+    def planifier(self, seances) -> list:
+        """
+        seances : séances de l'emploi du temps (ex: emploi_du_temps.seances)
+        Retourne les examens, dans l'ordre de leur créneau.
+        Lève AucuneSolutionException si une épreuve ne trouve aucun créneau.
+        """
+        matieres, groupes = self._epreuves(seances)
+        voisins = self._graphe_conflits(groupes)
+        effectifs = [sum(g.effectif for g in groupes_epreuve) for groupes_epreuve in groupes]
+
+        # Par créneau : capacités des salles libres triées, et leur total
+        libres = [
+            sorted((salle.capacite, k) for k, salle in enumerate(self.salles)
+                   if salle.est_disponible(creneau))
+            for creneau in self.creneaux
+        ]
+        places = [sum(capacite for capacite, _ in salles) for salles in libres]
+
+        n = len(matieres)
+        couleurs = [None] * n
+        interdites = [0] * n  # masque des couleurs déjà prises par les voisins
+        saturations = [0] * n
+        repartitions = [None] * n
+        tas = [(0, -len(voisins[e]), -effectifs[e], e) for e in range(n)]
+        heapq.heapify(tas)
+
+        while tas:
+            saturation, _, _, e = heapq.heappop(tas)
+            if couleurs[e] is not None or -saturation != saturations[e]:
+                continue
+            c = self._choisir_couleur(interdites[e], effectifs[e], places)
+            if c is None:
+                raise AucuneSolutionException(
+                    f"Aucun créneau d'examen possible pour {matieres[e].nom}"
+                )
+            couleurs[e] = c
+            repartitions[e] = self._repartir(effectifs[e], libres[c])
+            places[c] -= sum(self.salles[k].capacite for k, _ in repartitions[e])
+
+            bit = 1 << c
+            for v in voisins[e]:
+                if couleurs[v] is None and not interdites[v] & bit:
+                    interdites[v] |= bit
+                    saturations[v] += 1
+                    heapq.heappush(tas, (-saturations[v], -len(voisins[v]), -effectifs[v], v))
+
+        examens = [
+            Examen(matieres[e], groupes[e], self.creneaux[couleurs[e]],
+                   [(self.salles[k], nombre) for k, nombre in repartitions[e]])
+            for e in sorted(range(n), key=lambda e: (couleurs[e], matieres[e].nom))
+        ]
+        return examens
+
+    # --------------------
+    # Graphe de conflits
+    # --------------------
+    @staticmethod
+    def _epreuves(seances):
+        """Matières enseignées et, pour chacune, ses groupes (ordre de première séance)."""
+        par_matiere = {}
+        for seance in seances:
+            par_matiere.setdefault(seance.matiere, {})[seance.groupe] = None
+        return list(par_matiere), [list(groupes) for groupes in par_matiere.values()]
+
+    @staticmethod
+    def _graphe_conflits(groupes) -> list:
+        """Voisins de chaque épreuve : celles qui partagent au moins un groupe."""
+        par_groupe = {}
+        for e, groupes_epreuve in enumerate(groupes):
+            for groupe in groupes_epreuve:
+                par_groupe.setdefault(groupe, []).append(e)
+        voisins = [set() for _ in groupes]
+        for epreuves in par_groupe.values():
+            for e in epreuves:
+                voisins[e].update(epreuves)
+        for e, ensemble in enumerate(voisins):
+            ensemble.discard(e)
+        return voisins
+
+    # --------------------
+    # Créneaux et salles
+    # --------------------
+    @staticmethod
+    def _choisir_couleur(interdites, effectif, places):
+        """Plus petit créneau sans conflit qui a assez de places libres, ou None."""
+        for c, libres in enumerate(places):
+            if not interdites >> c & 1 and libres >= effectif:
+                return c
+        return None
+
+    @staticmethod
+    def _repartir(effectif, libres) -> list:
+        """
+        Retire des salles libres (liste triée de (capacite, k)) celles qui
+        accueillent l'effectif : la plus petite salle suffisante, sinon la
+        plus grande puis on recommence avec le reste.
+        Retourne une liste de (k, nombre d'étudiants).
+        """
+        repartition = []
+        reste = effectif
+        while reste > 0:
+            i = bisect_left(libres, (reste, -1))
+            capacite, k = libres.pop(i if i < len(libres) else -1)
+            repartition.append((k, min(capacite, reste)))
+            reste -= capacite
+        return repartition
+
+    @staticmethod
+    def _creneaux_disjoints(creneaux) -> list:
+        retenus = []
+        for creneau in sorted(creneaux, key=lambda c: c.cle_tri):
+            if not retenus or not retenus[-1].chevauche(creneau):
+                retenus.append(creneau)
+        return retenus
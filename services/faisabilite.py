@@ -0,0 +1,171 @@
+from services.demandes import lire_demande
+from services.masques import PlanificateurMasques
+
+
+class Surcharge:
+    """
+    Ressource sollicitée au-delà de ce qu'elle peut offrir.
+    ressource : enseignant, groupe ou liste de salles
+    """
+
+    def __init__(self, ressource, motif: str, demande: int, capacite: int, unite: str):
+        self.ressource = ressource
+        self.motif = motif
+        self.demande = demande
+        self.capacite = capacite
+        self.unite = unite
+
+    @property
+    def nom(self) -> str:
+        if isinstance(self.ressource, list):
+            noms = [salle.nom for salle in self.ressource]
+            if len(noms) > 5:
+                return f"{len(noms)} salles ({', '.join(noms[:5])}, ...)"
+            return f"salles {', '.join(noms)}"
+        return self.ressource.nom
+
+    def __str__(self):
+        return f"{self.nom} : {self.motif} ({self.demande} > {self.capacite} {self.unite})"
+
+
+class RapportFaisabilite:
+    """
+    Résultat de l'analyse : ressources surchargées et demandes qui
+    n'ont aucune place possible.
+    """
+
+    def __init__(self):
+        self.surcharges = []
+        self.demandes_impossibles = []  # (demande, motif)
+
+    @property
+    def est_faisable(self) -> bool:
+        """Faux si une condition nécessaire est violée (l'inverse ne prouve rien)."""
+        return not self.surcharges and not self.demandes_impossibles
+
+    def __str__(self):
+        if self.est_faisable:
+            return "Aucune impossibilité détectée."
+        lignes = ["Problème infaisable :"]
+        lignes += [f"- {surcharge}" for surcharge in self.surcharges]
+        lignes += [
+            f"- {lire_demande(demande)[0].nom} pour {lire_demande(demande)[2].nom} : {motif}"
+            for demande, motif in self.demandes_impossibles
+        ]
+        return "\n".join(lignes)
+
+
+class AnalyseurFaisabilite(PlanificateurMasques):
+    """
+    Vérification de conditions nécessaires avant toute recherche, en
+    un passage sur les demandes :
+    - chaque demande a au moins une salle compatible, un enseignant
+      qualifié et un créneau où son enseignant est disponible ;
+    - chaque enseignant a assez de minutes disponibles et assez de
+      créneaux disjoints pour ses demandes ;
+    - chaque groupe a assez de créneaux disjoints libres dans la semaine ;
+    - chaque famille de salles (les salles compatibles avec une demande)
+      offre assez de couples salle × créneau pour les demandes qui ne
+      peuvent aller que dans cette famille.
+    Si l'une échoue, le problème n'a pas de solution ; si toutes passent,
+    il peut en avoir une.
+    """
+
+    def analyser(self, emploi_du_temps, demandes) -> RapportFaisabilite:
+        self._preparer(emploi_du_temps)
+        rapport = RapportFaisabilite()
+        salles_utilisables = 0
+        for masque in self._salles_libres:
+            salles_utilisables |= masque
+
+        par_enseignant = {}    # enseignant -> [minutes, nombre]
+        par_groupe = {}        # groupe -> nombre
+        par_famille = {}       # masque de salles -> nombre
+        for demande in demandes:
+            matiere, enseignant, groupe = lire_demande(demande)
+            salles = self._masque_salles_compatibles(matiere, groupe) & salles_utilisables
+            if not salles:
+                rapport.demandes_impossibles.append((demande, "aucune salle compatible"))
+            else:
+                par_famille[salles] = par_famille.get(salles, 0) + 1
+
+            if enseignant is None:
+                if not self._enseignants_par_matiere.get(matiere):
+                    rapport.demandes_impossibles.append((demande, "aucun enseignant qualifié"))
+            else:
+                if not self._creneaux_libres(demande, enseignant, groupe):
+                    rapport.demandes_impossibles.append(
+                        (demande, f"aucun créneau possible pour {enseignant.nom}")
+                    )
+                charge = par_enseignant.setdefault(enseignant, [0, 0])
+                charge[0] += self._duree_demande(demande)
+                charge[1] += 1
+            par_groupe[groupe] = par_groupe.get(groupe, 0) + 1
+
+        for enseignant, (minutes, nombre) in par_enseignant.items():
+            disponibles = self._minutes_disponibles(emploi_du_temps, enseignant)
+            if minutes > disponibles:
+                rapport.surcharges.append(Surcharge(
+                    enseignant, "heures demandées supérieures aux disponibilités",
+                    minutes, disponibles, "minutes"))
+            creneaux = self._creneaux_disjoints(
+                self._masque_enseignant(enseignant), enseignant)
+            if nombre > creneaux:
+                rapport.surcharges.append(Surcharge(
+                    enseignant, "plus de séances que de créneaux disjoints disponibles",
+                    nombre, creneaux, "séances"))
+
+        for groupe, nombre in par_groupe.items():
+            creneaux = self._creneaux_disjoints(self._masque_groupe(groupe), groupe)
+            if nombre > creneaux:
+                rapport.surcharges.append(Surcharge(
+                    groupe, "plus de séances que de créneaux disjoints dans la semaine",
+                    nombre, creneaux, "séances"))
+
+        # Condition de Hall sur les familles de salles : les demandes dont
+        # les salles compatibles sont toutes dans la famille doivent y tenir
+        creneaux_semaine = self._creneaux_disjoints(self._tous)
+        for famille in par_famille:
+            nombre = sum(n for masque, n in par_famille.items() if not masque & ~famille)
+            capacite = famille.bit_count() * creneaux_semaine
+            if nombre > capacite:
+                rapport.surcharges.append(Surcharge(
+                    [self.salles[k] for k in self._bits(famille)],
+                    "plus de séances que de couples salle × créneau",
+                    nombre, capacite, "séances"))
+        return rapport
+
+    def _creneaux_libres(self, demande, enseignant, groupe) -> int:
+        """Créneaux possibles pour la demande, hors séances existantes."""
+        masque = 0
+        for i in self._bits(self._masque_demande(demande, enseignant)):
+            if not self._a_conflit(i, enseignant) and not self._a_conflit(i, groupe):
+                masque |= 1 << i
+        return masque
+
+    def _minutes_disponibles(self, emploi_du_temps, enseignant) -> int:
+        restantes = self._charges_restantes.get(enseignant)
+        if restantes is not None:
+            return restantes
+        return (
+            sum(c.duree_minutes for c in enseignant.disponibilites)
+            - sum(enseignant.minutes_disponibles(s.creneau)
+                  for s in emploi_du_temps.seances_par_enseignant(enseignant.nom))
+        )
+
+    def _creneaux_disjoints(self, masque, ressource=None) -> int:
+        """
+        Nombre maximal de créneaux deux à deux disjoints parmi le masque,
+        hors créneaux où la ressource est déjà prise (tri par heure de fin
+        puis choix glouton, optimal pour des intervalles).
+        """
+        indices = [i for i in self._bits(masque)
+                   if ressource is None or not self._a_conflit(i, ressource)]
+        indices.sort(key=lambda i: (self.creneaux[i].jour_index, self.creneaux[i].fin_minutes))
+        nombre, jour, fin = 0, None, None
+        for i in indices:
+            creneau = self.creneaux[i]
+            if creneau.jour_index != jour or creneau.debut_minutes >= fin:
+                nombre += 1
+                jour, fin = creneau.jour_index, creneau.fin_minutes
+        return nombre
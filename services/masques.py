@@ -0,0 +1,283 @@
+from core.creneau import Creneau
+from core.equipements import TableCompatibilite
+from core.seance import Seance
+from services.cache_solutions import empreinte
+from services.demandes import lire_demande
+
+
+def indexer_placements(seances, placees, demandes, creneaux, salles) -> list:
+    """
+    Traduit les séances placées par une génération en
+    (index demande, index créneau, index salle, id enseignant) dans les
+    listes d'origine.
+    placees : index des demandes placées. Une réattribution de salles
+    remplace des séances déjà placées, si bien que l'ordre des séances ne
+    suit plus celui des demandes : chaque séance est rattachée à une
+    demande de même matière, même groupe et même enseignant (ou sans
+    enseignant imposé).
+    """
+    par_cours = {}
+    for d in placees:
+        matiere, enseignant, groupe = lire_demande(demandes[d])
+        par_cours.setdefault((matiere, enseignant, groupe), []).append(d)
+    index_creneaux = {creneau: i for i, creneau in enumerate(creneaux)}
+    index_salles = {salle: k for k, salle in enumerate(salles)}
+    placements = []
+    for seance in seances:
+        cours = (par_cours.get((seance.matiere, seance.enseignant, seance.groupe))
+                 or par_cours[(seance.matiere, None, seance.groupe)])
+        placements.append((cours.pop(), index_creneaux[seance.creneau],
+                           index_salles[seance.salle], seance.enseignant.id))
+    return placements
+
+
+def seances_placements(placements, demandes, creneaux, salles, enseignants=()):
+    """
+    Inverse d'indexer_placements : séances correspondant à un placement,
+    dans l'ordre du placement. Les demandes sans enseignant reprennent
+    l'enseignant enregistré, retrouvé par son id parmi enseignants.
+    """
+    par_id = {enseignant.id: enseignant for enseignant in enseignants}
+    for d, i, k, enseignant_id in placements:
+        matiere, enseignant, groupe = lire_demande(demandes[d])
+        yield Seance(matiere, enseignant or par_id[enseignant_id], groupe,
+                     salles[k], creneaux[i])
+
+
+class PlanificateurMasques:
+    """
+    Socle commun des moteurs de génération et de l'analyse de faisabilité.
+
+    Les disponibilités sont précalculées sous forme de masques de bits sur
+    la liste des créneaux (bit i = créneau i) : par enseignant, par salle
+    et par groupe, ainsi que la compatibilité demande × salle (bit k =
+    salle k). Les séances placées sont enregistrées dans une table
+    d'occupation (ressource, jour, créneau) -> séance, si bien qu'un
+    conflit se vérifie en temps constant.
+    """
+
+    def __init__(self, salles, creneaux, enseignants=None, charges_max=None):
+        """
+        enseignants : enseignants parmi lesquels choisir pour les demandes
+        (matiere, groupe) sans enseignant, selon leurs matières.
+        charges_max : enseignant -> minutes de cours maximales par semaine
+        (par défaut, la durée totale de ses disponibilités).
+        """
+        self.salles = salles
+        self.creneaux = creneaux
+        self.enseignants = enseignants or []
+        self.charges_max = charges_max or {}
+
+    # --------------------
+    # Choix des enseignants
+    # --------------------
+    def _enseignants_qualifies(self, matiere, duree_minutes) -> list:
+        """
+        Enseignants de la matière à qui il reste au moins duree_minutes de
+        charge, du plus disponible au moins disponible.
+        """
+        return sorted(
+            (e for e in self._enseignants_par_matiere.get(matiere, ())
+             if self._charges_restantes[e] >= duree_minutes),
+            key=lambda e: -self._charges_restantes[e]
+        )
+
+    def _duree_demande(self, demande) -> int:
+        """Durée de la demande, ou à défaut celle du plus court créneau."""
+        if len(demande) > 3 and demande.duree_minutes is not None:
+            return demande.duree_minutes
+        return min((c.duree_minutes for c in self.creneaux), default=0)
+
+    # --------------------
+    # Table d'occupation
+    # --------------------
+    def _a_conflit(self, i, ressource) -> bool:
+        """Vrai si la ressource est déjà prise sur un créneau chevauchant le créneau i."""
+        return (ressource, self.creneaux[i].jour, i) in self._occupation
+
+    def _occuper(self, seance) -> None:
+        """Marque les ressources de la séance sur tous les créneaux candidats qu'elle chevauche."""
+        jour = seance.creneau.jour
+        salle, enseignant, groupe = seance.salle, seance.enseignant, seance.groupe
+        for j in self._indices_chevauchement(seance.creneau):
+            self._occupation[(salle, jour, j)] = seance
+            self._occupation[(enseignant, jour, j)] = seance
+            self._occupation[(groupe, jour, j)] = seance
+        if enseignant in self._charges_restantes:
+            self._charges_restantes[enseignant] -= self._charge_seance(enseignant, seance)
+        cours = (seance.matiere, groupe)
+        self._jours_par_cours[cours] = (
+            self._jours_par_cours.get(cours, 0) | self._masques_jours[seance.creneau.jour_index]
+        )
+
+    def _charge_seance(self, enseignant, seance) -> int:
+        """
+        Minutes de la séance à retirer de la charge restante de l'enseignant.
+        Une charge par défaut (durée des disponibilités) ne perd que la
+        partie de la séance couverte par les disponibilités ; une charge
+        maximale explicite perd toute la séance.
+        """
+        if enseignant in self.charges_max:
+            return seance.creneau.duree_minutes
+        return enseignant.minutes_disponibles(seance.creneau)
+
+    def _indices_chevauchement(self, creneau):
+        indices = self._chevauchements.get(creneau)
+        if indices is None:
+            indices = self._chevauchements[creneau] = [
+                j for j, c in enumerate(self.creneaux) if c.chevauche(creneau)
+            ]
+        return indices
+
+    # --------------------
+    # Précalcul des masques de disponibilité
+    # --------------------
+    def _preparer(self, emploi_du_temps, demandes=()):
+        """
+        Construit les masques une seule fois avant le placement ou l'analyse.
+        Les masques propres aux demandes sont sinon calculés à la demande.
+        """
+        self._tous = (1 << len(self.creneaux)) - 1
+        self._masques_enseignants = {}
+        self._masques_groupes = {}
+        self._compatibilites = TableCompatibilite(self.salles)
+        self._occupation = {}
+        self._chevauchements = {}
+        self._masques_chevauchement = {}
+        self._masques_durees = {}
+        # (matiere, groupe) -> créneaux des jours où le cours a déjà lieu
+        self._jours_par_cours = {}
+
+        self._masques_jours = [0] * len(Creneau.JOURS)
+        for i, creneau in enumerate(self.creneaux):
+            self._masques_jours[creneau.jour_index] |= 1 << i
+
+        # Index matière -> enseignants qualifiés et charge restante de chacun
+        self._enseignants_par_matiere = {}
+        self._charges_restantes = {}
+        for enseignant in self.enseignants:
+            for matiere in enseignant.matieres:
+                self._enseignants_par_matiere.setdefault(matiere, []).append(enseignant)
+            self._charges_restantes[enseignant] = self.charges_max.get(
+                enseignant, sum(c.duree_minutes for c in enseignant.disponibilites)
+            )
+
+        # Pour chaque créneau, salles non bloquées par leurs indisponibilités
+        # (bit k = salle k) ; seules les salles ayant des indisponibilités
+        # sont testées créneau par créneau
+        toujours_libres = sum(1 << k for k, salle in enumerate(self.salles)
+                              if not salle.disponibilites)
+        bloquables = [(k, salle) for k, salle in enumerate(self.salles) if salle.disponibilites]
+        self._salles_libres = [
+            toujours_libres | sum(1 << k for k, salle in bloquables if salle.est_disponible(creneau))
+            for creneau in self.creneaux
+        ]
+
+        # Créneaux déjà pris par les séances existantes de chaque groupe
+        for seance in emploi_du_temps.seances:
+            self._masques_groupes[seance.groupe] = (
+                self._masque_groupe(seance.groupe) & ~self._masque_chevauchement(seance.creneau)
+            )
+            self._occuper(seance)
+
+        for demande in demandes:
+            matiere, enseignant, groupe = lire_demande(demande)
+            if enseignant is not None:
+                self._masque_enseignant(enseignant)
+            self._masque_salles_compatibles(matiere, groupe)
+
+    def _masque_demande(self, demande, enseignant) -> int:
+        """
+        Créneaux où la demande peut être placée avec cet enseignant :
+        enseignant disponible, groupe libre, durée voulue et, si le cours
+        est réparti, pas un jour où il a déjà lieu.
+        """
+        matiere, _, groupe = lire_demande(demande)
+        masque = self._masque_enseignant(enseignant) & self._masque_groupe(groupe)
+        if len(demande) > 3:
+            if demande.duree_minutes is not None:
+                masque &= self._masque_duree(demande.duree_minutes)
+            if demande.un_par_jour:
+                masque &= ~self._jours_par_cours.get((matiere, groupe), 0)
+        return masque
+
+    def _masque_duree(self, duree_minutes) -> int:
+        masque = self._masques_durees.get(duree_minutes)
+        if masque is None:
+            masque = self._masques_durees[duree_minutes] = sum(
+                1 << i for i, creneau in enumerate(self.creneaux)
+                if creneau.duree_minutes == duree_minutes
+            )
+        return masque
+
+    def _masque_chevauchement(self, creneau) -> int:
+        """Masque des créneaux candidats qui chevauchent le créneau donné."""
+        masque = self._masques_chevauchement.get(creneau)
+        if masque is None:
+            masque = self._masques_chevauchement[creneau] = sum(
+                1 << j for j in self._indices_chevauchement(creneau)
+            )
+        return masque
+
+    def _masque_enseignant(self, enseignant) -> int:
+        masque = self._masques_enseignants.get(enseignant)
+        if masque is None:
+            masque = self._masques_enseignants[enseignant] = sum(
+                1 << i for i, creneau in enumerate(self.creneaux)
+                if enseignant.est_disponible(creneau)
+            )
+        return masque
+
+    def _masque_groupe(self, groupe) -> int:
+        return self._masques_groupes.get(groupe, self._tous)
+
+    def _masque_salles_compatibles(self, matiere, groupe) -> int:
+        """Ligne de la matrice de compatibilité demande × salle."""
+        return self._compatibilites.compatibles(matiere, groupe.effectif)
+
+    @staticmethod
+    def _bits(masque: int):
+        """Itère sur les positions des bits à 1, du plus faible au plus fort."""
+        while masque:
+            bit = masque & -masque
+            yield bit.bit_length() - 1
+            masque ^= bit
+
+
+class MoteurGeneration(PlanificateurMasques):
+    """
+    Moteur de génération qui peut s'appuyer sur un cache de solutions
+    (services.cache_solutions.CacheSolutions) : un problème déjà résolu
+    est rechargé sans recherche.
+    """
+
+    def __init__(self, salles, creneaux, enseignants=None, charges_max=None, cache=None):
+        """cache : CacheSolutions, ou None pour ne rien enregistrer."""
+        super().__init__(salles, creneaux, enseignants, charges_max)
+        self.cache = cache
+
+    def _cle_cache(self, emploi_du_temps, demandes, *parametres) -> str:
+        """parametres : réglages du moteur dont dépend le résultat."""
+        algorithme = (type(self).__name__, *parametres) if parametres else type(self).__name__
+        return empreinte(algorithme, self.salles, self.creneaux, demandes,
+                         self.enseignants, self.charges_max, emploi_du_temps.seances)
+
+    def _recharger(self, emploi_du_temps, demandes, cle) -> bool:
+        """Ajoute la solution en cache du problème ; faux s'il n'y en a pas."""
+        solution = self.cache.solution(cle)
+        if solution is None:
+            return False
+        self._rejouer(emploi_du_temps, demandes, solution)
+        return True
+
+    def _rejouer(self, emploi_du_temps, demandes, placements) -> None:
+        """Ajoute les séances d'un placement enregistré (voir indexer_placements)."""
+        for seance in seances_placements(placements, demandes, self.creneaux, self.salles,
+                                         self.enseignants):
+            emploi_du_temps.ajouter_seance(seance)
+            self._occuper(seance)
+
+    def _placements(self, emploi_du_temps, nb_existantes, nb_placees, demandes) -> list:
+        """Placement des nb_placees premières demandes, à enregistrer."""
+        return indexer_placements(emploi_du_temps.seances[nb_existantes:], range(nb_placees),
+                                  demandes, self.creneaux, self.salles)
@@ -0,0 +1,165 @@
+import os
+import random
+from concurrent.futures import as_completed
+
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.cache_solutions import empreinte, empreinte_partie
+from services.masques import indexer_placements, seances_placements
+from services.processus import contexte, pool_partage
+from services.scheduler import Scheduler
+
+
+def nombre_seances(emploi_du_temps) -> float:
+    """Score par défaut : nombre de séances placées."""
+    return len(emploi_du_temps.seances)
+
+
+def _tentative(graine):
+    """
+    Exécute l'algorithme glouton sur un ordre aléatoire des demandes,
+    des créneaux et des salles.
+    Retourne (score, complet, placements) avec placements une liste de
+    (index demande, index créneau, index salle, enseignant) dans les listes
+    d'origine.
+    """
+    salles, creneaux, enseignants, demandes, seances, score = contexte()
+    alea = random.Random(graine)
+    ordre_demandes = list(range(len(demandes)))
+    ordre_creneaux = list(range(len(creneaux)))
+    ordre_salles = list(range(len(salles)))
+    alea.shuffle(ordre_demandes)
+    alea.shuffle(ordre_creneaux)
+    alea.shuffle(ordre_salles)
+
+    edt = EmploiDuTemps()
+    edt.charger_seances(seances)
+    scheduler = Scheduler([salles[k] for k in ordre_salles],
+                          [creneaux[i] for i in ordre_creneaux], enseignants)
+    try:
+        scheduler.generer(edt, [demandes[d] for d in ordre_demandes])
+        complet = True
+    except AucuneSolutionException:
+        complet = False
+
+    nouvelles = edt.seances[len(seances):]
+    placements = indexer_placements(nouvelles, ordre_demandes[:len(nouvelles)],
+                                    demandes, creneaux, salles)
+    return score(edt), complet, placements
+
+
+class SchedulerMultiDepart:
+    """
+    Génération par départs multiples de l'algorithme glouton.
+
+    Le résultat du glouton dépend de l'ordre des demandes, des créneaux et
+    des salles : chaque tentative les mélange avec sa propre graine et les
+    tentatives sont réparties sur un pool de processus. Les données du
+    problème sont transmises une seule fois par processus ; chaque
+    tentative n'envoie que sa graine et renvoie des index.
+
+    score : fonction (emploi_du_temps) -> nombre, plus grand = meilleur.
+    Elle doit être définie au niveau d'un module pour pouvoir être envoyée
+    aux processus.
+
+    Avec un cache (services.cache_solutions.CacheSolutions), le meilleur
+    placement d'un problème déjà traité est rechargé sans recherche, et
+    chaque tentative terminée est enregistrée : une génération
+    interrompue ne relance que les tentatives qui n'avaient pas abouti.
+    """
+
+    def __init__(self, salles, creneaux, tentatives: int = 64, processus: int = None,
+                 graine: int = 0, score=nombre_seances, arret_anticipe: bool = True,
+                 enseignants=None, cache=None):
+        if not isinstance(tentatives, int) or tentatives < 1:
+            raise ValueError("Le nombre de tentatives doit être un entier strictement positif.")
+        self.salles = salles
+        self.creneaux = creneaux
+        self.enseignants = enseignants or []
+        self.tentatives = tentatives
+        self.processus = processus or os.cpu_count()
+        self.graine = graine
+        self.score = score
+        self.arret_anticipe = arret_anticipe
+        self.cache = cache
+
+    def generer(self, emploi_du_temps, demandes):
+        """
+        demandes : itérable de tuples (matiere, enseignant, groupe),
+        (matiere, groupe) ou de services.demandes.Demande
+        Ajoute à l'emploi du temps le meilleur placement trouvé. Si aucune
+        tentative n'a tout placé, le meilleur placement partiel est ajouté
+        puis AucuneSolutionException est levée, comme pour Scheduler.
+        Avec arret_anticipe, la recherche s'arrête au premier placement complet.
+        Sinon, à égalité de score, la tentative de plus petite graine
+        l'emporte : le résultat ne dépend que de graine.
+        """
+        demandes = list(demandes)
+        graines = range(self.graine, self.graine + self.tentatives)
+        meilleur = None
+        cle = None
+        if self.cache is not None:
+            cle = self._cle_cache(emploi_du_temps, demandes)
+            solution = self.cache.solution(cle)
+            if solution is not None:
+                self._ajouter(emploi_du_temps, demandes, solution)
+                return
+            restantes = []
+            for graine in graines:
+                placements = self.cache.reprise(empreinte_partie(cle, graine))
+                if placements is None:
+                    restantes.append(graine)
+                    continue
+                resultat = (*self._evaluer(emploi_du_temps, demandes, placements), -graine)
+                if meilleur is None or resultat > meilleur[:3]:
+                    meilleur = (*resultat, placements)
+            graines = restantes
+
+        if graines and not (meilleur and meilleur[0] and self.arret_anticipe):
+            with pool_partage(self.processus, self.salles, self.creneaux, self.enseignants,
+                              demandes, emploi_du_temps.seances, self.score) as executeur:
+                futures = {executeur.submit(_tentative, graine): graine for graine in graines}
+                for future in as_completed(futures):
+                    graine = futures[future]
+                    score, complet, placements = future.result()
+                    if cle is not None:
+                        self.cache.enregistrer_reprise(empreinte_partie(cle, graine), placements)
+                    if meilleur is None or (complet, score, -graine) > meilleur[:3]:
+                        meilleur = (complet, score, -graine, placements)
+                    if complet and self.arret_anticipe:
+                        for autre in futures:
+                            autre.cancel()
+                        break
+
+        placements = meilleur[3]
+        if cle is not None:
+            self.cache.enregistrer_solution(cle, placements)
+            for graine in range(self.graine, self.graine + self.tentatives):
+                self.cache.effacer_reprise(empreinte_partie(cle, graine))
+        self._ajouter(emploi_du_temps, demandes, placements)
+
+    def _ajouter(self, emploi_du_temps, demandes, placements) -> None:
+        """Ajoute les séances du placement ; lève AucuneSolutionException s'il est partiel."""
+        for seance in seances_placements(placements, demandes, self.creneaux, self.salles,
+                                         self.enseignants):
+            emploi_du_temps.ajouter_seance(seance)
+        if len(placements) < len(demandes):
+            raise AucuneSolutionException(
+                f"Aucune solution trouvée en {self.tentatives} tentatives "
+                f"({len(placements)}/{len(demandes)} demandes placées)"
+            )
+
+    def _evaluer(self, emploi_du_temps, demandes, placements):
+        """(complet, score) d'une tentative enregistrée."""
+        edt = EmploiDuTemps()
+        edt.charger_seances(emploi_du_temps.seances)
+        edt.charger_seances(seances_placements(placements, demandes, self.creneaux,
+                                               self.salles, self.enseignants))
+        return len(placements) == len(demandes), self.score(edt)
+
+    def _cle_cache(self, emploi_du_temps, demandes) -> str:
+        score = f"{self.score.__module__}.{self.score.__qualname__}"
+        return empreinte((type(self).__name__, self.graine, self.tentatives, score,
+                          self.arret_anticipe),
+                         self.salles, self.creneaux, demandes, self.enseignants, None,
+                         emploi_du_temps.seances)
@@ -0,0 +1,328 @@
+import math
+import random
+import time as chrono
+
+from core.seance import Seance
+from services.cache_solutions import empreinte
+from services.masques import PlanificateurMasques
+
+
+class OptimiseurRecuit(PlanificateurMasques):
+    """
+    Amélioration d'un emploi du temps valide par recuit simulé.
+
+    Les contraintes dures (conflits, disponibilités, compatibilité des
+    salles) restent toujours respectées et chaque séance garde sa durée ;
+    seules les contraintes souples sont optimisées :
+    - les trous dans la journée des groupes et des enseignants,
+    - la charge quotidienne au-delà de charge_max_minutes,
+    - les places perdues (capacité de la salle - effectif du groupe).
+
+    Le coût est décomposé par cellule (ressource, jour) : un mouvement ne
+    touche qu'un nombre borné de cellules, dont seul le coût est recalculé.
+    Les mouvements sont le déplacement d'une séance, l'échange des créneaux
+    de deux séances et le changement de salle.
+
+    Seules les séances dont le créneau fait partie de la liste des créneaux
+    candidats sont déplacées ; les autres restent fixes.
+
+    Avec un cache (services.cache_solutions.CacheSolutions), le résultat
+    d'un emploi du temps déjà optimisé avec les mêmes réglages est rechargé
+    sans recherche, et les meilleures positions trouvées sont enregistrées
+    régulièrement : une optimisation interrompue repart de là, avec un
+    nouveau refroidissement.
+    """
+
+    def __init__(self, salles, creneaux, graine: int = 0, budget_secondes: float = 10.0,
+                 iterations_max: int = None, poids_trous: float = 1.0,
+                 poids_charge: float = 1.0, poids_capacite: float = 0.1,
+                 charge_max_minutes: int = 6 * 60, temperature_initiale: float = 60.0,
+                 temperature_finale: float = 0.1, cache=None,
+                 intervalle_reprise: float = 5.0):
+        super().__init__(salles, creneaux)
+        self.graine = graine
+        self.budget_secondes = budget_secondes
+        self.iterations_max = iterations_max
+        self.poids_trous = poids_trous
+        self.poids_charge = poids_charge
+        self.poids_capacite = poids_capacite
+        self.charge_max_minutes = charge_max_minutes
+        self.temperature_initiale = temperature_initiale
+        self.temperature_finale = temperature_finale
+        self.cache = cache
+        self.intervalle_reprise = intervalle_reprise
+
+    def optimiser(self, emploi_du_temps) -> float:
+        """
+        Optimise l'emploi du temps sur place et retourne son coût final.
+        Le résultat ne dépend que de la graine tant que iterations_max
+        est atteint avant le budget de temps.
+        """
+        self._preparer(emploi_du_temps, ())
+        self._initialiser(emploi_du_temps.seances)
+        cle = None
+        if self.cache is not None:
+            cle = self._cle_cache(emploi_du_temps)
+            solution = self.cache.solution(cle)
+            if solution is not None:
+                self._repositionner(solution)
+                self._appliquer(emploi_du_temps, self._positions)
+                return self._cout
+            self._repositionner(self.cache.reprise(cle))
+        alea = random.Random(self.graine)
+
+        meilleur_cout = self._cout
+        meilleures_positions = list(self._positions)
+        debut = chrono.monotonic()
+        prochaine_reprise = debut + self.intervalle_reprise
+        iteration = 0
+
+        while self._mobiles:
+            maintenant = chrono.monotonic()
+            ecoule = maintenant - debut
+            if ecoule >= self.budget_secondes:
+                break
+            if cle is not None and maintenant >= prochaine_reprise:
+                self.cache.enregistrer_reprise(cle, self._placements(meilleures_positions))
+                prochaine_reprise = maintenant + self.intervalle_reprise
+            if self.iterations_max is not None:
+                if iteration >= self.iterations_max:
+                    break
+                avancement = iteration / self.iterations_max
+            else:
+                avancement = ecoule / self.budget_secondes
+            iteration += 1
+
+            temperature = self.temperature_initiale * (
+                (self.temperature_finale / self.temperature_initiale) ** avancement
+            )
+            annulation = self._mouvement_aleatoire(alea)
+            if annulation is None:
+                continue
+            delta = annulation[0]
+            if delta <= 0 or alea.random() < math.exp(-delta / temperature):
+                if self._cout < meilleur_cout - 1e-9:
+                    meilleur_cout = self._cout
+                    meilleures_positions = list(self._positions)
+            else:
+                self._annuler(annulation)
+
+        if cle is not None:
+            self.cache.enregistrer_solution(cle, self._placements(meilleures_positions))
+        self._appliquer(emploi_du_temps, meilleures_positions)
+        return meilleur_cout
+
+    # --------------------
+    # État courant
+    # --------------------
+    def _initialiser(self, seances):
+        """Construit l'occupation, les cellules de coût et le coût total."""
+        self._seances = seances
+        index_creneaux = {creneau: i for i, creneau in enumerate(self.creneaux)}
+        index_salles = {salle: k for k, salle in enumerate(self.salles)}
+
+        self._compteurs = {}
+        self._cellules = {}
+        self._positions = []
+        self._mobiles = []
+        for s, seance in enumerate(seances):
+            i = index_creneaux.get(seance.creneau)
+            k = index_salles.get(seance.salle)
+            if i is None or k is None:
+                self._positions.append(None)
+                self._marquer(seance.creneau, seance.salle, s, 1)
+            else:
+                self._positions.append((i, k))
+                self._mobiles.append(s)
+                self._marquer(self.creneaux[i], self.salles[k], s, 1)
+
+        self._cout = sum(self._cout_cellule(cle) for cle in self._cellules)
+        self._cout += sum(self._cout_salle(s) for s in range(len(seances)))
+
+    def _repositionner(self, placements) -> None:
+        """
+        Remet les séances aux positions d'un placement enregistré (voir
+        _placements) et recalcule le coût total.
+        """
+        if not placements:
+            return
+        for s, i, k, _ in placements:
+            j, l = self._positions[s]
+            self._marquer(self.creneaux[j], self.salles[l], s, -1)
+            self._marquer(self.creneaux[i], self.salles[k], s, 1)
+            self._positions[s] = (i, k)
+        self._cout = sum(self._cout_cellule(cle) for cle in self._cellules)
+        self._cout += sum(self._cout_salle(s) for s in range(len(self._seances)))
+
+    def _cle_cellules(self, s, creneau):
+        seance = self._seances[s]
+        jour = creneau.jour_index
+        return ((seance.groupe, jour), (seance.enseignant, jour))
+
+    def _marquer(self, creneau, salle, s, sens):
+        """Ajoute (sens = 1) ou retire (sens = -1) la séance s de l'état courant."""
+        seance = self._seances[s]
+        for j in self._indices_chevauchement(creneau):
+            for ressource in (salle, seance.enseignant, seance.groupe):
+                cle = (ressource, j)
+                self._compteurs[cle] = self._compteurs.get(cle, 0) + sens
+                if not self._compteurs[cle]:
+                    del self._compteurs[cle]
+        for cle in self._cle_cellules(s, creneau):
+            cellule = self._cellules.setdefault(cle, {})
+            if sens > 0:
+                cellule[s] = (creneau.debut_minutes, creneau.fin_minutes)
+            else:
+                del cellule[s]
+
+    # --------------------
+    # Coût
+    # --------------------
+    def _cout_cellule(self, cle) -> float:
+        """Trous et surcharge d'une ressource sur une journée."""
+        cellule = self._cellules.get(cle)
+        if not cellule:
+            return 0.0
+        occupe = sum(fin - debut for debut, fin in cellule.values())
+        amplitude = (max(fin for _, fin in cellule.values())
+                     - min(debut for debut, _ in cellule.values()))
+        trous = max(amplitude - occupe, 0)
+        surcharge = max(occupe - self.charge_max_minutes, 0)
+        return self.poids_trous * trous + self.poids_charge * surcharge
+
+    def _cout_salle(self, s) -> float:
+        position = self._positions[s]
+        seance = self._seances[s]
+        salle = seance.salle if position is None else self.salles[position[1]]
+        return self.poids_capacite * (salle.capacite - seance.groupe.effectif)
+
+    # --------------------
+    # Mouvements
+    # --------------------
+    def _mouvement_aleatoire(self, alea):
+        """
+        Applique un mouvement valide tiré au hasard et retourne de quoi
+        l'annuler : (delta, [(séance, ancienne position), ...]).
+        Retourne None si le mouvement tiré est invalide.
+        """
+        s = alea.choice(self._mobiles)
+        i, k = self._positions[s]
+        choix = alea.random()
+        if choix < 0.5:
+            nouvelles = {s: (alea.randrange(len(self.creneaux)), None)}
+        elif choix < 0.8:
+            autre = alea.choice(self._mobiles)
+            if autre == s:
+                return None
+            j, l = self._positions[autre]
+            nouvelles = {s: (j, k), autre: (i, l)}
+        else:
+            nouvelles = {s: (i, None)}
+        return self._deplacer(nouvelles, alea)
+
+    def _deplacer(self, nouvelles, alea):
+        """
+        Déplace les séances vers leurs nouvelles positions (salle None : salle
+        compatible libre tirée au hasard), si toutes les contraintes dures
+        sont respectées.
+        """
+        anciennes = [(s, self._positions[s]) for s in nouvelles]
+        cles = set()
+        for s, (i, _) in anciennes:
+            cles.update(self._cle_cellules(s, self.creneaux[i]))
+        for s, (i, _) in nouvelles.items():
+            cles.update(self._cle_cellules(s, self.creneaux[i]))
+        avant = sum(self._cout_cellule(cle) for cle in cles)
+        avant += sum(self._cout_salle(s) for s in nouvelles)
+
+        for s, (i, k) in anciennes:
+            self._marquer(self.creneaux[i], self.salles[k], s, -1)
+
+        placees = []
+        for s, (i, k) in nouvelles.items():
+            k = self._salle_valide(s, i, k, alea)
+            if k is None:
+                for t, (j, l) in placees:
+                    self._marquer(self.creneaux[j], self.salles[l], t, -1)
+                for t, (j, l) in anciennes:
+                    self._marquer(self.creneaux[j], self.salles[l], t, 1)
+                return None
+            self._marquer(self.creneaux[i], self.salles[k], s, 1)
+            placees.append((s, (i, k)))
+
+        for s, position in placees:
+            self._positions[s] = position
+        apres = sum(self._cout_cellule(cle) for cle in cles)
+        apres += sum(self._cout_salle(s) for s in nouvelles)
+        delta = apres - avant
+        self._cout += delta
+        return delta, anciennes
+
+    def _annuler(self, annulation):
+        delta, anciennes = annulation
+        for s, _ in anciennes:
+            i, k = self._positions[s]
+            self._marquer(self.creneaux[i], self.salles[k], s, -1)
+        for s, (i, k) in anciennes:
+            self._marquer(self.creneaux[i], self.salles[k], s, 1)
+            self._positions[s] = (i, k)
+        self._cout -= delta
+
+    def _salle_valide(self, s, i, k, alea):
+        """
+        Salle où la séance s peut être placée au créneau i : k si fourni et
+        valide, sinon une salle compatible libre tirée au hasard, ou None.
+        """
+        seance = self._seances[s]
+        if self.creneaux[i].duree_minutes != seance.creneau.duree_minutes:
+            return None
+        if not self._masque_enseignant(seance.enseignant) >> i & 1:
+            return None
+        if (seance.enseignant, i) in self._compteurs or (seance.groupe, i) in self._compteurs:
+            return None
+        candidates = (self._masque_salles_compatibles(seance.matiere, seance.groupe)
+                      & self._salles_libres[i])
+        if k is None:
+            k = alea.choice(list(self._bits(candidates)) or [None])
+            if k is None:
+                return None
+        if not candidates >> k & 1 or (self.salles[k], i) in self._compteurs:
+            return None
+        return k
+
+    # --------------------
+    # Cache et points de reprise
+    # --------------------
+    def _cle_cache(self, emploi_du_temps) -> str:
+        reglages = (type(self).__name__, self.graine, self.budget_secondes,
+                    self.iterations_max, self.poids_trous, self.poids_charge,
+                    self.poids_capacite, self.charge_max_minutes,
+                    self.temperature_initiale, self.temperature_finale)
+        return empreinte(reglages, self.salles, self.creneaux, (),
+                         seances=emploi_du_temps.seances)
+
+    def _placements(self, positions) -> list:
+        """Positions des séances mobiles : (index séance, index créneau, index salle, id enseignant)."""
+        return [(s, *positions[s], self._seances[s].enseignant.id) for s in self._mobiles]
+
+    # --------------------
+    # Application du résultat
+    # --------------------
+    def _appliquer(self, emploi_du_temps, positions):
+        """Remplace dans l'emploi du temps les séances qui ont changé de place."""
+        modifiees = []
+        for s in self._mobiles:
+            seance = self._seances[s]
+            i, k = positions[s]
+            if self.creneaux[i] != seance.creneau or self.salles[k] != seance.salle:
+                modifiees.append(s)
+
+        for s in modifiees:
+            emploi_du_temps.supprimer_seance(self._seances[s])
+        for s in modifiees:
+            seance = self._seances[s]
+            i, k = positions[s]
+            emploi_du_temps.ajouter_seance(Seance(
+                seance.matiere, seance.enseignant, seance.groupe,
+                self.salles[k], self.creneaux[i]
+            ))
@@ -0,0 +1,25 @@
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Données du problème, envoyées une seule fois à chaque processus
+_contexte = None
+
+
+def _initialiser_processus(*donnees):
+    global _contexte
+    _contexte = donnees
+
+
+def pool_partage(processus: int, *donnees) -> ProcessPoolExecutor:
+    """
+    Pool de processus qui reçoivent chacun une seule fois les données du
+    problème ; les tâches les relisent par contexte() au lieu de les
+    recevoir à chaque appel.
+    """
+    return ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus,
+                               initargs=donnees)
+
+
+def contexte() -> tuple:
+    """Données transmises au processus courant par pool_partage."""
+    return _contexte
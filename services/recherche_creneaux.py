@@ -0,0 +1,147 @@
+import heapq
+from datetime import time
+from typing import NamedTuple
+
+from core.creneau import Creneau
+from core.enseignant import Enseignant
+from core.plages_horaires import PlagesHoraires, intersection, vers_creneaux
+from services.statistiques import CalendrierOuverture
+
+
+# 23h59 en minutes
+FIN_DE_JOURNEE = 23 * 60 + 59
+
+
+class Proposition(NamedTuple):
+    """
+    Créneau proposé par la recherche.
+    salles : salles libres sur tout le créneau, la mieux adaptée en premier
+    (vide si la recherche ne portait sur aucune salle)
+    perte : minutes libres laissées inutilisables autour du créneau (trous
+    plus courts que la durée cherchée) ; 0 pour un créneau bien calé
+    """
+    creneau: Creneau
+    salles: list
+    perte: int
+
+
+class RechercheCreneaux:
+    """
+    Recherche des créneaux où plusieurs ressources sont libres en même
+    temps, ex: « 2 heures où les groupes G1 et G2, l'enseignant X et une
+    salle de TP sont libres ».
+
+    Pour chaque jour ouvert, les plages libres sont calculées par balayage
+    d'intervalles triés : les heures d'ouverture, restreintes aux
+    disponibilités des enseignants, privée des séances des groupes et des
+    enseignants, puis croisée avec les plages libres de chaque salle
+    candidate. Les créneaux de la durée voulue sont pris dans ces plages,
+    tous les `pas` minutes, et classés par perte croissante puis dans
+    l'ordre chronologique.
+    """
+
+    def __init__(self, emploi_du_temps, calendrier: CalendrierOuverture = None, pas: int = 15):
+        """
+        calendrier : heures d'ouverture (par défaut du lundi au vendredi, 8h-18h)
+        pas : écart en minutes entre deux débuts de créneaux proposés
+        """
+        self.emploi_du_temps = emploi_du_temps
+        calendrier = calendrier or CalendrierOuverture()
+        self._ouverture = calendrier.ouverture.tolist()
+        self._fermeture = calendrier.fermeture.tolist()
+        self.pas = pas
+
+    def chercher(self, duree_minutes: int, groupes=(), enseignants=(), salles=None,
+                 jours=None, limite: int = 10) -> list:
+        """
+        groupes, enseignants : ressources qui doivent toutes être libres
+        salles : salles candidates, dont une seule doit être libre (ex: les
+        salles de TP assez grandes) ; None pour ne pas chercher de salle
+        jours : jours à explorer (par défaut tous les jours ouverts)
+        Retourne au plus `limite` Proposition, les meilleures d'abord.
+        """
+        candidats = {}
+        for jour in jours or Creneau.JOURS:
+            jour = jour.lower()
+            bornes = self._bornes(jour)
+            if bornes[0] >= bornes[1]:
+                continue
+            libres = self._libres_personnes(jour, bornes, groupes, enseignants)
+            if salles is None:
+                self._decouper(candidats, jour, libres, duree_minutes, None)
+                continue
+            for salle in salles:
+                plages = intersection(libres, self._libres_salle(jour, bornes, salle))
+                self._decouper(candidats, jour, plages, duree_minutes, salle)
+
+        # Perte d'un créneau : la plus faible parmi ses salles
+        meilleurs = heapq.nsmallest(
+            limite, candidats.items(),
+            key=lambda item: (min(option[0] for option in item[1]), item[0].cle_tri)
+        )
+        propositions = []
+        for creneau, options in meilleurs:
+            options.sort(key=lambda option: option[:2])
+            salles_libres = [salle for _, _, salle in options if salle is not None]
+            propositions.append(Proposition(creneau, salles_libres, options[0][0]))
+        return propositions
+
+    # --------------------
+    # Plages libres
+    # --------------------
+    def _libres_personnes(self, jour: str, bornes, groupes, enseignants) -> list:
+        """Plages du jour où tous les groupes et enseignants sont libres."""
+        libres = [bornes]
+        for enseignant in enseignants:
+            if isinstance(enseignant, Enseignant):
+                libres = intersection(libres, self._intervalles(
+                    enseignant.creneaux_libres(jour, *self._heures(bornes))
+                ))
+        occupe = PlagesHoraires(
+            creneau
+            for ressource in (*groupes, *enseignants)
+            for creneau in self.emploi_du_temps.creneaux_occupes(ressource, jour)
+        )
+        return intersection(libres, occupe.non_couvertes(Creneau.JOURS.index(jour), *bornes))
+
+    def _libres_salle(self, jour: str, bornes, salle) -> list:
+        """Plages du jour où la salle n'est ni bloquée ni occupée par une séance."""
+        occupe = PlagesHoraires(self.emploi_du_temps.creneaux_occupes(salle, jour))
+        libres = occupe.non_couvertes(Creneau.JOURS.index(jour), *bornes)
+        return intersection(libres, self._intervalles(
+            salle.creneaux_libres(jour, *self._heures(bornes))
+        ))
+
+    def _bornes(self, jour: str):
+        """
+        Ouverture et fermeture du jour, en minutes. Une fermeture à minuit
+        (1440) est ramenée à 23h59, dernière heure qu'un créneau peut porter.
+        """
+        index = Creneau.JOURS.index(jour)
+        return (self._ouverture[index], min(self._fermeture[index], FIN_DE_JOURNEE))
+
+    @staticmethod
+    def _heures(bornes):
+        return tuple(time(*divmod(minute, 60)) for minute in bornes)
+
+    @staticmethod
+    def _intervalles(creneaux) -> list:
+        return [(c.debut_minutes, c.fin_minutes) for c in creneaux]
+
+    # --------------------
+    # Candidats
+    # --------------------
+    def _decouper(self, candidats, jour, plages, duree, salle) -> None:
+        """
+        Ajoute les créneaux de la durée voulue contenus dans les plages.
+        candidats : créneau -> liste de (perte, capacité, salle)
+        """
+        capacite = salle.capacite if salle is not None else 0
+        for debut_plage, fin_plage in plages:
+            debut = -(-debut_plage // self.pas) * self.pas  # arrondi au pas supérieur
+            while debut + duree <= fin_plage:
+                avant, apres = debut - debut_plage, fin_plage - debut - duree
+                perte = (avant if avant < duree else 0) + (apres if apres < duree else 0)
+                creneau, = vers_creneaux(jour, [(debut, debut + duree)])
+                candidats.setdefault(creneau, []).append((perte, capacite, salle))
+                debut += self.pas
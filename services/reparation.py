@@ -0,0 +1,94 @@
+from core.enseignant import Enseignant
+from core.exceptions import AucuneSolutionException
+from core.salle import Salle
+from services.demandes import Demande
+from services.solveur_csp import SolveurCSP
+
+
+class ReparateurEmploiDuTemps:
+    """
+    Réparation locale de l'emploi du temps après un changement de
+    disponibilité d'un enseignant ou d'une salle.
+
+    Seules les séances devenues invalides sont retirées, avec un petit
+    voisinage de séances qui partagent leur groupe ou leur enseignant,
+    puis replacées par le solveur CSP ; le reste de l'emploi du temps
+    ne bouge pas. Si le replacement échoue, le voisinage est élargi
+    (recherche à voisinage large).
+    """
+
+    def __init__(self, salles, creneaux, taille_voisinage: int = 8, essais: int = 4,
+                 budget_secondes: float = 1.0):
+        self.salles = salles
+        self.creneaux = creneaux
+        self.taille_voisinage = taille_voisinage
+        self.essais = essais
+        self.budget_secondes = budget_secondes
+
+    def seances_invalides(self, emploi_du_temps, ressource) -> list:
+        """Séances de la ressource placées sur un créneau où elle n'est plus disponible."""
+        if isinstance(ressource, Enseignant):
+            seances = emploi_du_temps.seances_par_enseignant(ressource.nom)
+        elif isinstance(ressource, Salle):
+            seances = emploi_du_temps.seances_par_salle(ressource.nom)
+        else:
+            raise TypeError("ressource doit être un Enseignant ou une Salle")
+        return [s for s in seances if not ressource.est_disponible(s.creneau)]
+
+    def reparer(self, emploi_du_temps, ressource) -> list:
+        """
+        Replace les séances invalidées par la ressource et retourne les
+        séances ajoutées (vide si rien n'était invalide).
+        Lève AucuneSolutionException si aucun voisinage ne suffit ;
+        l'emploi du temps est alors laissé inchangé.
+        """
+        invalides = self.seances_invalides(emploi_du_temps, ressource)
+        if not invalides:
+            return []
+        voisins = self._voisinage(emploi_du_temps, invalides)
+
+        for essai in range(self.essais):
+            taille = self.taille_voisinage * (2 ** essai - 1)
+            retirees = invalides + voisins[:taille]
+            for seance in retirees:
+                emploi_du_temps.supprimer_seance(seance)
+
+            # Une séance replacée garde sa durée
+            demandes = [Demande(s.matiere, s.enseignant, s.groupe, s.creneau.duree_minutes)
+                        for s in retirees]
+            solveur = SolveurCSP(self.salles, self.creneaux, self.budget_secondes)
+            try:
+                solveur.generer(emploi_du_temps, demandes)
+            except AucuneSolutionException:
+                emploi_du_temps.charger_seances(retirees)
+                if taille >= len(voisins):
+                    break
+                continue
+            return emploi_du_temps.seances[-len(retirees):]
+
+        raise AucuneSolutionException(
+            f"Impossible de replacer les {len(invalides)} séances de {ressource.nom}"
+        )
+
+    @staticmethod
+    def _voisinage(emploi_du_temps, invalides) -> list:
+        """
+        Séances qui partagent un groupe ou un enseignant avec les séances
+        invalides, les plus proches dans le temps d'abord.
+        """
+        exclues = set(map(id, invalides))
+        candidates = {}
+        for seance in invalides:
+            for voisine in (emploi_du_temps.seances_par_groupe(seance.groupe.nom)
+                            + emploi_du_temps.seances_par_enseignant(seance.enseignant.nom)):
+                if id(voisine) not in exclues:
+                    candidates[id(voisine)] = voisine
+
+        def distance(voisine):
+            return min(
+                (voisine.creneau.jour_index != s.creneau.jour_index,
+                 abs(voisine.creneau.debut_minutes - s.creneau.debut_minutes))
+                for s in invalides
+            )
+
+        return sorted(candidates.values(), key=lambda v: (distance(v), v.creneau.cle_tri))
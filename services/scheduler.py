@@ -1,61 +1,210 @@
-from services.conflict_detector import ConflictDetector
+import time as chrono
+from itertools import islice
+
+from core.exceptions import AucuneSolutionException
 from core.seance import Seance
+from services.affectation_salles import affectation_min_cout, couts_gaspillage
+from services.demandes import lire_demande
+from services.masques import MoteurGeneration
 
 
-class Scheduler:
+class Scheduler(MoteurGeneration):
     """
     Génération automatique de l'emploi du temps
     avec un algorithme glouton.
+
+    Les disponibilités et les conflits se lisent sur les masques de bits
+    et la table d'occupation de services.masques.PlanificateurMasques :
+    le choix d'un créneau et d'une salle se réduit à des ET binaires.
+
+    Les demandes sont consommées une à une : un générateur (voir
+    services.demandes.generer_demandes) n'est jamais matérialisé.
+
+    Chaque séance prend la plus petite salle compatible libre. Quand aucune
+    ne l'est, les salles des séances déjà placées sur le même créneau sont
+    réattribuées en un seul lot par affectation de coût minimal (places
+    perdues), ce qui libère souvent une salle adaptée.
+
+    Avec un cache (services.cache_solutions.CacheSolutions), un problème
+    déjà résolu est rechargé sans recherche, et le placement partiel est
+    enregistré régulièrement pour qu'une génération interrompue reprenne
+    où elle s'était arrêtée.
     """
 
-    def __init__(self, salles, creneaux):
-        self.salles = salles
-        self.creneaux = creneaux
+    def __init__(self, salles, creneaux, enseignants=None, charges_max=None, cache=None,
+                 intervalle_reprise: float = 5.0):
+        """
+        enseignants : enseignants parmi lesquels choisir pour les demandes
+        (matiere, groupe) sans enseignant, selon leurs matières.
+        charges_max : enseignant -> minutes de cours maximales par semaine
+        (par défaut, la durée totale de ses disponibilités).
+        cache : CacheSolutions, ou None pour ne rien enregistrer.
+        intervalle_reprise : secondes entre deux points de reprise.
+        """
+        super().__init__(salles, creneaux, enseignants, charges_max, cache)
+        self.intervalle_reprise = intervalle_reprise
 
     def generer(self, emploi_du_temps, demandes):
         """
-        demandes : liste de tuples (matiere, enseignant, groupe)
+        demandes : itérable de tuples (matiere, enseignant, groupe),
+        (matiere, groupe) ou de services.demandes.Demande.
+        Sans enseignant, le plus disponible des enseignants qualifiés est choisi.
+        Avec un cache, les demandes sont chargées en entier pour calculer
+        l'empreinte du problème.
         """
-        for matiere, enseignant, groupe in demandes:
-            seance_placee = False
-
-            for creneau in self.creneaux:
-                for salle in self.salles:
-                    # Vérifier compatibilité salle / matière
-                    if not salle.est_compatible(groupe.effectif, matiere.equipements_requis):
-                        continue
-
-                    # Vérifier disponibilité enseignant
-                    if creneau not in enseignant.disponibilites:
-                        continue
-
-                    nouvelle_seance = Seance(
-                        matiere,
-                        enseignant,
-                        groupe,
-                        salle,
-                        creneau
-                    )
-
-                    if not self._a_conflit(nouvelle_seance, emploi_du_temps.seances):
-                        emploi_du_temps.ajouter_seance(nouvelle_seance)
-                        seance_placee = True
-                        break
-
-                if seance_placee:
-                    break
-
-            if not seance_placee:
-                raise Exception(
-                    f"Aucune solution trouvée pour {matiere.nom}"
+        self._preparer(emploi_du_temps)
+        nb_existantes = len(emploi_du_temps.seances)
+        cle, depart = None, 0
+        if self.cache is not None:
+            demandes = list(demandes)
+            cle = self._cle_cache(emploi_du_temps, demandes)
+            if self._recharger(emploi_du_temps, demandes, cle):
+                return
+            reprise = self.cache.reprise(cle) or []
+            self._rejouer(emploi_du_temps, demandes, reprise)
+            depart = len(reprise)
+
+        prochaine_reprise = chrono.monotonic() + self.intervalle_reprise
+        for d, demande in enumerate(islice(demandes, depart, None), depart):
+            if not self._placer_demande(emploi_du_temps, demande):
+                if cle is not None:
+                    self.cache.enregistrer_reprise(
+                        cle, self._placements(emploi_du_temps, nb_existantes, d, demandes))
+                raise AucuneSolutionException(
+                    f"Aucune solution trouvée pour {lire_demande(demande)[0].nom}"
                 )
+            if cle is not None and chrono.monotonic() >= prochaine_reprise:
+                self.cache.enregistrer_reprise(
+                    cle, self._placements(emploi_du_temps, nb_existantes, d + 1, demandes))
+                prochaine_reprise = chrono.monotonic() + self.intervalle_reprise
+
+        if cle is not None:
+            self.cache.enregistrer_solution(
+                cle, self._placements(emploi_du_temps, nb_existantes, len(demandes), demandes))
 
-    def _a_conflit(self, nouvelle_seance, seances_existantes):
-        for seance in seances_existantes:
-            conflits = ConflictDetector.detect(
-                nouvelle_seance, seance
-            )
-            if conflits:
+    def _placer_demande(self, emploi_du_temps, demande) -> bool:
+        """Place la demande avec le premier enseignant possible ; faux si aucun ne convient."""
+        matiere, enseignant, groupe = lire_demande(demande)
+        if enseignant is not None:
+            candidats = [enseignant]
+        else:
+            candidats = self._enseignants_qualifies(matiere, self._duree_demande(demande))
+
+        for candidat in candidats:
+            nouvelle_seance = self._placer(emploi_du_temps, demande, matiere, candidat, groupe)
+            if nouvelle_seance is not None:
+                emploi_du_temps.ajouter_seance(nouvelle_seance)
+                self._occuper(nouvelle_seance)
+                self._lots.setdefault(nouvelle_seance.creneau, []).append(nouvelle_seance)
                 return True
         return False
 
+    def _placer(self, emploi_du_temps, demande, matiere, enseignant, groupe):
+        """Première séance possible pour la demande avec cet enseignant, ou None."""
+        salles_compatibles = self._masque_salles_compatibles(matiere, groupe)
+        creneaux_possibles = self._masque_demande(demande, enseignant)
+
+        complets = []
+        for i in self._bits(creneaux_possibles):
+            if self._a_conflit(i, enseignant) or self._a_conflit(i, groupe):
+                continue
+            libres = [
+                k for k in self._bits(salles_compatibles & self._salles_libres[i])
+                if not self._a_conflit(i, self.salles[k])
+            ]
+            if libres:
+                salle = self.salles[min(libres, key=self._capacites.__getitem__)]
+                return Seance(matiere, enseignant, groupe, salle, self.creneaux[i])
+            complets.append(i)
+
+        # Aucune salle libre : réattribution par lot sur les créneaux pleins
+        for i in complets:
+            salle = self._reaffecter_salles(emploi_du_temps, i, matiere, groupe)
+            if salle is not None:
+                return Seance(matiere, enseignant, groupe, salle, self.creneaux[i])
+        return None
+
+    # --------------------
+    # Cache et points de reprise
+    # --------------------
+    def _rejouer(self, emploi_du_temps, demandes, placements) -> None:
+        """Les séances rejouées rejoignent les lots dont les salles peuvent être réattribuées."""
+        nb_existantes = len(emploi_du_temps.seances)
+        super()._rejouer(emploi_du_temps, demandes, placements)
+        for seance in emploi_du_temps.seances[nb_existantes:]:
+            self._lots.setdefault(seance.creneau, []).append(seance)
+
+    # --------------------
+    # Affectation des salles par lot
+    # --------------------
+    def _reaffecter_salles(self, emploi_du_temps, i, matiere, groupe):
+        """
+        Réattribue les salles des séances placées sur le créneau i de façon à
+        loger en plus une séance (matiere, groupe), en minimisant les places
+        perdues. Retourne la salle de la nouvelle séance, ou None si le lot
+        ne peut pas être logé.
+        """
+        creneau = self.creneaux[i]
+        lot = self._lots.get(creneau)
+        if not lot:
+            return None
+
+        # Salles utilisables par le lot : libres, ou occupées par le lot lui-même
+        # (une séance d'un autre créneau chevauchant i ne peut pas partager
+        # la salle d'une séance du lot)
+        ids_lot = set(map(id, lot))
+        permises = 0
+        for k in self._bits(self._salles_libres[i]):
+            occupant = self._occupation.get((self.salles[k], creneau.jour, i))
+            if occupant is None or id(occupant) in ids_lot:
+                permises |= 1 << k
+
+        seances = [(s.matiere, s.groupe) for s in lot] + [(matiere, groupe)]
+        couts = couts_gaspillage(
+            [g.effectif for _, g in seances],
+            [self._masque_salles_compatibles(m, g) & permises for m, g in seances],
+            self._capacites,
+        )
+        colonnes = affectation_min_cout(couts)
+        if colonnes is None:
+            return None
+
+        changements = [(s, self.salles[k]) for s, k in zip(lot, colonnes) if s.salle != self.salles[k]]
+        for seance, _ in changements:
+            emploi_du_temps.supprimer_seance(seance)
+        nouvelles = []
+        for seance, salle in changements:
+            nouvelle = Seance(seance.matiere, seance.enseignant, seance.groupe, salle, creneau)
+            emploi_du_temps.ajouter_seance(nouvelle)
+            nouvelles.append(nouvelle)
+        for (seance, _), nouvelle in zip(changements, nouvelles):
+            self._changer_salle(emploi_du_temps, seance, nouvelle)
+            lot[lot.index(seance)] = nouvelle
+        return self.salles[colonnes[-1]]
+
+    def _changer_salle(self, emploi_du_temps, ancienne, nouvelle) -> None:
+        """Met à jour la table d'occupation quand une séance change de salle."""
+        jour = ancienne.creneau.jour
+        indices = self._indices_chevauchement(ancienne.creneau)
+        for j in indices:
+            if self._occupation.get((ancienne.salle, jour, j)) is ancienne:
+                del self._occupation[(ancienne.salle, jour, j)]
+        # Une autre séance de l'ancienne salle peut encore chevaucher ces créneaux
+        for autre in emploi_du_temps.seances_par_salle(ancienne.salle.nom):
+            if autre.salle == ancienne.salle:
+                for j in indices:
+                    if autre.creneau.chevauche(self.creneaux[j]):
+                        self._occupation[(ancienne.salle, jour, j)] = autre
+        for j in indices:
+            for ressource in (nouvelle.salle, nouvelle.enseignant, nouvelle.groupe):
+                self._occupation[(ressource, jour, j)] = nouvelle
+
+    # --------------------
+    # Précalcul
+    # --------------------
+    def _preparer(self, emploi_du_temps, demandes=()):
+        super()._preparer(emploi_du_temps, demandes)
+        # créneau -> séances placées par cette génération, dont les salles
+        # peuvent être réattribuées
+        self._lots = {}
+        self._capacites = [salle.capacite for salle in self.salles]
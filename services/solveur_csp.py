@@ -0,0 +1,302 @@
+import time as chrono
+
+from core.exceptions import AucuneSolutionException, ProblemeInfaisableException
+from core.seance import Seance
+from services.demandes import lire_demande
+from services.faisabilite import AnalyseurFaisabilite
+from services.masques import MoteurGeneration
+
+
+class SolveurCSP(MoteurGeneration):
+    """
+    Génération de l'emploi du temps par satisfaction de contraintes.
+
+    Chaque demande (matiere, enseignant, groupe) est une variable dont la
+    valeur est un couple (créneau, salle). La recherche choisit d'abord la
+    variable la plus contrainte (moins de créneaux possibles), retire après
+    chaque affectation les créneaux devenus impossibles aux demandes qui
+    partagent l'enseignant ou le groupe (forward checking) et, en cas
+    d'échec, remonte directement à la variable responsable
+    (conflict-directed backjumping).
+
+    Contrairement à l'algorithme glouton, une demande impossible à placer
+    peut ainsi remettre en cause des placements antérieurs.
+
+    Les demandes sans enseignant reçoivent avant la recherche l'enseignant
+    qualifié qui a le plus de charge restante.
+
+    Avec verifier_faisabilite, l'analyseur de conditions nécessaires
+    (services.faisabilite, attribut analyseur) écarte d'abord les
+    problèmes sans solution.
+
+    Avec un cache (services.cache_solutions.CacheSolutions), un problème
+    déjà résolu est rechargé sans recherche.
+    """
+
+    def __init__(self, salles, creneaux, budget_secondes: float = 30.0,
+                 enseignants=None, charges_max=None, verifier_faisabilite: bool = True,
+                 cache=None):
+        super().__init__(salles, creneaux, enseignants, charges_max, cache)
+        self.budget_secondes = budget_secondes
+        self.verifier_faisabilite = verifier_faisabilite
+        self.analyseur = AnalyseurFaisabilite(salles, creneaux, enseignants, charges_max)
+
+    def generer(self, emploi_du_temps, demandes):
+        """
+        demandes : itérable de tuples (matiere, enseignant, groupe),
+        (matiere, groupe) ou de services.demandes.Demande, entièrement
+        chargé avant la recherche
+        Lève AucuneSolutionException si le problème n'a pas de solution
+        ou si le budget de temps est épuisé, ProblemeInfaisableException
+        si l'analyse préalable le prouve sans recherche.
+        """
+        demandes = list(demandes)
+        self._preparer(emploi_du_temps)
+        nb_existantes = len(emploi_du_temps.seances)
+        cle = None
+        if self.cache is not None:
+            cle = self._cle_cache(emploi_du_temps, demandes)
+            if self._recharger(emploi_du_temps, demandes, cle):
+                return
+        if self.verifier_faisabilite:
+            rapport = self.analyseur.analyser(emploi_du_temps, demandes)
+            if not rapport.est_faisable:
+                raise ProblemeInfaisableException(rapport)
+        demandes = [self._attribuer_enseignant(demande) for demande in demandes]
+        self._demandes = demandes
+        self._initialiser_domaines(emploi_du_temps)
+
+        affectation = self._resoudre()
+
+        for d, demande in enumerate(demandes):
+            matiere, enseignant, groupe = demande[:3]
+            i, k = affectation[d]
+            seance = Seance(matiere, enseignant, groupe, self.salles[k], self.creneaux[i])
+            emploi_du_temps.ajouter_seance(seance)
+            self._occuper(seance)
+        if cle is not None:
+            self.cache.enregistrer_solution(
+                cle, self._placements(emploi_du_temps, nb_existantes, len(demandes), demandes))
+
+    # --------------------
+    # Modélisation
+    # --------------------
+    def _attribuer_enseignant(self, demande):
+        """Complète une demande sans enseignant, en réservant sa charge."""
+        matiere, enseignant, groupe = lire_demande(demande)
+        if enseignant is not None:
+            return demande
+        duree = self._duree_demande(demande)
+        qualifies = self._enseignants_qualifies(matiere, duree)
+        if not qualifies:
+            raise AucuneSolutionException(f"Aucun enseignant qualifié pour {matiere.nom}")
+        enseignant = qualifies[0]
+        self._charges_restantes[enseignant] -= duree
+        if len(demande) > 3:
+            return demande._replace(enseignant=enseignant)
+        return (matiere, enseignant, groupe)
+
+    def _initialiser_domaines(self, emploi_du_temps):
+        """
+        Domaine d'une demande : masque des créneaux possibles (bit i = créneau i).
+        Les salles sont choisies au moment de l'affectation, parmi les salles
+        compatibles encore libres sur le créneau.
+        Les voisins d'une demande sont celles qui partagent son enseignant ou son groupe ;
+        les demandes d'un même cours réparti (un_par_jour) s'excluent en plus par jour.
+        """
+        # Salles libres par créneau candidat, compte tenu des séances existantes
+        index_salles = {salle: k for k, salle in enumerate(self.salles)}
+        self._salles_fixes = list(self._salles_libres)
+        for seance in emploi_du_temps.seances:
+            k = index_salles.get(seance.salle)
+            if k is not None:
+                for j in self._indices_chevauchement(seance.creneau):
+                    self._salles_fixes[j] &= ~(1 << k)
+
+        # Salles prises par les affectations en cours : créneau -> masque,
+        # et (créneau, salle) -> demandes qui l'occupent
+        self._salles_prises = [0] * len(self.creneaux)
+        self._occupants = {}
+        self._ordre_salles = sorted(range(len(self.salles)),
+                                    key=lambda k: self.salles[k].capacite)
+
+        self._domaines = []
+        self._salles_demandes = []
+        for demande in self._demandes:
+            matiere, enseignant, groupe = demande[:3]
+            salles_compatibles = self._masque_salles_compatibles(matiere, groupe)
+            creneaux_possibles = self._masque_demande(demande, enseignant)
+            domaine = 0
+            for i in self._bits(creneaux_possibles):
+                if self._a_conflit(i, enseignant) or self._a_conflit(i, groupe):
+                    continue
+                if salles_compatibles & self._salles_fixes[i]:
+                    domaine |= 1 << i
+            self._domaines.append(domaine)
+            self._salles_demandes.append(salles_compatibles)
+
+        par_ressource = {}
+        par_cours = {}
+        for d, demande in enumerate(self._demandes):
+            matiere, enseignant, groupe = demande[:3]
+            par_ressource.setdefault(enseignant, []).append(d)
+            par_ressource.setdefault(groupe, []).append(d)
+            if len(demande) > 3 and demande.un_par_jour:
+                par_cours.setdefault((matiere, groupe), []).append(d)
+        self._voisins = self._relier(par_ressource.values())
+        self._voisins_jour = self._relier(par_cours.values())
+
+    def _relier(self, familles):
+        """Voisins de chaque demande : les autres membres de ses familles."""
+        voisins = [set() for _ in self._demandes]
+        for membres in familles:
+            for d in membres:
+                voisins[d].update(membres)
+        for d, ensemble in enumerate(voisins):
+            ensemble.discard(d)
+        return voisins
+
+    def _choisir_variable(self, non_affectees):
+        """Variable au plus petit domaine ; à égalité, celle qui a le plus de voisins."""
+        return min(non_affectees,
+                   key=lambda d: (self._domaines[d].bit_count(), -len(self._voisins[d]), d))
+
+    def _salles_candidates(self, d, i) -> int:
+        return self._salles_demandes[d] & self._salles_fixes[i] & ~self._salles_prises[i]
+
+    def _valeurs(self, d):
+        """
+        Valeurs à essayer pour d, la prochaine en fin de liste : créneaux
+        dans l'ordre, et pour chacun la plus petite salle suffisante d'abord.
+        """
+        valeurs = []
+        for i in self._bits(self._domaines[d]):
+            candidates = self._salles_candidates(d, i)
+            valeurs.extend((i, k) for k in self._ordre_salles if candidates >> k & 1)
+        valeurs.reverse()
+        return valeurs
+
+    # --------------------
+    # Forward checking
+    # --------------------
+    def _affecter(self, d, valeur, non_affectees, trace, elagueurs):
+        """
+        Réserve la salle et retire les créneaux chevauchants des domaines des
+        voisins non affectés (tout le jour pour les demandes du même cours
+        réparti). Retourne le voisin dont le domaine s'est vidé, ou None.
+        """
+        i, k = valeur
+        creneau = self.creneaux[i]
+        for j in self._indices_chevauchement(creneau):
+            self._salles_prises[j] |= 1 << k
+            self._occupants.setdefault((j, k), []).append(d)
+
+        for voisins, masque in (
+            (self._voisins[d], self._masque_chevauchement(creneau)),
+            (self._voisins_jour[d], self._masques_jours[creneau.jour_index]),
+        ):
+            for e in voisins:
+                if e not in non_affectees or not self._domaines[e] & masque:
+                    continue
+                trace.append((e, self._domaines[e]))
+                self._domaines[e] &= ~masque
+                elagueurs[e].append(d)
+                if not self._domaines[e]:
+                    return e
+        return None
+
+    def _liberer(self, d, valeur, trace, elagueurs):
+        """Annule les effets de l'affectation de d."""
+        i, k = valeur
+        for e, domaine in reversed(trace):
+            self._domaines[e] = domaine
+            elagueurs[e].pop()
+        for j in self._indices_chevauchement(self.creneaux[i]):
+            occupants = self._occupants[(j, k)]
+            occupants.pop()
+            if not occupants:
+                del self._occupants[(j, k)]
+                self._salles_prises[j] &= ~(1 << k)
+
+    def _bloqueurs_salles(self, d) -> set:
+        """Demandes affectées qui occupent les salles dont d aurait eu besoin."""
+        bloqueurs = set()
+        for i in self._bits(self._domaines[d]):
+            prises = self._salles_demandes[d] & self._salles_fixes[i] & self._salles_prises[i]
+            for k in self._bits(prises):
+                bloqueurs.update(self._occupants[(i, k)])
+        return bloqueurs
+
+    # --------------------
+    # Recherche (FC-CBJ)
+    # --------------------
+    def _resoudre(self):
+        limite = chrono.monotonic() + self.budget_secondes
+        n = len(self._demandes)
+        non_affectees = set(range(n))
+        affectation = {}
+        pile = []
+        profondeur = {}
+        traces = {}
+        elagueurs = [[] for _ in range(n)]
+        conflits = [set() for _ in range(n)]
+        valeurs = [None] * n
+
+        if not n:
+            return affectation
+
+        courante = self._choisir_variable(non_affectees)
+        valeurs[courante] = self._valeurs(courante)
+        iterations = 0
+
+        while True:
+            iterations += 1
+            if iterations % 256 == 0 and chrono.monotonic() > limite:
+                raise AucuneSolutionException(
+                    f"Budget de temps dépassé ({self.budget_secondes} s) "
+                    f"avec {len(affectation)}/{n} demandes placées"
+                )
+
+            if not valeurs[courante]:
+                # Domaine épuisé : saut arrière vers la variable la plus récente
+                # responsable de l'échec
+                responsables = (conflits[courante] | set(elagueurs[courante])
+                                | self._bloqueurs_salles(courante))
+                if not responsables:
+                    matiere = self._demandes[courante][0]
+                    raise AucuneSolutionException(f"Aucune solution trouvée pour {matiere.nom}")
+                cible = max(responsables, key=profondeur.__getitem__)
+                while pile[-1] != cible:
+                    d = pile.pop()
+                    self._liberer(d, affectation.pop(d), traces.pop(d), elagueurs)
+                    non_affectees.add(d)
+                    conflits[d] = set()
+                    valeurs[d] = None
+                conflits[courante] = set()
+                valeurs[courante] = None
+                conflits[cible] |= responsables - {cible}
+                pile.pop()
+                self._liberer(cible, affectation.pop(cible), traces.pop(cible), elagueurs)
+                non_affectees.add(cible)
+                courante = cible
+                continue
+
+            valeur = valeurs[courante].pop()
+            non_affectees.discard(courante)
+            trace = []
+            vide = self._affecter(courante, valeur, non_affectees, trace, elagueurs)
+            if vide is not None:
+                conflits[courante] |= set(elagueurs[vide]) - {courante}
+                self._liberer(courante, valeur, trace, elagueurs)
+                non_affectees.add(courante)
+                continue
+
+            affectation[courante] = valeur
+            traces[courante] = trace
+            profondeur[courante] = len(pile)
+            pile.append(courante)
+            if not non_affectees:
+                return affectation
+
+            courante = self._choisir_variable(non_affectees)
+            valeurs[courante] = self._valeurs(courante)
@@ -0,0 +1,123 @@
+import numpy as np
+
+from core.creneau import Creneau
+
+
+class CalendrierOuverture:
+    """
+    Heures d'ouverture de l'établissement, jour par jour.
+    horaires : dictionnaire jour -> (heure_debut, heure_fin), en datetime.time
+    ou en minutes depuis minuit.
+    Par défaut : du lundi au vendredi, de 8h à 18h.
+    """
+
+    def __init__(self, horaires=None):
+        self._ouverture = np.zeros(len(Creneau.JOURS), dtype=np.int32)
+        self._fermeture = np.zeros(len(Creneau.JOURS), dtype=np.int32)
+
+        if horaires is None:
+            horaires = {jour: (8 * 60, 18 * 60) for jour in Creneau.JOURS[:5]}
+        for jour, (debut, fin) in horaires.items():
+            index = Creneau.JOURS.index(jour.lower())
+            self._ouverture[index] = debut if isinstance(debut, int) else debut.hour * 60 + debut.minute
+            self._fermeture[index] = fin if isinstance(fin, int) else fin.hour * 60 + fin.minute
+
+    @property
+    def ouverture(self):
+        """Minute d'ouverture de chaque jour (0 = lundi)."""
+        return self._ouverture.copy()
+
+    @property
+    def fermeture(self):
+        """Minute de fermeture de chaque jour (0 = lundi)."""
+        return self._fermeture.copy()
+
+    @property
+    def minutes_ouvertes(self) -> int:
+        """Nombre total de minutes d'ouverture sur la semaine."""
+        return int(np.maximum(self._fermeture - self._ouverture, 0).sum())
+
+
+class StatistiquesEmploiDuTemps:
+    """
+    Statistiques calculées en une passe vectorisée sur toutes les séances.
+
+    Les séances sont rangées en colonnes NumPy (salle, enseignant, groupe,
+    jour, minute de début, minute de fin) ; chaque indicateur est ensuite
+    obtenu par des opérations sur ces tableaux plutôt que par des boucles
+    sur les séances.
+    """
+
+    def __init__(self, seances, calendrier: CalendrierOuverture = None):
+        seances = list(seances)
+        self._calendrier = calendrier or CalendrierOuverture()
+
+        self.salles, salle_ids = self._factoriser(s.salle for s in seances)
+        self.enseignants, enseignant_ids = self._factoriser(s.enseignant for s in seances)
+        self.groupes, groupe_ids = self._factoriser(s.groupe for s in seances)
+
+        self.salle = np.array(salle_ids, dtype=np.int32)
+        self.enseignant = np.array(enseignant_ids, dtype=np.int32)
+        self.groupe = np.array(groupe_ids, dtype=np.int32)
+        self.jour = np.fromiter((s.creneau.jour_index for s in seances), dtype=np.int32)
+        self.debut = np.fromiter((s.creneau.debut_minutes for s in seances), dtype=np.int32)
+        self.fin = np.fromiter((s.creneau.fin_minutes for s in seances), dtype=np.int32)
+
+    @staticmethod
+    def _factoriser(elements):
+        """Associe à chaque élément distinct un identifiant entier consécutif."""
+        uniques, ids, positions = [], [], {}
+        for element in elements:
+            position = positions.get(element)
+            if position is None:
+                position = positions[element] = len(uniques)
+                uniques.append(element)
+            ids.append(position)
+        return uniques, ids
+
+    # --------------------
+    # Durées
+    # --------------------
+    def _durees(self):
+        return self.fin - self.debut
+
+    def _durees_ouvertes(self):
+        """Durée de chaque séance comprise dans les heures d'ouverture de son jour."""
+        debut = np.maximum(self.debut, self._calendrier.ouverture[self.jour])
+        fin = np.minimum(self.fin, self._calendrier.fermeture[self.jour])
+        return np.maximum(fin - debut, 0)
+
+    # --------------------
+    # Indicateurs
+    # --------------------
+    def taux_occupation_salles(self) -> dict:
+        """Taux d'occupation (%) de chaque salle sur les heures d'ouverture."""
+        total = self._calendrier.minutes_ouvertes
+        minutes = np.bincount(self.salle, weights=self._durees_ouvertes(),
+                              minlength=len(self.salles))
+        taux = minutes / total * 100 if total else np.zeros(len(self.salles))
+        return dict(zip(self.salles, taux.tolist()))
+
+    def charge_enseignants(self) -> dict:
+        """Nombre d'heures de cours par enseignant."""
+        heures = np.bincount(self.enseignant, weights=self._durees(),
+                             minlength=len(self.enseignants)) / 60
+        return dict(zip(self.enseignants, heures.tolist()))
+
+    def charge_groupes(self) -> dict:
+        """Nombre d'heures de cours par groupe."""
+        heures = np.bincount(self.groupe, weights=self._durees(),
+                             minlength=len(self.groupes)) / 60
+        return dict(zip(self.groupes, heures.tolist()))
+
+    def histogramme_jours(self, pas_minutes: int = 60) -> np.ndarray:
+        """
+        Nombre de séances en cours par jour et par tranche horaire.
+        Retourne un tableau (nb_jours, 24h / pas) : la case [j, t] compte
+        les séances du jour j actives pendant la tranche t.
+        """
+        nb_tranches = -(-24 * 60 // pas_minutes)
+        variations = np.zeros((len(Creneau.JOURS), nb_tranches + 1), dtype=np.int32)
+        np.add.at(variations, (self.jour, self.debut // pas_minutes), 1)
+        np.add.at(variations, (self.jour, -(-self.fin // pas_minutes)), -1)
+        return np.cumsum(variations, axis=1)[:, :nb_tranches]
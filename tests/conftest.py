@@ -0,0 +1,58 @@
+from datetime import time
+import pytest
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+
+
+@pytest.fixture
+def probleme_glouton():
+    """
+    Une salle, un groupe et deux créneaux : le glouton donne c1 à Prof A,
+    si bien que Prof B, disponible seulement sur c1, ne peut plus être placé.
+    """
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau("Lundi", time(10, 0), time(12, 0))
+    salle = Salle(1, "S1", 40, "td", [])
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    bdd = Matiere("M2", "BDD", "cours", 2, [])
+    prof_a = Enseignant(1, "Prof A", [algo], [c1, c2])
+    prof_b = Enseignant(2, "Prof B", [bdd], [c1])
+    return [salle], [c1, c2], [(algo, prof_a, groupe), (bdd, prof_b, groupe)]
+
+
+@pytest.fixture
+def probleme_repete():
+    """Deux fois le même cours, deux salles et trois créneaux."""
+    creneaux = [Creneau("Lundi", time(h, 0), time(h + 2, 0)) for h in (8, 10, 14)]
+    salles = [Salle(1, "S1", 40, "td", []), Salle(2, "S2", 40, "td", [])]
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    prof = Enseignant(1, "Prof A", [algo], creneaux)
+    return salles, creneaux, [(algo, prof, groupe)] * 2
+
+
+@pytest.fixture
+def probleme_deux_filieres():
+    """
+    Deux filières de même niveau, chacune avec son enseignant, plus un
+    enseignant commun qui fait un cours dans chacune.
+    """
+    creneaux = [Creneau(jour, time(h, 0), time(h + 2, 0))
+                for jour in ("Lundi", "Mardi") for h in (8, 10)]
+    salles = [Salle(1, "S1", 40, "td", []), Salle(2, "S2", 40, "td", [])]
+    info = GroupeEtudiant(1, "G1", "Info", 30, "L1")
+    maths = GroupeEtudiant(2, "G2", "Maths", 30, "L1")
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    analyse = Matiere("M2", "Analyse", "cours", 2, [])
+    prof_a = Enseignant(1, "Prof A", [algo], creneaux)
+    prof_b = Enseignant(2, "Prof B", [analyse], creneaux)
+    commun = Enseignant(3, "Prof C", [algo, analyse], creneaux)
+    demandes = (
+        [(algo, prof_a, info)] * 3 + [(analyse, prof_b, maths)] * 3
+        + [(algo, commun, info), (analyse, commun, maths)]
+    )
+    return salles, creneaux, demandes
@@ -0,0 +1,48 @@
+from datetime import time
+from itertools import permutations
+import numpy as np
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.emploi_du_temps import EmploiDuTemps
+from services.affectation_salles import affectation_min_cout
+from services.scheduler import Scheduler
+
+
+def test_affectation_min_cout_optimale():
+    inf = np.inf
+    couts = np.array([
+        [4, 1, 3, inf],
+        [2, 0, inf, 5],
+        [3, 2, 2, inf],
+    ])
+
+    colonnes = affectation_min_cout(couts)
+
+    meilleur = min(
+        sum(couts[i, p[i]] for i in range(3)) for p in permutations(range(4), 3)
+    )
+    assert sum(couts[i, colonnes[i]] for i in range(3)) == meilleur
+    assert affectation_min_cout(np.array([[1, inf], [2, inf]])) is None
+
+
+def test_scheduler_reattribue_les_salles_du_creneau():
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    salle_projecteur = Salle(1, "S1", 40, "td", ["projecteur"])
+    salle_simple = Salle(2, "S2", 50, "td", [])
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 35)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    reseau = Matiere("M2", "Réseau", "cours", 2, ["projecteur"])
+    prof_a = Enseignant(1, "Prof A", [algo], [c1])
+    prof_b = Enseignant(2, "Prof B", [reseau], [c1])
+
+    edt = EmploiDuTemps()
+    Scheduler([salle_projecteur, salle_simple], [c1]).generer(
+        edt, [(algo, prof_a, g1), (reseau, prof_b, g2)]
+    )
+
+    salles = {s.groupe.nom: s.salle.nom for s in edt.seances}
+    assert salles == {"G1": "S2", "G2": "S1"}
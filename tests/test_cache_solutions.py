@@ -0,0 +1,120 @@
+import copy
+import pytest
+from core.enseignant import Enseignant
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.cache_solutions import CacheSolutions, empreinte
+from services.decomposition import SchedulerDecompose
+from services.multi_depart import SchedulerMultiDepart
+from services.scheduler import Scheduler
+from services.solveur_csp import SolveurCSP
+
+
+def _seances(edt):
+    return [(s.salle.nom, s.creneau.cle_tri) for s in edt.seances]
+
+
+def test_empreinte_depend_du_contenu_et_non_des_objets(probleme_repete):
+    salles, creneaux, demandes = probleme_repete
+    autres_salles, autres_creneaux, autres_demandes = copy.deepcopy(probleme_repete)
+
+    cle = empreinte("Scheduler", salles, creneaux, demandes)
+    assert cle == empreinte("Scheduler", autres_salles, autres_creneaux, autres_demandes)
+
+    autres_salles[0].ajouter_disponibilite(creneaux[0])
+    assert cle != empreinte("Scheduler", autres_salles, autres_creneaux, autres_demandes)
+
+
+@pytest.mark.parametrize("moteur", [Scheduler, SolveurCSP])
+def test_solution_rechargee_depuis_le_cache(tmp_path, moteur, monkeypatch, probleme_repete):
+    salles, creneaux, demandes = probleme_repete
+    cache = CacheSolutions(str(tmp_path))
+    premier = EmploiDuTemps()
+    moteur(salles, creneaux, cache=cache).generer(premier, demandes)
+
+    def interdit(*args):
+        raise AssertionError("le problème ne doit pas être résolu à nouveau")
+    monkeypatch.setattr(Scheduler, "_placer", interdit)
+    monkeypatch.setattr(SolveurCSP, "_resoudre", interdit)
+    # Mêmes données rechargées : de nouveaux objets de même contenu
+    salles, creneaux, demandes = copy.deepcopy(probleme_repete)
+    second = EmploiDuTemps()
+    moteur(salles, creneaux, cache=cache).generer(second, demandes)
+
+    assert _seances(second) == _seances(premier)
+
+
+def test_generation_interrompue_reprend_au_point_de_reprise(tmp_path, monkeypatch,
+                                                          probleme_repete):
+    salles, creneaux, demandes = probleme_repete
+    algo, _, groupe = demandes[0]
+    demandes = demandes + [(algo, Enseignant(2, "Prof B", [algo], []), groupe)]
+    cache = CacheSolutions(str(tmp_path))
+    with pytest.raises(AucuneSolutionException):
+        Scheduler(salles, creneaux, cache=cache).generer(EmploiDuTemps(), demandes)
+    cle = empreinte("Scheduler", salles, creneaux, demandes)
+    assert len(cache.reprise(cle)) == 2
+
+    appels = []
+    placer_demande = Scheduler._placer_demande
+    monkeypatch.setattr(Scheduler, "_placer_demande",
+                        lambda self, edt, demande: appels.append(demande)
+                        or placer_demande(self, edt, demande))
+    edt = EmploiDuTemps()
+    with pytest.raises(AucuneSolutionException):
+        Scheduler(salles, creneaux, cache=cache).generer(edt, demandes)
+    assert len(edt.seances) == 2
+    assert appels == demandes[2:]
+
+
+def _interrompre(*args):
+    raise KeyboardInterrupt
+
+
+def _interdit(*args):
+    raise AssertionError("le travail enregistré ne doit pas être refait")
+
+
+def test_multi_depart_reprend_les_tentatives_terminees(tmp_path, monkeypatch, probleme_glouton):
+    salles, creneaux, demandes = probleme_glouton
+    matiere, _, groupe = demandes[1]
+    demandes.append((matiere, Enseignant(3, "Prof C", [], creneaux[:1]), groupe))
+    cache = CacheSolutions(str(tmp_path))
+    moteur = SchedulerMultiDepart(salles, creneaux, tentatives=4, processus=2, cache=cache)
+    # Arrêt brutal juste avant l'enregistrement du résultat
+    monkeypatch.setattr(CacheSolutions, "enregistrer_solution", _interrompre)
+    with pytest.raises(KeyboardInterrupt):
+        moteur.generer(EmploiDuTemps(), demandes)
+
+    monkeypatch.undo()
+    monkeypatch.setattr("services.multi_depart.pool_partage", _interdit)
+    edt = EmploiDuTemps()
+    with pytest.raises(AucuneSolutionException):
+        moteur.generer(edt, demandes)
+    assert len(edt.seances) == 2
+
+    # Le résultat est maintenant rechargé sans relire les tentatives
+    monkeypatch.setattr(CacheSolutions, "reprise", _interdit)
+    with pytest.raises(AucuneSolutionException):
+        moteur.generer(EmploiDuTemps(), demandes)
+
+
+def test_decomposition_reprend_les_clusters_resolus(tmp_path, monkeypatch,
+                                                   probleme_deux_filieres):
+    salles, creneaux, demandes = probleme_deux_filieres
+    cache = CacheSolutions(str(tmp_path))
+    moteur = SchedulerDecompose(salles, creneaux, processus=2, cache=cache)
+    monkeypatch.setattr(CacheSolutions, "enregistrer_solution", _interrompre)
+    with pytest.raises(KeyboardInterrupt):
+        moteur.generer(EmploiDuTemps(), demandes)
+
+    monkeypatch.undo()
+    monkeypatch.setattr("services.decomposition.pool_partage", _interdit)
+    edt = EmploiDuTemps()
+    moteur.generer(edt, demandes)
+    assert len(edt.seances) == len(demandes)
+
+    salles, creneaux, demandes = copy.deepcopy(probleme_deux_filieres)
+    autre = EmploiDuTemps()
+    SchedulerDecompose(salles, creneaux, cache=cache).generer(autre, demandes)
+    assert _seances(autre) == _seances(edt)
@@ -1,4 +1,6 @@
+import random
 from datetime import time
+from itertools import combinations
 from core.creneau import Creneau
 from core.salle import Salle
 from core.groupe_etudiant import GroupeEtudiant
@@ -6,6 +8,7 @@ from core.matiere import Matiere
 from core.enseignant import Enseignant
 from core.seance import Seance
 from services.conflict_detector import ConflictDetector
+from services.constraints import ConflictType
 
 
 def test_conflit_salle():
@@ -21,3 +24,61 @@ def test_conflit_salle():
     conflits = ConflictDetector.detect(s1, s2)
 
     assert conflits
+
+
+def test_audit_identique_a_la_comparaison_deux_a_deux():
+    alea = random.Random(0)
+    creneaux = [Creneau(jour, time(h, m), time(h + 2, m))
+                for jour in ("Lundi", "Mardi") for h in (8, 9, 10) for m in (0, 30)]
+    salles = [Salle(k, f"S{k}", 40, "td", []) for k in (1, 2, 3)]
+    groupes = [GroupeEtudiant(g, f"G{g}", "Info", 20) for g in (1, 2, 3)]
+    matiere = Matiere("M1", "Algo", "td", 2, [])
+    enseignants = [Enseignant(e, f"Prof {e}", [matiere], creneaux) for e in (1, 2, 3)]
+    seances = [
+        Seance(matiere, alea.choice(enseignants), alea.choice(groupes),
+               alea.choice(salles), alea.choice(creneaux))
+        for _ in range(60)
+    ]
+
+    attendus = {
+        (type_conflit, frozenset((id(a), id(b))))
+        for a, b in combinations(seances, 2)
+        for type_conflit in ConflictDetector.detect(a, b)
+        if type_conflit != ConflictType.CRENEAU
+    }
+    conflits = list(ConflictDetector.auditer(seances, paires=True))
+
+    assert len(conflits) == len(attendus)
+    assert {(c.type, frozenset((id(c.seance), id(c.autre)))) for c in conflits} == attendus
+    for c in conflits:
+        partiel = c.seance.creneau != c.autre.creneau
+        assert c.chevauchement == (ConflictType.CRENEAU if partiel else None)
+        assert (ConflictType.CRENEAU in ConflictDetector.detect(c.seance, c.autre)) == partiel
+
+    # Sans les paires : une fois chaque séance qui chevauche une précédente
+    uniques = list(ConflictDetector.auditer(seances))
+    assert ({(c.type, id(c.autre)) for c in uniques}
+            == {(c.type, id(c.autre)) for c in conflits})
+    assert len(uniques) == len({(c.type, id(c.autre)) for c in uniques})
+    assert all((c.type, frozenset((id(c.seance), id(c.autre)))) in attendus for c in uniques)
+
+
+def test_audit_signale_chaque_seance_une_fois():
+    c1 = Creneau("Lundi", time(8, 0), time(12, 0))
+    c2 = Creneau("Lundi", time(9, 0), time(10, 0))
+    c3 = Creneau("Lundi", time(11, 0), time(12, 0))
+    salle = Salle(1, "S1", 40, "td", [])
+    matiere = Matiere("M1", "Algo", "td", 2, [])
+    seances = [
+        Seance(matiere, Enseignant(e, f"Prof {e}", [matiere], [c]),
+               GroupeEtudiant(e, f"G{e}", "Info", 20), salle, c)
+        for e, c in enumerate((c1, c2, c2, c3), 1)
+    ]
+
+    conflits = list(ConflictDetector.auditer(seances))
+
+    # Toutes les séances sont face à c1, qui finit le plus tard
+    assert [(c.type, c.autre) for c in conflits] == [(ConflictType.SALLE, s) for s in seances[1:]]
+    assert all(c.seance is seances[0] for c in conflits)
+    assert all(c.chevauchement == ConflictType.CRENEAU for c in conflits)
+    assert len(list(ConflictDetector.auditer(seances, paires=True))) == 4
@@ -10,3 +10,26 @@ def test_creation_creneau():
 
 
 test_creation_creneau()
+
+
+def test_interner_partage_l_instance():
+    c1 = Creneau.interner("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau.interner("lundi", time(8, 0), time(10, 0))
+    assert c1 is c2
+    assert c1 == Creneau("lundi", time(8, 0), time(10, 0))
+
+
+def test_encodage_minutes():
+    c = Creneau("Mardi", time(8, 30), time(10, 0))
+    assert c.jour_index == 1
+    assert (c.debut_minutes, c.fin_minutes) == (510, 600)
+    assert c.duree_heures == 1.5
+    assert c.cle_tri < Creneau("mardi", time(9, 0), time(10, 0)).cle_tri
+
+
+def test_chevauchement_et_inclusion():
+    c = Creneau("lundi", time(8, 0), time(10, 0))
+    assert c.chevauche(Creneau("lundi", time(9, 0), time(11, 0)))
+    assert not c.chevauche(Creneau("lundi", time(10, 0), time(11, 0)))
+    assert not c.chevauche(Creneau("mardi", time(8, 0), time(10, 0)))
+    assert c.contient(Creneau("lundi", time(8, 30), time(9, 30)))
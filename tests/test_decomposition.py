@@ -0,0 +1,48 @@
+import pytest
+from core.enseignant import Enseignant
+from core.groupe_etudiant import GroupeEtudiant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.conflict_detector import ConflictDetector
+from services.decomposition import SchedulerDecompose
+
+
+# 0.25 : un cluster par filière ; 0.2 : l'enseignant commun fusionne tout
+@pytest.mark.parametrize("seuil_couplage", [0.25, 0.2])
+def test_decomposition_place_toutes_les_demandes(probleme_deux_filieres, seuil_couplage):
+    salles, creneaux, demandes = probleme_deux_filieres
+    edt = EmploiDuTemps()
+
+    SchedulerDecompose(salles, creneaux, processus=2,
+                       seuil_couplage=seuil_couplage).generer(edt, demandes)
+
+    assert len(edt.seances) == len(demandes)
+    assert len(edt.seances_par_enseignant("Prof C")) == 2
+    assert not list(ConflictDetector.auditer(edt.seances))
+
+
+def test_decomposition_respecte_les_seances_existantes(probleme_deux_filieres):
+    salles, creneaux, demandes = probleme_deux_filieres
+    algo, prof_a, info = demandes[0]
+    existante = Seance(algo, prof_a, info, salles[0], creneaux[0])
+    edt = EmploiDuTemps()
+    edt.ajouter_seance(existante)
+
+    SchedulerDecompose(salles, creneaux, processus=2).generer(edt, demandes[1:])
+
+    assert edt.seances[0] is existante
+    assert len(edt.seances) == len(demandes)
+    assert not list(ConflictDetector.auditer(edt.seances))
+
+
+def test_decomposition_demande_impossible(probleme_deux_filieres):
+    salles, creneaux, demandes = probleme_deux_filieres
+    algo = demandes[0][0]
+    physique = GroupeEtudiant(3, "G3", "Physique", 30, "L1")
+    demandes.append((algo, Enseignant(4, "Prof D", [algo], []), physique))
+    edt = EmploiDuTemps()
+
+    with pytest.raises(AucuneSolutionException):
+        SchedulerDecompose(salles, creneaux, processus=2).generer(edt, demandes)
+    assert len(edt.seances) == len(demandes) - 1
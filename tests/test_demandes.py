@@ -0,0 +1,57 @@
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.emploi_du_temps import EmploiDuTemps
+from services.demandes import generer_demandes
+from services.scheduler import Scheduler
+from services.solveur_csp import SolveurCSP
+
+
+def _catalogue():
+    creneaux = [
+        Creneau(jour, time(h, 0), time(h + duree, 0))
+        for jour in ("lundi", "mardi") for h in (8, 10) for duree in (1, 2)
+    ]
+    salle = Salle(1, "S1", 40, "td", [])
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 3, [])
+    prof = Enseignant(1, "Prof A", [algo], [Creneau(j, time(8, 0), time(18, 0))
+                                            for j in ("lundi", "mardi")])
+    return [salle], creneaux, [(algo, prof, groupe)]
+
+
+def test_volume_horaire_decoupe_en_seances():
+    _, _, affectations = _catalogue()
+
+    demandes = list(generer_demandes(affectations))
+
+    assert [d.duree_minutes for d in demandes] == [120, 60]
+
+
+def test_generation_paresseuse():
+    _, _, affectations = _catalogue()
+    consommees = []
+
+    def lire():
+        for affectation in affectations * 1000:
+            consommees.append(affectation)
+            yield affectation
+
+    demandes = generer_demandes(lire())
+    next(demandes)
+    assert len(consommees) == 1
+
+
+def test_un_cours_par_jour():
+    for moteur in (Scheduler, SolveurCSP):
+        salles, creneaux, affectations = _catalogue()
+        edt = EmploiDuTemps()
+
+        moteur(salles, creneaux).generer(edt, generer_demandes(affectations))
+
+        seances = edt.seances
+        assert sorted(s.creneau.duree_minutes for s in seances) == [60, 120]
+        assert len({s.creneau.jour for s in seances}) == 2
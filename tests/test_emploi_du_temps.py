@@ -1,3 +1,4 @@
+import pytest
 from core.emploi_du_temps import EmploiDuTemps
 from core.seance import Seance
 from core.creneau import Creneau
@@ -19,3 +20,58 @@ def test_ajout_seance_sans_conflit():
 
     edt.ajouter_seance(s)
     assert len(edt.seances) == 1
+
+
+def test_conflit_chevauchement_partiel():
+    edt = EmploiDuTemps()
+    salle = Salle(1, "TD1", 30, "td")
+    grp = GroupeEtudiant(1, "GI1", "Info", 30)
+    matiere = Matiere("MATH1", "Math", "td", 2, [])
+
+    c1 = Creneau("mercredi", time(8, 0), time(10, 0))
+    c2 = Creneau("mercredi", time(9, 0), time(11, 0))
+    edt.ajouter_seance(Seance(matiere, Enseignant(1, "Prof A"), grp, salle, c1))
+
+    with pytest.raises(ValueError):
+        edt.ajouter_seance(Seance(matiere, Enseignant(2, "Prof B"), grp, salle, c2))
+
+    c3 = Creneau("mercredi", time(10, 0), time(12, 0))
+    edt.ajouter_seance(Seance(matiere, Enseignant(2, "Prof B"), grp, salle, c3))
+    assert len(edt.seances) == 2
+
+
+def test_suppression_libere_le_creneau():
+    edt = EmploiDuTemps()
+    salle = Salle(1, "TD1", 30, "td")
+    ens = Enseignant(1, "Prof A")
+    grp = GroupeEtudiant(1, "GI1", "Info", 30)
+    matiere = Matiere("MATH1", "Math", "td", 2, [])
+    c = Creneau("jeudi", time(14, 0), time(16, 0))
+
+    edt.ajouter_seance(Seance(matiere, ens, grp, salle, c))
+    edt.supprimer_seance(Seance(matiere, ens, grp, salle, c))
+    edt.ajouter_seance(Seance(matiere, ens, grp, salle, c))
+    assert len(edt.seances) == 1
+
+
+def test_recherche_par_noms():
+    edt = EmploiDuTemps()
+    salle1 = Salle(1, "TD1", 30, "td")
+    salle2 = Salle(2, "TD2", 30, "td")
+    ens = Enseignant(1, "Prof A")
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 30)
+    matiere = Matiere("MATH1", "Math", "td", 2, [])
+
+    s1 = Seance(matiere, ens, g1, salle1, Creneau("lundi", time(8, 0), time(10, 0)))
+    s2 = Seance(matiere, ens, g2, salle2, Creneau("lundi", time(10, 0), time(12, 0)))
+    edt.ajouter_seance(s1)
+    edt.ajouter_seance(s2)
+
+    assert edt.seances_par_enseignant("Prof A") == [s1, s2]
+    assert edt.seances_par_groupe("G2") == [s2]
+    assert edt.rechercher(enseignant_nom="Prof A", salle_nom="TD1") == [s1]
+    assert edt.rechercher(groupe_nom="G1", salle_nom="TD2") == []
+
+    edt.supprimer_seance(s1)
+    assert edt.seances_par_salle("TD1") == []
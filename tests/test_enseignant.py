@@ -1,3 +1,5 @@
+import copy
+import pickle
 from core.enseignant import Enseignant
 from core.creneau import Creneau
 from datetime import time
@@ -7,3 +9,40 @@ def test_enseignant_disponible():
     e = Enseignant(1, "Prof A", disponibilites=[c])
 
     assert e.est_disponible(c)
+
+
+def test_retirer_disponibilite_coupe_le_creneau():
+    journee = Creneau("lundi", time(8, 0), time(18, 0))
+    e = Enseignant(1, "Prof A", disponibilites=[journee])
+
+    e.retirer_disponibilite(Creneau("lundi", time(10, 0), time(12, 0)))
+
+    assert not e.est_disponible(Creneau("lundi", time(11, 0), time(12, 0)))
+    assert e.est_disponible(Creneau("lundi", time(8, 0), time(10, 0)))
+    assert e.est_disponible(Creneau("lundi", time(12, 0), time(18, 0)))
+
+
+def test_disponibilites_fusionnees_et_creneaux_libres():
+    e = Enseignant(1, "Prof A", disponibilites=[
+        Creneau("lundi", time(14, 0), time(16, 0)),
+        Creneau("lundi", time(8, 0), time(10, 0)),
+        Creneau("lundi", time(10, 0), time(11, 0)),
+    ])
+
+    assert e.est_disponible(Creneau("lundi", time(9, 0), time(11, 0)))
+    assert not e.est_disponible(Creneau("lundi", time(10, 30), time(14, 30)))
+    assert e.creneaux_libres("lundi", fin=time(15, 0)) == [
+        Creneau("lundi", time(8, 0), time(11, 0)),
+        Creneau("lundi", time(14, 0), time(15, 0)),
+    ]
+    assert e.creneaux_libres("mardi") == []
+
+
+def test_copie_sans_disponibilite_puis_ajout():
+    lundi = Creneau("lundi", time(8, 0), time(10, 0))
+    original = Enseignant(1, "Prof A")
+
+    for copie in (copy.deepcopy(original), pickle.loads(pickle.dumps(original))):
+        copie.ajouter_disponibilite(lundi)
+        assert copie.est_disponible(lundi)
+    assert not original.est_disponible(lundi)
@@ -0,0 +1,51 @@
+from datetime import time
+import pytest
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.exceptions import AucuneSolutionException
+from services.examens import PlanificateurExamens
+
+
+def _seances():
+    cours = Creneau("Lundi", time(8, 0), time(10, 0))
+    salle = Salle(9, "TD", 40, "td", [])
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 30)
+    g3 = GroupeEtudiant(3, "G3", "Maths", 20)
+    matieres = {code: Matiere(code, code, "cours", 2, []) for code in ("A", "B", "C", "D")}
+    prof = Enseignant(1, "Prof", list(matieres.values()), [cours])
+    return [
+        Seance(matieres[code], prof, groupe, salle, cours)
+        for code, groupe in (("A", g1), ("A", g2), ("B", g2), ("C", g3), ("D", g1))
+    ]
+
+
+def test_examens_sans_conflit_de_groupe_et_creneaux_minimaux():
+    creneaux = [Creneau("Lundi", time(h, 0), time(h + 2, 0)) for h in (8, 10, 14)]
+    salles = [Salle(1, "Amphi", 100, "amphi", []), Salle(2, "S2", 40, "td", [])]
+
+    examens = PlanificateurExamens(salles, creneaux).planifier(_seances())
+
+    assert len(examens) == 4
+    assert {examen.creneau for examen in examens} == set(creneaux[:2])
+    par_matiere = {examen.matiere.code: examen for examen in examens}
+    assert par_matiere["A"].creneau != par_matiere["B"].creneau
+    assert par_matiere["A"].creneau != par_matiere["D"].creneau
+    assert par_matiere["A"].repartition == [(salles[0], 60)]
+
+
+def test_examens_repartis_sur_plusieurs_salles():
+    creneaux = [Creneau("Lundi", time(8, 0), time(10, 0))]
+    salles = [Salle(k, f"S{k}", 40, "td", []) for k in (1, 2, 3, 4)]
+
+    seances = [s for s in _seances() if s.matiere.code in ("A", "C")]
+    examens = PlanificateurExamens(salles, creneaux).planifier(seances)
+
+    assert sorted(nombre for e in examens for _, nombre in e.repartition) == [20, 20, 40]
+
+    with pytest.raises(AucuneSolutionException):
+        PlanificateurExamens(salles, creneaux).planifier(_seances())
@@ -0,0 +1,76 @@
+from datetime import time
+import pytest
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import ProblemeInfaisableException
+from services.faisabilite import AnalyseurFaisabilite
+from services.solveur_csp import SolveurCSP
+
+
+def _donnees():
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau("Lundi", time(10, 0), time(12, 0))
+    amphi = Salle(1, "Amphi", 200, "amphi", ["projecteur"])
+    td = Salle(2, "TD", 40, "td", [])
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    prof = Enseignant(1, "Prof A", [algo], [c1])
+    return [c1, c2], [amphi, td], algo, prof
+
+
+def test_analyse_probleme_faisable():
+    creneaux, salles, algo, prof = _donnees()
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+
+    rapport = AnalyseurFaisabilite(salles, creneaux).analyser(
+        EmploiDuTemps(), [(algo, prof, groupe)]
+    )
+
+    assert rapport.est_faisable
+
+
+def test_analyse_nomme_les_ressources_surchargees():
+    creneaux, salles, algo, prof = _donnees()
+    g1 = GroupeEtudiant(1, "G1", "Info", 150)
+    g2 = GroupeEtudiant(2, "G2", "Info", 150)
+    g3 = GroupeEtudiant(3, "G3", "Info", 150)
+    video = Matiere("M2", "Vidéo", "tp", 2, ["pc"])
+    autre = Enseignant(2, "Prof B", [algo, video], creneaux)
+    demandes = [(algo, prof, g1), (algo, prof, g2), (algo, autre, g3), (video, autre, g1)]
+
+    rapport = AnalyseurFaisabilite(salles, creneaux).analyser(EmploiDuTemps(), demandes)
+
+    noms = {surcharge.nom for surcharge in rapport.surcharges}
+    assert "Prof A" in noms
+    assert "salles Amphi" in noms
+    assert [motif for _, motif in rapport.demandes_impossibles] == ["aucune salle compatible"]
+
+    with pytest.raises(ProblemeInfaisableException) as erreur:
+        SolveurCSP(salles, creneaux).generer(EmploiDuTemps(), demandes)
+    assert erreur.value.rapport.surcharges
+
+
+@pytest.mark.parametrize("avec_enseignants", [False, True])
+def test_seance_hors_disponibilites_ne_consomme_pas_la_charge(avec_enseignants):
+    creneaux, salles, algo, prof = _donnees()
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    autre_groupe = GroupeEtudiant(2, "G2", "Info", 30)
+    mardi = Creneau("Mardi", time(8, 0), time(10, 0))
+    edt = EmploiDuTemps()
+    # Séance existante en dehors des disponibilités déclarées (lundi 8h-10h)
+    edt.charger_seances([Seance(algo, prof, autre_groupe, salles[1], mardi)])
+    enseignants = [prof] if avec_enseignants else None
+
+    SolveurCSP(salles, creneaux, enseignants=enseignants).generer(edt, [(algo, prof, groupe)])
+    assert len(edt.seances_par_enseignant("Prof A")) == 2
+
+    # Avec une charge maximale explicite, toute séance existante compte
+    edt = EmploiDuTemps()
+    edt.charger_seances([Seance(algo, prof, autre_groupe, salles[1], mardi)])
+    with pytest.raises(ProblemeInfaisableException):
+        SolveurCSP(salles, creneaux, enseignants=[prof], charges_max={prof: 120}).generer(
+            edt, [(algo, prof, groupe)])
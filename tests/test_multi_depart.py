@@ -0,0 +1,43 @@
+import pytest
+from core.enseignant import Enseignant
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException
+from services.multi_depart import SchedulerMultiDepart
+
+
+def test_multi_depart_trouve_un_autre_ordre(probleme_glouton):
+    salles, creneaux, demandes = probleme_glouton
+    edt = EmploiDuTemps()
+
+    SchedulerMultiDepart(salles, creneaux, tentatives=16, processus=2).generer(edt, demandes)
+
+    assert len(edt.seances) == 2
+    assert edt.seances_par_enseignant("Prof B")[0].creneau == creneaux[0]
+
+
+def test_multi_depart_garde_le_meilleur_partiel(probleme_glouton):
+    salles, creneaux, demandes = probleme_glouton
+    matiere, _, groupe = demandes[1]
+    demandes.append((matiere, Enseignant(3, "Prof C", [], creneaux[:1]), groupe))
+    edt = EmploiDuTemps()
+
+    with pytest.raises(AucuneSolutionException):
+        SchedulerMultiDepart(salles, creneaux, tentatives=8, processus=2).generer(edt, demandes)
+    assert len(edt.seances) == 2
+
+
+def test_multi_depart_departage_par_la_graine(probleme_repete):
+    # Toutes les tentatives placent tout : seule la graine les départage
+    salles, creneaux, demandes = probleme_repete
+    resultats = []
+    for processus in (1, 4):
+        edt = EmploiDuTemps()
+        SchedulerMultiDepart(salles, creneaux, tentatives=8, processus=processus,
+                             graine=3, arret_anticipe=False).generer(edt, demandes)
+        resultats.append(sorted(str(s) for s in edt.seances))
+    assert resultats[0] == resultats[1]
+
+
+def test_multi_depart_sans_tentative_refuse():
+    with pytest.raises(ValueError):
+        SchedulerMultiDepart([], [], tentatives=0)
@@ -0,0 +1,83 @@
+from datetime import time
+import pytest
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from services.cache_solutions import CacheSolutions
+from services.optimiseur import OptimiseurRecuit
+
+
+def _emploi_avec_trou():
+    creneaux = [Creneau("Lundi", time(h, 0), time(h + 2, 0)) for h in (8, 10, 12, 14, 16)]
+    salles = [Salle(1, "S1", 40, "td", []), Salle(2, "Amphi", 200, "amphi", [])]
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    bdd = Matiere("M2", "BDD", "cours", 2, [])
+    prof_a = Enseignant(1, "Prof A", [algo], creneaux)
+    prof_b = Enseignant(2, "Prof B", [bdd], creneaux)
+
+    edt = EmploiDuTemps()
+    edt.ajouter_seance(Seance(algo, prof_a, groupe, salles[1], creneaux[0]))
+    edt.ajouter_seance(Seance(bdd, prof_b, groupe, salles[0], creneaux[4]))
+    return salles, creneaux, edt
+
+
+def test_optimiseur_supprime_les_trous():
+    salles, creneaux, edt = _emploi_avec_trou()
+    optimiseur = OptimiseurRecuit(salles, creneaux, graine=1, iterations_max=2000)
+    # Un optimiseur améliore un emploi du temps, il n'en génère pas
+    assert not hasattr(optimiseur, "generer")
+
+    cout = optimiseur.optimiser(edt)
+
+    debuts = sorted(s.creneau.debut_minutes for s in edt.seances)
+    assert debuts[1] - debuts[0] == 120
+    assert all(s.salle.nom == "S1" for s in edt.seances)
+    assert cout == pytest.approx(OptimiseurRecuit(salles, creneaux, iterations_max=0).optimiser(edt))
+
+
+def test_optimiseur_deterministe():
+    resultats = []
+    for _ in range(2):
+        salles, creneaux, edt = _emploi_avec_trou()
+        OptimiseurRecuit(salles, creneaux, graine=7, iterations_max=500).optimiser(edt)
+        resultats.append(sorted(str(s) for s in edt.seances))
+    assert resultats[0] == resultats[1]
+
+
+def test_optimiseur_recharge_et_reprend_depuis_le_cache(tmp_path, monkeypatch):
+    cache = CacheSolutions(str(tmp_path))
+    salles, creneaux, edt = _emploi_avec_trou()
+    attendu = OptimiseurRecuit(salles, creneaux, graine=1, iterations_max=2000).optimiser(edt)
+
+    # Interruption juste avant l'enregistrement du résultat : la reprise
+    # garde les meilleures positions trouvées
+    def interrompre(*args):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(CacheSolutions, "enregistrer_solution", interrompre)
+    salles, creneaux, edt = _emploi_avec_trou()
+    optimiseur = OptimiseurRecuit(salles, creneaux, graine=1, iterations_max=2000,
+                                  cache=cache, intervalle_reprise=0)
+    with pytest.raises(KeyboardInterrupt):
+        optimiseur.optimiser(edt)
+    monkeypatch.undo()
+
+    # Sans aucun mouvement, la reprise suffit à retrouver le résultat
+    monkeypatch.setattr(OptimiseurRecuit, "_mouvement_aleatoire", lambda self, alea: None)
+    salles, creneaux, edt = _emploi_avec_trou()
+    optimiseur = OptimiseurRecuit(salles, creneaux, graine=1, iterations_max=2000, cache=cache)
+    assert optimiseur.optimiser(edt) == pytest.approx(attendu)
+    seances = sorted(str(s) for s in edt.seances)
+
+    # Le résultat est ensuite rechargé sans recherche
+    def interdit(*args):
+        raise AssertionError("l'emploi du temps ne doit pas être optimisé à nouveau")
+    monkeypatch.setattr(OptimiseurRecuit, "_mouvement_aleatoire", interdit)
+    salles, creneaux, edt = _emploi_avec_trou()
+    optimiseur = OptimiseurRecuit(salles, creneaux, graine=1, iterations_max=2000, cache=cache)
+    assert optimiseur.optimiser(edt) == pytest.approx(attendu)
+    assert sorted(str(s) for s in edt.seances) == seances
@@ -0,0 +1,63 @@
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from services.recherche_creneaux import RechercheCreneaux
+from services.statistiques import CalendrierOuverture
+
+
+def _creneau(debut, fin, jour="lundi"):
+    return Creneau(jour, time(debut, 0), time(fin, 0))
+
+
+def test_creneau_commun_a_plusieurs_groupes_et_une_salle():
+    g1 = GroupeEtudiant(1, "G1", "Info", 20)
+    g2 = GroupeEtudiant(2, "G2", "Info", 20)
+    prof = Enseignant(1, "X", disponibilites=[_creneau(8, 18)])
+    autre = Enseignant(2, "Y", disponibilites=[_creneau(8, 18)])
+    tp1 = Salle(1, "TP1", 24, "tp")
+    tp2 = Salle(2, "TP2", 30, "tp", disponibilites=[_creneau(14, 18)])  # bloquée l'après-midi
+    matiere = Matiere("M1", "Algo", "tp", 2)
+
+    edt = EmploiDuTemps()
+    edt.ajouter_seance(Seance(matiere, autre, g1, tp1, _creneau(8, 10)))
+    edt.ajouter_seance(Seance(matiere, prof, g2, tp2, _creneau(10, 12)))
+    edt.ajouter_seance(Seance(matiere, autre, g1, tp1, _creneau(13, 15)))
+
+    recherche = RechercheCreneaux(edt, CalendrierOuverture({"lundi": (time(8, 0), time(18, 0))}))
+    propositions = recherche.chercher(120, groupes=[g1, g2], enseignants=[prof], salles=[tp1, tp2])
+
+    # G1 et G2 ne sont libres ensemble que de 12h à 13h et de 15h à 18h,
+    # et TP2 est bloquée l'après-midi
+    assert propositions[0].creneau == _creneau(15, 17)
+    assert propositions[0].salles == [tp1]
+    assert propositions[0].perte == 60
+    assert all(p.creneau.debut_minutes >= 15 * 60 for p in propositions)
+    assert not recherche.chercher(240, groupes=[g1, g2], salles=[tp1, tp2])
+
+
+def test_creneaux_bien_cales_d_abord():
+    groupe = GroupeEtudiant(1, "G1", "Info", 20)
+    edt = EmploiDuTemps()
+    recherche = RechercheCreneaux(edt, CalendrierOuverture({"mardi": (time(8, 0), time(12, 0))}), pas=60)
+
+    propositions = recherche.chercher(180, groupes=[groupe])
+
+    assert [p.creneau for p in propositions] == [_creneau(8, 11, "mardi"), _creneau(9, 12, "mardi")]
+    assert [p.perte for p in propositions] == [60, 60]
+    assert propositions[0].salles == []
+
+
+def test_calendrier_ouvert_jusqu_a_minuit():
+    g1 = GroupeEtudiant(1, "G1", "Info", 20)
+    prof = Enseignant(1, "X", disponibilites=[Creneau("lundi", time(20, 0), time(23, 59))])
+    calendrier = CalendrierOuverture({"lundi": (20 * 60, 24 * 60)})
+
+    propositions = RechercheCreneaux(EmploiDuTemps(), calendrier, pas=60).chercher(
+        180, groupes=[g1], enseignants=[prof], salles=[Salle(1, "TD1", 30, "td")])
+
+    assert [p.creneau for p in propositions] == [_creneau(20, 23)]
@@ -0,0 +1,35 @@
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from services.reparation import ReparateurEmploiDuTemps
+from users.enseignant_user import EnseignantUser
+
+
+def test_reparation_deplace_seulement_les_seances_invalides():
+    creneaux = [Creneau("Lundi", time(h, 0), time(h + 2, 0)) for h in (8, 10, 12)]
+    salle = Salle(1, "S1", 40, "td", [])
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    prof_a = Enseignant(1, "Prof A", [algo], [Creneau("Lundi", time(8, 0), time(18, 0))])
+    prof_b = Enseignant(2, "Prof B", [algo], [Creneau("Lundi", time(8, 0), time(18, 0))])
+
+    edt = EmploiDuTemps()
+    edt.ajouter_seance(Seance(algo, prof_a, g1, salle, creneaux[0]))
+    fixe = Seance(algo, prof_b, g2, salle, creneaux[1])
+    edt.ajouter_seance(fixe)
+
+    EnseignantUser("a", "mdp", 1, prof_a).signaler_indisponibilite(creneaux[0])
+    reparateur = ReparateurEmploiDuTemps([salle], creneaux)
+    assert len(reparateur.seances_invalides(edt, prof_a)) == 1
+
+    replacees = reparateur.reparer(edt, prof_a)
+
+    assert [s.creneau for s in replacees] == [creneaux[2]]
+    assert fixe in edt.seances
+    assert not reparateur.seances_invalides(edt, prof_a)
@@ -0,0 +1,136 @@
+from datetime import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database.base import Base
+from database import models
+from database.repository import (
+    SalleRepository, MatiereRepository, GroupeEtudiantRepository,
+    EnseignantRepository, CreneauRepository, SeanceRepository,
+    ReservationRepository, UtilisateurRepository
+)
+import pytest
+from core.salle import Salle
+from core.matiere import Matiere
+from core.groupe_etudiant import GroupeEtudiant
+from core.creneau import Creneau
+from core.enseignant import Enseignant
+from core.reservation import Reservation
+from core.exceptions import ConflitException
+
+
+def _session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def _remplir(session, nb_seances):
+    salle = SalleRepository.create(session, Salle(1, "Amphi", 100, "amphi", ["projecteur"]))
+    matiere = MatiereRepository.create(session, Matiere("M1", "Algo", "cours", 2, ["projecteur"]))
+    groupe = GroupeEtudiantRepository.create(session, GroupeEtudiant(1, "G1", "Info", 30))
+    dispo = Creneau("lundi", time(8, 0), time(18, 0))
+    enseignant = EnseignantRepository.create(
+        session, Enseignant(1, "Prof", [Matiere("M1", "Algo", "cours", 2)], [dispo])
+    )
+    for i in range(nb_seances):
+        creneau = CreneauRepository.get_or_create(
+            session, Creneau("lundi", time(8 + i % 5, 0), time(9 + i % 5, 0))
+        )
+        db_seance = models.SeanceModel(
+            matiere_id=matiere.id, enseignant_id=enseignant.id, groupe_id=groupe.id,
+            salle_id=salle.id, creneau_id=creneau.id
+        )
+        session.add(db_seance)
+    session.commit()
+    session.expunge_all()
+
+
+def test_chargement_groupe_en_peu_de_requetes():
+    engine, session = _session()
+    _remplir(session, 20)
+
+    requetes = []
+    parametres = []
+    event.listen(engine, "before_cursor_execute", lambda *args: requetes.append(args[2]))
+    event.listen(engine, "before_cursor_execute", lambda *args: parametres.append(args[3]))
+    seances = SeanceRepository.get_all_domain(session)
+
+    assert len(seances) == 20
+    assert len(requetes) <= 8
+    # Les tables liées sont filtrées par sous-requête, pas par liste d'ids
+    # (5 créneaux distincts ici) : seul le chargement des collections de
+    # l'unique enseignant lie un paramètre
+    assert max(len(p) for p in parametres) <= 1
+    assert seances[0].salle is seances[1].salle
+    assert seances[0].enseignant is seances[19].enseignant
+    assert seances[0].enseignant.matieres[0] is seances[0].matiere
+
+
+def test_identity_map_par_session():
+    engine, session = _session()
+    _remplir(session, 2)
+
+    salles = SalleRepository.get_all(session)
+    assert SalleRepository.get_by_id(session, 1) is salles[0]
+    enseignant = EnseignantRepository.get_by_id_domain(session, 1)
+    assert EnseignantRepository.get_all(session)[0] is enseignant
+    assert enseignant.disponibilites[0] is CreneauRepository.get_all(session)[0]
+
+    autre_session = sessionmaker(bind=engine)()
+    assert SalleRepository.get_by_id(autre_session, 1) is not salles[0]
+
+
+def test_reservation_refusee_si_salle_occupee():
+    engine, session = _session()
+    _remplir(session, 1)  # séance le lundi de 8h à 9h dans l'Amphi
+    utilisateur = UtilisateurRepository.create_user(session, "prof", "secret", "enseignant")
+    salle = SalleRepository.get_by_id(session, 1)
+
+    with pytest.raises(ConflitException):
+        ReservationRepository.create(
+            session, Reservation(None, salle, Creneau("lundi", time(8, 30), time(9, 30))), utilisateur.id
+        )
+    premiere = ReservationRepository.create(
+        session, Reservation(None, salle, Creneau("lundi", time(9, 0), time(11, 0))), utilisateur.id
+    )
+
+    # Une demande en attente bloque les nouvelles demandes, sans recharger la table
+    requetes = []
+    event.listen(engine, "before_cursor_execute", lambda *args: requetes.append(args[2]))
+    with pytest.raises(ConflitException):
+        ReservationRepository.create(
+            session, Reservation(None, salle, Creneau("lundi", time(10, 0), time(12, 0))), utilisateur.id
+        )
+    assert not any("reservations" in requete for requete in requetes)
+
+    ReservationRepository.update_status(session, premiere.id, 'rejetee')
+    seconde = ReservationRepository.create(
+        session, Reservation(None, salle, Creneau("lundi", time(10, 0), time(12, 0))), utilisateur.id
+    )
+    assert seconde.statut == 'en_attente'
+
+
+def test_acceptation_refusee_si_conflit():
+    engine, session = _session()
+    _remplir(session, 0)
+    utilisateur = UtilisateurRepository.create_user(session, "prof", "secret", "enseignant")
+    salle_id = SalleRepository.get_all(session)[0].id
+    creneau = CreneauRepository.get_or_create(session, Creneau("mardi", time(8, 0), time(10, 0)))
+    # Deux demandes qui se chevauchent (ex: enregistrées avant la vérification)
+    demandes = [
+        models.ReservationModel(utilisateur_id=utilisateur.id, salle_id=salle_id,
+                                creneau_id=creneau.id, statut='en_attente')
+        for _ in range(2)
+    ]
+    session.add_all(demandes)
+    session.commit()
+
+    assert ReservationRepository.update_status(session, demandes[0].id, 'acceptee')
+    with pytest.raises(ConflitException):
+        ReservationRepository.update_status(session, demandes[1].id, 'acceptee')
+    assert ReservationRepository.update_status(session, demandes[1].id, 'rejetee')
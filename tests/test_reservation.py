@@ -7,3 +7,24 @@ def test_reservation_statut():
 
     r.accepter()
     assert r.statut == Reservation.ACCEPTED
+
+
+def test_occupation_salles_partagee():
+    from datetime import time
+    from core.creneau import Creneau
+    from core.occupation_salles import OccupationSalles
+
+    matin = Creneau("lundi", time(8, 0), time(10, 0))
+    occupation = OccupationSalles()
+    occupation.ajouter("A", matin, "seance")
+    demande = Reservation("ens", "A", Creneau("lundi", time(9, 0), time(11, 0)))
+    occupation.ajouter_reservation(demande)
+    refusee = Reservation("ens", "A", Creneau("lundi", time(12, 0), time(13, 0)))
+    refusee.rejeter()
+    occupation.ajouter_reservation(refusee)
+
+    assert occupation.occupants("A", Creneau("lundi", time(9, 30), time(10, 30))) == ["seance", demande]
+    assert occupation.est_libre("A", Creneau("lundi", time(10, 0), time(11, 0)), sauf=demande)
+    assert occupation.est_libre("A", refusee.creneau)
+    assert occupation.est_libre("B", matin)
+    assert not occupation.est_libre("A", Creneau("lundi", time(7, 0), time(8, 30)))
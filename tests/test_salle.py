@@ -1,4 +1,7 @@
+import pickle
 from core.salle import Salle
+from core.matiere import Matiere
+from core.equipements import TableCompatibilite
 from core.creneau import Creneau
 from datetime import time
 
@@ -9,3 +12,54 @@ def test_salle_disponible():
 
     c_test = Creneau("lundi", time(10, 0), time(12, 0))
     assert salle.est_disponible(c_test)
+
+
+def test_compatibilite_par_masque():
+    salle = Salle(1, "TP1", 30, "tp", ["ordinateurs", "projecteur"])
+    tp = Matiere("INF1", "Réseaux", "tp", 2, ["ordinateurs"])
+    chimie = Matiere("CHI1", "Chimie", "tp", 2, ["paillasses"])
+
+    assert salle.est_compatible(30, tp.masque_equipements)
+    assert salle.est_compatible(30, ["projecteur"])
+    assert not salle.est_compatible(31, tp.masque_equipements)
+    assert not salle.est_compatible(10, chimie.masque_equipements)
+
+
+def test_table_compatibilite_et_transfert():
+    salles = [Salle(1, "Amphi", 200, "amphi", ["projecteur"]),
+              Salle(2, "TD", 30, "td"),
+              Salle(3, "TP", 24, "tp", ["ordinateurs", "projecteur"])]
+    table = TableCompatibilite(salles)
+    projection = Matiere("M1", "Algo", "cours", 2, ["projecteur"])
+
+    assert table.compatibles(projection, 25) == 0b001
+    assert table.compatibles(projection, 20) == 0b101
+    assert table.compatibles(Matiere("M2", "Maths", "td", 2), 30) == 0b011
+
+    copie = pickle.loads(pickle.dumps(salles[2]))
+    assert copie == salles[2] and copie.masque_equipements == salles[2].masque_equipements
+
+
+def test_creneaux_libres_hors_blocages():
+    salle = Salle(1, "TD1", 30, "td", disponibilites=[
+        Creneau("lundi", time(10, 0), time(12, 0)),
+        Creneau("lundi", time(11, 0), time(13, 0)),
+    ])
+
+    assert not salle.est_disponible(Creneau("lundi", time(12, 30), time(14, 0)))
+    assert salle.est_disponible(Creneau("lundi", time(13, 0), time(14, 0)))
+    assert salle.creneaux_libres("lundi", time(8, 0), time(18, 0)) == [
+        Creneau("lundi", time(8, 0), time(10, 0)),
+        Creneau("lundi", time(13, 0), time(18, 0)),
+    ]
+
+
+def test_salles_sans_blocage_partagent_les_plages_vides():
+    td1, td2 = Salle(1, "TD1", 30, "td"), Salle(2, "TD2", 30, "td")
+    lundi = Creneau("lundi", time(8, 0), time(10, 0))
+
+    td1.ajouter_disponibilite(lundi)
+
+    assert not td1.est_disponible(lundi)
+    assert td2.est_disponible(lundi)
+    assert td2.creneaux_libres("lundi", time(8, 0), time(10, 0)) == [lundi]
@@ -6,6 +6,7 @@ from core.matiere import Matiere
 from core.enseignant import Enseignant
 from core.emploi_du_temps import EmploiDuTemps
 from services.scheduler import Scheduler
+from services.solveur_csp import SolveurCSP
 
 
 def test_scheduler_simple():
@@ -24,3 +25,39 @@ def test_scheduler_simple():
     )
 
     assert len(edt.seances) == 1
+
+
+def test_scheduler_respecte_disponibilites_et_equipements():
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau("Lundi", time(10, 0), time(12, 0))
+    td = Salle(1, "TD", 40, "td", [])
+    labo = Salle(2, "Labo", 40, "tp", ["pc"])
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    tp = Matiere("M1", "Algo TP", "tp", 2, ["pc"])
+    ens = Enseignant(1, "Prof", [tp], [Creneau("Lundi", time(10, 0), time(18, 0))])
+
+    edt = EmploiDuTemps()
+    Scheduler([td, labo], [c1, c2]).generer(edt, demandes=[(tp, ens, groupe)])
+
+    seance = edt.seances[0]
+    assert seance.creneau == c2
+    assert seance.salle == labo
+
+
+def test_scheduler_choisit_un_enseignant_qualifie():
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau("Lundi", time(10, 0), time(12, 0))
+    salle = Salle(1, "S1", 40, "td", [])
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2, [])
+    bdd = Matiere("M2", "BDD", "cours", 2, [])
+    prof_a = Enseignant(1, "Prof A", [algo], [c1])
+    prof_b = Enseignant(2, "Prof B", [algo], [c1, c2])
+    prof_c = Enseignant(3, "Prof C", [bdd], [c1, c2])
+
+    for moteur in (Scheduler, SolveurCSP):
+        edt = EmploiDuTemps()
+        moteur([salle], [c1, c2], enseignants=[prof_a, prof_b, prof_c],
+               charges_max={prof_b: 120}).generer(edt, demandes=[(algo, g1), (algo, g2)])
+        assert sorted(s.enseignant.nom for s in edt.seances) == ["Prof A", "Prof B"]
@@ -0,0 +1,58 @@
+from datetime import time
+import pytest
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.emploi_du_temps import EmploiDuTemps
+from core.exceptions import AucuneSolutionException, ProblemeInfaisableException
+from services.scheduler import Scheduler
+from services.faisabilite import AnalyseurFaisabilite
+from services.solveur_csp import SolveurCSP
+
+
+def test_csp_resout_ce_que_le_glouton_rate(probleme_glouton):
+    salles, creneaux, demandes = probleme_glouton
+
+    with pytest.raises(AucuneSolutionException):
+        Scheduler(salles, creneaux).generer(EmploiDuTemps(), demandes)
+
+    edt = EmploiDuTemps()
+    SolveurCSP(salles, creneaux).generer(edt, demandes)
+    assert len(edt.seances) == 2
+    assert edt.seances_par_enseignant("Prof B")[0].creneau == creneaux[0]
+
+
+def test_csp_probleme_impossible(probleme_glouton):
+    salles, creneaux, demandes = probleme_glouton
+    matiere, _, groupe = demandes[1]
+    demandes.append((matiere, Enseignant(3, "Prof C", [], creneaux[:1]), groupe))
+
+    # Sans l'analyse préalable, c'est la recherche qui épuise les valeurs
+    with pytest.raises(AucuneSolutionException) as erreur:
+        SolveurCSP(salles, creneaux, verifier_faisabilite=False).generer(EmploiDuTemps(), demandes)
+    assert not isinstance(erreur.value, ProblemeInfaisableException)
+
+
+def test_csp_epuise_la_recherche_malgre_l_analyse():
+    c1 = Creneau("Lundi", time(8, 0), time(10, 0))
+    c2 = Creneau("Lundi", time(10, 0), time(12, 0))
+    salles = [Salle(1, "S1", 40, "td"), Salle(2, "S2", 40, "td")]
+    g1 = GroupeEtudiant(1, "G1", "Info", 30)
+    g2 = GroupeEtudiant(2, "G2", "Info", 30)
+    algo = Matiere("M1", "Algo", "cours", 2)
+    bdd = Matiere("M2", "BDD", "cours", 2)
+    prof_x = Enseignant(1, "X", [algo], [c1, c2])
+    prof_p = Enseignant(2, "P", [bdd], [c1])
+    prof_q = Enseignant(3, "Q", [bdd], [c1])
+    # Chaque condition nécessaire est respectée, mais P et Q prennent c1
+    # à G1 et G2, et X ne peut pas faire ses deux cours sur c2
+    demandes = [(algo, prof_x, g1), (algo, prof_x, g2), (bdd, prof_p, g1), (bdd, prof_q, g2)]
+
+    solveur = SolveurCSP(salles, [c1, c2])
+    assert isinstance(solveur.analyseur, AnalyseurFaisabilite)
+    assert solveur.analyseur.analyser(EmploiDuTemps(), demandes).est_faisable
+    with pytest.raises(AucuneSolutionException) as erreur:
+        solveur.generer(EmploiDuTemps(), demandes)
+    assert not isinstance(erreur.value, ProblemeInfaisableException)
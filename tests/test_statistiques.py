@@ -0,0 +1,53 @@
+from datetime import time
+from core.creneau import Creneau
+from core.salle import Salle
+from core.groupe_etudiant import GroupeEtudiant
+from core.matiere import Matiere
+from core.enseignant import Enseignant
+from core.seance import Seance
+from core.emploi_du_temps import EmploiDuTemps
+from services.statistiques import CalendrierOuverture, StatistiquesEmploiDuTemps
+
+
+def test_statistiques_vectorisees():
+    s1 = Salle(1, "S1", 40, "td")
+    s2 = Salle(2, "S2", 40, "td")
+    ens = Enseignant(1, "Prof")
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    matiere = Matiere("M1", "Algo", "td", 2)
+    seances = [
+        Seance(matiere, ens, groupe, s1, Creneau("lundi", time(8, 0), time(9, 30))),
+        Seance(matiere, ens, groupe, s1, Creneau("mardi", time(17, 0), time(19, 0))),
+        Seance(matiere, ens, groupe, s2, Creneau("lundi", time(9, 0), time(10, 0))),
+    ]
+    calendrier = CalendrierOuverture({"lundi": (time(8, 0), time(18, 0)),
+                                      "mardi": (time(8, 0), time(18, 0))})
+    stats = StatistiquesEmploiDuTemps(seances, calendrier)
+
+    # S1 : 1h30 + 1h dans les heures d'ouverture sur 20h
+    assert stats.taux_occupation_salles()[s1] == 2.5 / 20 * 100
+    assert stats.charge_enseignants()[ens] == 4.5
+    assert stats.charge_groupes()[groupe] == 4.5
+
+    histogramme = stats.histogramme_jours(pas_minutes=60)
+    assert histogramme[0, 9] == 2  # lundi 9h-10h : deux séances
+    assert histogramme[1, 18] == 1
+
+
+def test_taux_occupation_par_defaut_identique_aux_statistiques():
+    salle = Salle(1, "S1", 40, "td")
+    ens = Enseignant(1, "Prof")
+    groupe = GroupeEtudiant(1, "G1", "Info", 30)
+    matiere = Matiere("M1", "Algo", "td", 2)
+    seances = [
+        Seance(matiere, ens, groupe, salle, Creneau("lundi", time(8, 0), time(10, 0))),
+        Seance(matiere, ens, groupe, salle, Creneau("jeudi", time(14, 0), time(17, 0))),
+    ]
+    edt = EmploiDuTemps()
+    for seance in seances:
+        edt.ajouter_seance(seance)
+
+    # 5h sur les 50h d'ouverture du calendrier par défaut
+    assert edt.calculer_taux_occupation(salle) == 10.0
+    assert edt.calculer_taux_occupation(salle) == \
+        StatistiquesEmploiDuTemps(seances).taux_occupation_salles()[salle]
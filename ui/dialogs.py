@@ -14,6 +14,7 @@ from core.creneau import Creneau
 from core.enseignant import Enseignant
 from core.seance import Seance
 from core.reservation import Reservation
+from core.exceptions import ConflitException
 from database.models import SalleModel, MatiereModel, GroupeEtudiantModel, EnseignantModel, CreneauModel
 
 
@@ -121,6 +122,19 @@ class DialogAjouterSeance(QDialog):
         h_layout_temps.addWidget(QLabel("à"))
         h_layout_temps.addWidget(self.input_fin)
         form_layout.addRow("🕐 Horaires:", h_layout_temps)
+
+        # Suggestions de créneaux libres pour le groupe, l'enseignant et une salle
+        h_layout_suggestions = QHBoxLayout()
+        self.combo_suggestions = QComboBox()
+        self.combo_suggestions.activated.connect(self.appliquer_suggestion)
+        btn_suggerer = QPushButton("💡 Suggérer")
+        btn_suggerer.clicked.connect(self.suggerer_creneaux)
+        h_layout_suggestions.addWidget(self.combo_suggestions, 1)
+        h_layout_suggestions.addWidget(btn_suggerer)
+        form_layout.addRow("💡 Créneaux libres:", h_layout_suggestions)
+        for champ in (self.input_groupe, self.input_enseignant, self.input_effectif):
+            champ.editingFinished.connect(self.suggerer_creneaux)
+        self._salles = None
         
         # Boutons (en dehors de la scroll area)
         btn_layout = QHBoxLayout()
@@ -134,6 +148,80 @@ class DialogAjouterSeance(QDialog):
         btn_ajouter.clicked.connect(self.ajouter_seance)
         btn_layout.addWidget(btn_ajouter)
         
+    def suggerer_creneaux(self):
+        """
+        Propose les créneaux où le groupe, l'enseignant et une salle du type
+        choisi (assez grande pour l'effectif) sont libres. La durée est celle
+        des horaires saisis, 2 heures par défaut.
+        """
+        from services.recherche_creneaux import RechercheCreneaux
+
+        nom_groupe = self.input_groupe.text().strip()
+        nom_enseignant = self.input_enseignant.text().strip()
+        if not nom_groupe and not nom_enseignant:
+            return
+        try:
+            debut = datetime.strptime(self.input_debut.text().strip()[:5], "%H:%M")
+            fin = datetime.strptime(self.input_fin.text().strip()[:5], "%H:%M")
+            duree = int((fin - debut).total_seconds() // 60)
+        except ValueError:
+            duree = 0
+        if duree <= 0:
+            duree = 120
+        try:
+            effectif = int(self.input_effectif.text().strip() or 0)
+        except ValueError:
+            effectif = 0
+
+        # Ressources déjà présentes dans l'emploi du temps : les autres sont libres
+        seances_groupe = self.edt.seances_par_groupe(nom_groupe)
+        seances_enseignant = self.edt.seances_par_enseignant(nom_enseignant)
+        groupes = [seances_groupe[0].groupe] if seances_groupe else []
+        enseignants = [seances_enseignant[0].enseignant] if seances_enseignant else []
+        type_salle = self.combo_type_salle.currentText()
+        salles = [s for s in self._salles_connues()
+                  if s.type == type_salle and s.capacite >= effectif]
+
+        # Sans salle en base, seuls le groupe et l'enseignant sont pris en compte
+        propositions = RechercheCreneaux(self.edt).chercher(
+            duree, groupes=groupes, enseignants=enseignants,
+            salles=salles if self._salles_connues() else None
+        )
+        self.combo_suggestions.clear()
+        for proposition in propositions:
+            salle = proposition.salles[0] if proposition.salles else None
+            texte = f"{proposition.creneau} • {salle.nom}" if salle else str(proposition.creneau)
+            self.combo_suggestions.addItem(texte, (proposition.creneau, salle))
+        if not self.combo_suggestions.count():
+            self.combo_suggestions.addItem("Aucun créneau libre trouvé", None)
+
+    def appliquer_suggestion(self, index):
+        """Remplit le jour, les horaires et la salle avec la suggestion choisie."""
+        suggestion = self.combo_suggestions.itemData(index)
+        if suggestion is None:
+            return
+        creneau, salle = suggestion
+        self.combo_jour.setCurrentText(creneau.jour.capitalize())
+        self.input_debut.setText(creneau.heure_debut.strftime("%H:%M"))
+        self.input_fin.setText(creneau.heure_fin.strftime("%H:%M"))
+        if salle is not None:
+            self.input_salle.setText(salle.nom)
+            self.input_capacite.setText(str(salle.capacite))
+
+    def _salles_connues(self):
+        """Salles de la base, chargées une fois par dialogue."""
+        if self._salles is None:
+            from database.base import get_session
+            from database.repository import SalleRepository
+            session = next(get_session())
+            try:
+                self._salles = SalleRepository.get_all(session)
+            except Exception:
+                self._salles = []
+            finally:
+                session.close()
+        return self._salles
+
     def ajouter_seance(self):
         """Ajoute la séance à l'emploi du temps après validation."""
         try:
@@ -758,6 +846,9 @@ class DialogReservation(QDialog):
                 ReservationRepository.create(session, reservation, self.utilisateur.id)
                 QMessageBox.information(self, "✅ Succès", "Votre demande de réservation a été envoyée.")
                 self.accept()
+            except ConflitException as e:
+                session.rollback()
+                QMessageBox.warning(self, "⚠️ Salle occupée", str(e))
             except Exception as e:
                 session.rollback()
                 QMessageBox.critical(self, "❌ Erreur", f"Erreur lors de l'enregistrement: {e}")
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QColor
 from users.administrateur import Administrateur
+from core.exceptions import ConflitException
 import csv
 from datetime import datetime
 
@@ -353,7 +354,19 @@ class MainWindow(QMainWindow):
         from database.repository import ReservationRepository
         session = next(get_session())
         try:
-            ReservationRepository.update_status(session, res_id, nouveau_statut)
+            try:
+                ReservationRepository.update_status(session, res_id, nouveau_statut)
+            except ConflitException as e:
+                # La salle est déjà prise : proposer de rejeter la demande
+                session.rollback()
+                reponse = QMessageBox.question(
+                    self, "⚠️ Conflit", f"{e}\n\nRejeter cette demande ?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reponse != QMessageBox.StandardButton.Yes:
+                    return
+                nouveau_statut = 'rejetee'
+                ReservationRepository.update_status(session, res_id, nouveau_statut)
             session.commit()
             QMessageBox.information(self, "✅ Mis à jour", f"Réservation {nouveau_statut}.")
             self.charger_reservations()
@@ -561,21 +574,15 @@ class MainWindow(QMainWindow):
     
     def _get_filtered_seances(self):
         """Retourne les séances filtrées selon les critères actuels."""
-        seances = self.edt.seances
-        
         enseignant_sel = self.combo_enseignant.currentText()
-        if enseignant_sel != "Tous":
-            seances = [s for s in seances if s.enseignant.nom == enseignant_sel]
-            
         groupe_sel = self.combo_groupe.currentText()
-        if groupe_sel != "Tous":
-            seances = [s for s in seances if s.groupe.nom == groupe_sel]
-            
         salle_sel = self.combo_salle.currentText()
-        if salle_sel != "Toutes":
-            seances = [s for s in seances if s.salle.nom == salle_sel]
-        
-        return seances
+
+        return self.edt.rechercher(
+            groupe_nom=groupe_sel if groupe_sel != "Tous" else None,
+            enseignant_nom=enseignant_sel if enseignant_sel != "Tous" else None,
+            salle_nom=salle_sel if salle_sel != "Toutes" else None
+        )
     
     def _update_filters(self):
         """Met à jour les listes de filtres."""
@@ -1,5 +1,6 @@
 from users.utilisateur import Utilisateur
 from core.reservation import Reservation
+from core.salle import Salle
 
 
 class Administrateur(Utilisateur):
@@ -27,11 +28,24 @@ class Administrateur(Utilisateur):
 
     def supprimer_seance(self, seance):
         if seance in self._emploi_du_temps.seances:
-            self._emploi_du_temps.seances.remove(seance)
+            self._emploi_du_temps.supprimer_seance(seance)
 
     def consulter_emploi_du_temps(self):
         return self._emploi_du_temps.seances
 
+    def appliquer_indisponibilite(self, ressource, creneau, reparateur):
+        """
+        Rend une salle ou un enseignant indisponible sur le créneau, puis
+        replace les séances touchées sans reconstruire l'emploi du temps.
+        reparateur : services.reparation.ReparateurEmploiDuTemps
+        Retourne les séances replacées.
+        """
+        if isinstance(ressource, Salle):
+            ressource.ajouter_disponibilite(creneau)  # liste des créneaux bloqués
+        else:
+            ressource.retirer_disponibilite(creneau)
+        return reparateur.reparer(self._emploi_du_temps, ressource)
+
     # --------------------
     # Gestion des réservations
     # --------------------
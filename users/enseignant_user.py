@@ -31,6 +31,7 @@ class EnseignantUser(Utilisateur):
 
     def signaler_indisponibilite(self, creneau):
         """
-        Ajoute un créneau d'indisponibilité pour l'enseignant.
+        Retire le créneau des disponibilités de l'enseignant.
+        Les séances devenues invalides se réparent avec ReparateurEmploiDuTemps.
         """
-        self.enseignant.disponibilites.append(creneau)
+        self.enseignant.retirer_disponibilite(creneau)